@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTML Rewriter
+=============
+One-pass rewriting of generated pages for the post-processing scripts.
+
+upgrade_all_studies.py and polish_titles.py each used to read a page,
+call html.replace once per URL map / title map entry (a full copy of the
+page per hit) and then run several whole-file re.sub passes. They now add
+their edits as rules to a Rewriter instead. (The Bible Studies page needs
+no link fixes any more: page_generator.py renders its links through
+link_resolver.py.)
+
+A rule is a regex and a handler. The Rewriter joins every rule's pattern
+into one alternation, walks the page once, and hands each match to its
+rule's handler, which returns the replacement. Map lookups are dict
+lookups inside a handler, not one scan of the page per entry. Where several
+rules could match at the same place, the one added first wins. A handler
+that consumes an element with markup inside (a <p> with a link) can run
+`rewriter.rewrite()` on just that content.
+
+Running this file applies both scripts' rules to each page they touch,
+for one read and one write per page.
+
+Usage:
+    rw = Rewriter()
+    rw.rule(r'<h3>(.*?)</h3>', lambda m: ..., "title", re.DOTALL)
+    rw.replace('Visit JesusWalk.com', 'Browse JesusWalk Site', "cta")
+    rw.rewrite_file(path)
+    python html_rewriter.py
+"""
+
+import os
+import re
+import sys
+from collections import Counter
+
+# Shared output writer lives with the Joyful Heart scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "joyful-heart", "scraper"))
+from output_writer import OutputWriter
+
+_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+
+
+class Rewriter:
+    def __init__(self):
+        self.rules = []         # (compiled pattern, handler, name)
+        self.counts = Counter()  # rule name -> replacements made
+        self._combined = None
+
+    def rule(self, pattern, handler, name, flags=0):
+        """Add a rule: handler(match) returns the replacement for the matched text.
+
+        The match handed over is the rule's own pattern matched at that
+        place, so its groups are numbered as in `pattern`. Patterns may not
+        use named groups (they would clash in the combined regex)."""
+        self.rules.append((re.compile(pattern, flags), handler, name))
+        self._combined = None
+        return self
+
+    def replace(self, old, new, name):
+        """Add a rule replacing every occurrence of the literal old with new."""
+        return self.rule(re.escape(old), lambda m: new, name)
+
+    def combined(self):
+        if self._combined is None:
+            parts = []
+            for i, (pattern, _, _) in enumerate(self.rules):
+                flags = "".join(letter for flag, letter in _FLAGS.items() if pattern.flags & flag)
+                body = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+                parts.append(f"(?P<r{i}>{body})")
+            self._combined = re.compile("|".join(parts))
+        return self._combined
+
+    def rewrite(self, html):
+        """html with every rule applied, in a single scan."""
+        if not self.rules:
+            return html
+        out = []
+        pos = 0
+        for m in self.combined().finditer(html):
+            # The rule's own group is the outermost, so it closes last
+            pattern, handler, name = self.rules[int(m.lastgroup[1:])]
+            new = handler(pattern.match(html, m.start()))
+            if new != m.group():
+                self.counts[name] += 1
+            out.append(html[pos:m.start()])
+            out.append(new)
+            pos = m.end()
+        out.append(html[pos:])
+        return "".join(out)
+
+    def rewrite_file(self, path):
+        """Rewrite a page in place: one read, and one write if anything changed. True if written."""
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        folder, name = os.path.split(path)
+        return OutputWriter(folder).write(name, self.rewrite(html))
+
+    def summary(self):
+        return ", ".join(f"{name} {count}" for name, count in sorted(self.counts.items())) or "no changes"
+
+
+def add_link_rules(rw, url_map, is_local):
+    """Point href="..." attributes through url_map (old URL -> new). A study card
+    whose new href is_local(href) no longer opens in a new tab.
+
+    Returns a dict whose "local_card" says whether the last study card passed
+    was local, for rules that change the text inside it."""
+    state = {"local_card": False}
+
+    def link(m):
+        href = url_map.get(m.group(1), m.group(1))
+        rest = m.group(2)
+        if rest.startswith(' class="study-card"'):
+            state["local_card"] = is_local(href)
+            if state["local_card"]:
+                rest = rest.replace(' target="_blank" rel="noopener"', "", 1)
+        # The URL and the rest of the tag still get the other rules (title polish cleanup)
+        return f'href="{rw.rewrite(href)}"{rw.rewrite(rest)}>'
+
+    rw.rule(r'href="([^"]*)"([^>]*)>', link, "link")
+    return state
+
+
+if __name__ == "__main__":
+    import polish_titles
+    import upgrade_all_studies
+
+    # Link fixes first, so the title polish sees the final markup, as when the
+    # scripts ran one after another
+    pages = [
+        (upgrade_all_studies.src, [upgrade_all_studies.add_rules, polish_titles.add_rules]),
+        (polish_titles.FILES[1], [polish_titles.add_rules]),
+    ]
+    for path, add_rules in pages:
+        if not os.path.exists(path):
+            print(f"SKIP (not found): {path}")
+            continue
+        rw = Rewriter()
+        for add in add_rules:
+            add(rw)
+        written = rw.rewrite_file(path)
+        print(f"[{'SAVED' if written else 'NO CHANGES'}] {os.path.basename(path)}: {rw.summary()}")
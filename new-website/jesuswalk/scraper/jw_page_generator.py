@@ -1,60 +1,85 @@
 #!/usr/bin/env python3
-"""JesusWalk Page Generator — builds all inner pages from scraped data."""
+"""JesusWalk Page Generator — builds all inner pages from scraped data.
 
+Only pages whose scraped inputs or template code changed since the last
+build are rendered again (see build_manifest.py), and gzip/brotli copies
+are written for the files that changed (precompress.py).
+
+Usage:
+    python jw_page_generator.py
+    python jw_page_generator.py --jobs 8
+    python jw_page_generator.py --force
+"""
+
+import argparse
 import json
 import os
 import re
+import sys
 from html import escape
 
+# Shared scraper modules live with the Joyful Heart scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "joyful-heart", "scraper"))
+import boilerplate
+import critical_css
+import image_meta
+import image_pipeline
+import link_resolver
+import search_index
+from assets import SiteAssets, minify_js
+from boilerplate import JESUSWALK_NAV, JESUSWALK_RULES
+from build_manifest import BuildManifest, source_digest
+from corpus_index import CorpusIndex
+from critical_css import CriticalCSS
+from image_meta import ImageMetaIndex
+from image_pipeline import ImagePipeline
+from link_resolver import study_page_name
+from output_writer import OutputWriter
+from page_store import open_page_store
+from parallel_render import render_pages, resolve_jobs
+from precompress import Precompressor
+from search_index import catalog_index
+from templates import compile_template
+
 class JWPageGenerator:
     def __init__(self, scraped_dir, output_dir):
         self.scraped_dir = scraped_dir
         self.output_dir = output_dir
-        self.all_pages = []
         self.jw_pages = []
+        # Shared stylesheet in <site>/assets (output_dir is <site>/jesuswalk/pages)
+        site_dir = os.path.dirname(os.path.dirname(os.path.abspath(output_dir)))
+        site_src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Same stylesheet source as the Joyful Heart pages (assets.SITE_CSS)
+        self.assets = SiteAssets(site_dir)
+        # Catalog search script, inlined in all-studies.html with its index
+        self.search_js_path = os.path.join(site_src, "study-search.js")
+        with open(self.search_js_path, "r", encoding="utf-8") as f:
+            self.search_js = minify_js(f.read())
+        self.critical_css = CriticalCSS(self.assets.text("css"))
+        self.images = ImagePipeline(site_dir, os.path.join(scraped_dir, "images"))
+        self.layout = compile_template(self.page_layout, "title", "description", "content")
         self.load_data()
 
     def load_data(self):
-        pages_dir = os.path.join(self.scraped_dir, "pages")
-        for f in sorted(os.listdir(pages_dir)):
-            if f.endswith(".json") and f != "sitemap.json" and f != "failed_urls.json":
-                with open(os.path.join(pages_dir, f), "r", encoding="utf-8") as fh:
-                    data = json.load(fh)
-                    data["_filename"] = f
-                    self.all_pages.append(data)
-                    if f.startswith("jw_"):
-                        self.jw_pages.append(data)
-        print(f"Loaded {len(self.all_pages)} total pages, {len(self.jw_pages)} JesusWalk pages")
+        # Index the whole scrape, but only load the JesusWalk pages
+        self.corpus = CorpusIndex(open_page_store(self.scraped_dir))
+        self.image_meta = ImageMetaIndex(self.corpus)
+        # Related studies come from the page's category group, built once here
+        self.by_category = {}
+        for filename, data in self.corpus.files("jesuswalk.com"):
+            data["_filename"] = filename + ".json"
+            self.jw_pages.append(data)
+            self.by_category.setdefault(data.get("category"), []).append(data)
+        print(f"Loaded {len(self.corpus)} total pages, {len(self.jw_pages)} JesusWalk pages")
 
     # ── Navigation boilerplate filter ──
-    NAV_PATTERNS = [
-        r"^HomeBible Studies",
-        r"^Old TestamentNew",
-        r"^Beginning the Journey.*?Sitemap$",
-        r"^Bible StudiesArticles",
-        r"^Home\|Bible Studies",
-        r"^Copyright ©",
-        r"^Joyful Heart Renewal Ministries",
-        r"^Free\s+E-mail Bible Study",
-        r"FirstLastE-mail",
-        r"Preferred FormatHTML",
-        r"\[X\] Close Window",
-        r"^To be notified about future",
-        r"subscribe to our free newsletter",
-        r"We respect your\s*privacy",
-        r"See legal, copyright",
-        r"Contributions\s*to Joyful Heart",
-        r"please\s*bookmark this page",
-    ]
+    NAV_PATTERNS = JESUSWALK_NAV
 
     def is_nav_text(self, text):
         t = text.strip()
         if len(t) < 3:
             return True
-        for pat in self.NAV_PATTERNS:
-            if re.search(pat, t, re.IGNORECASE | re.DOTALL):
-                return True
-        return False
+        return JESUSWALK_RULES.matches(t)
 
     def extract_clean_paragraphs(self, page):
         raw = page.get("paragraphs", [])
@@ -108,6 +133,9 @@ class JWPageGenerator:
             local = (img.get("local_file", "") or "").lower()
             w = int(img.get("width", 0) or 0)
             h = int(img.get("height", 0) or 0)
+            if not (w and h) and local:
+                # Most tags had no size attributes: measure the file
+                w, h = self.image_meta.size(img["local_file"]) or (w, h)
             if w > 0 and h > 0 and (w < 30 or h < 30):
                 continue
             skip = False
@@ -121,6 +149,15 @@ class JWPageGenerator:
                 keep.append(img)
         return keep
 
+    def image_tag(self, local, alt):
+        """A <picture> of optimized variants, or the original file with its intrinsic width/height."""
+        size = self.image_meta.size(local)
+        html = self.images.picture(local, alt=alt, from_dir=self.output_dir, loading="lazy")
+        if html is None:
+            dims = f' width="{size[0]}" height="{size[1]}"' if size else ""
+            html = f'<img src="../scraped_data/images/{local}" alt="{alt}"{dims} loading="lazy">'
+        return html
+
     def render_article_body(self, page):
         paragraphs = self.extract_clean_paragraphs(page)
         images = self.filter_content_images(page.get("images", []))
@@ -149,8 +186,7 @@ class JWPageGenerator:
                 local = img.get("local_file", "")
                 alt = escape(img.get("alt", "") or "")
                 if local:
-                    img_src = f"../scraped_data/images/{local}"
-                    html_parts.append(f'<figure class="article-figure"><img src="{img_src}" alt="{alt}" loading="lazy"><figcaption>{alt}</figcaption></figure>')
+                    html_parts.append(f'<figure class="article-figure">{self.image_tag(local, alt)}<figcaption>{alt}</figcaption></figure>')
                     img_idx += 1
 
         return "\n".join(html_parts)
@@ -164,17 +200,23 @@ class JWPageGenerator:
 
     # ── Page template ──
     def build_page(self, title, content, description=""):
+        html = self.layout.render(title=escape(title), description=escape(description or title), content=content)
+        # Inline the above-the-fold CSS; the stylesheet itself loads without blocking
+        return self.critical_css.inline(html, self.assets.href("css", self.output_dir))
+
+    def page_layout(self, title, description, content):
+        """Page skeleton around the content; compiled once into self.layout."""
         return f'''<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
-<meta name="description" content="{escape(description or title)}">
-<title>{escape(title)} — JesusWalk Bible Study Series</title>
+<meta name="description" content="{description}">
+<title>{title} — JesusWalk Bible Study Series</title>
 <link rel="preconnect" href="https://fonts.googleapis.com">
 <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
 <link href="https://fonts.googleapis.com/css2?family=Cormorant+Garamond:ital,wght@0,400;0,600;0,700;1,400;1,600&family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-<link rel="stylesheet" href="../index.css">
+<link rel="stylesheet" href="{self.assets.href("css", self.output_dir)}">
 </head>
 <body>
 <nav class="navbar scrolled"><div class="container nav-container">
@@ -203,11 +245,7 @@ class JWPageGenerator:
     # ── Page generators ──
     def generate_all_studies_page(self):
         """Build the full studies catalog from jw_index.json."""
-        jw_home = None
-        for p in self.all_pages:
-            if p.get("url") == "https://www.jesuswalk.com/":
-                jw_home = p
-                break
+        jw_home = self.corpus.get("https://www.jesuswalk.com/")
 
         sections = [
             {"label": "Old Testament", "title": "Old Testament Studies", "list_idx": 2, "anchor": "old-testament"},
@@ -221,6 +259,9 @@ class JWPageGenerator:
 
         shtml = ""
         total = 0
+        groups = 0
+        # (section group, fields) per card, in page order, for the search index
+        entries = []
         if jw_home and "lists" in jw_home:
             lists = jw_home["lists"]
             for i, sec in enumerate(sections):
@@ -243,6 +284,7 @@ class JWPageGenerator:
                     else:
                         name, desc = text, ""
                     total += 1
+                    entries.append((groups, [sec["label"], name, desc]))
                     cards += f'''
         <a href="{escape(link)}" class="study-card" style="text-decoration:none;color:inherit;" target="_blank" rel="noopener">
           <div class="study-card-category">{sec["label"]}</div>
@@ -251,12 +293,19 @@ class JWPageGenerator:
           <div class="study-card-meta"><span>Start Study →</span></div>
         </a>'''
                 margin = 'margin-top:80px;' if i > 0 else ''
+                groups += 1
                 shtml += f'''
+      <div class="section-group" id="sg-{sec["anchor"]}">
       <div id="{sec["anchor"]}" class="section-header" style="{margin}">
         <div class="section-label">{sec["label"]}</div>
         <h2 class="section-title">{sec["title"]}</h2>
       </div>
-      <div class="studies-grid">{cards}</div>'''
+      <div class="studies-grid">{cards}</div>
+      </div>'''
+
+        # Word -> cards index for the search box (the jump bar's #study-search),
+        # so filtering never reads the cards' text
+        index_json = json.dumps(catalog_index(entries), separators=(",", ":")).replace("</", "<\\/")
 
         content = f'''
   <section class="hero" style="padding-bottom:40px;">
@@ -266,27 +315,39 @@ class JWPageGenerator:
       <p class="hero-description">Browse the complete JesusWalk Bible Study Series — Old Testament, New Testament, and Topical.</p>
     </div></div>
   </section>
-  <section class="section"><div class="container">{shtml}</div></section>'''
+  <section class="section"><div class="container">{shtml}
+      <p id="no-results" class="empty-notice" hidden>No studies found. Try a different search term.</p>
+  </div></section>
+  <script type="application/json" id="study-index">{index_json}</script>
+  <script>{self.search_js}</script>'''
         return self.build_page("All Bible Studies", content, f"Browse all {total} free JesusWalk Bible studies.")
 
+    def clean_title(self, title):
+        title = re.sub(r'\s*--.*$', '', title).strip()
+        return re.sub(r',\s*by Dr\..*$', '', title).strip()
+
+    def output_name(self, page):
+        """File name of a study page in the output folder."""
+        # Same name the Joyful Heart pages link to (link_resolver.py)
+        return study_page_name(page["_filename"].replace(".json", ""))
+
     def generate_study_article_page(self, page):
         """Generate individual study/article page."""
-        title = page.get("title", "Study")
-        # Clean title
-        title = re.sub(r'\s*--.*$', '', title).strip()
-        title = re.sub(r',\s*by Dr\..*$', '', title).strip()
+        title = self.clean_title(page.get("title", "Study"))
         url = page.get("url", "")
         category = page.get("category", "study")
         body = self.render_article_body(page)
 
         # Find related pages in same category
         related = ""
-        same_cat = [p for p in self.jw_pages if p.get("category") == category and p.get("url") != url][:4]
+        # The groups were built from the site's page list, so depend on it
+        self.corpus.note("domain:jesuswalk.com")
+        same_cat = [p for p in self.by_category.get(category, []) if p.get("url") != url][:4]
         if same_cat:
             rcards = ""
             for r in same_cat:
                 rtitle = r.get("title", "").split("--")[0].split(",")[0].strip()[:60]
-                fname = r["_filename"].replace(".json", ".html")
+                fname = self.output_name(r)
                 excerpt = self.get_excerpt(r, 80)
                 rcards += f'''<a href="{fname}" class="related-card"><div class="related-card-tag">{escape(category)}</div><h4>{escape(rtitle)}</h4><p>{escape(excerpt)}</p></a>'''
             related = f'<div class="related-articles"><h3>More Studies</h3><div class="related-grid">{rcards}</div></div>'
@@ -310,11 +371,7 @@ class JWPageGenerator:
         return self.build_page(title, content, page.get("meta_description", ""))
 
     def generate_books_page(self):
-        books_data = None
-        for p in self.all_pages:
-            if p.get("url") == "https://www.jesuswalk.com/books/":
-                books_data = p
-                break
+        books_data = self.corpus.get("https://www.jesuswalk.com/books/")
 
         body = ""
         if books_data:
@@ -335,11 +392,7 @@ class JWPageGenerator:
         return self.build_page("Books", content, "JesusWalk books — paperback, Kindle, and PDF.")
 
     def generate_podcast_page(self):
-        pod_data = None
-        for p in self.all_pages:
-            if p.get("url") == "https://www.jesuswalk.com/podcast/":
-                pod_data = p
-                break
+        pod_data = self.corpus.get("https://www.jesuswalk.com/podcast/")
         body = ""
         if pod_data:
             body = self.render_article_body(pod_data)
@@ -358,34 +411,37 @@ class JWPageGenerator:
   </div></section>'''
         return self.build_page("Podcast", content, "JesusWalk podcast — Bible studies you can listen to.")
 
-    def generate_all(self):
-        os.makedirs(self.output_dir, exist_ok=True)
+    def generate_all(self, jobs=1, force=False):
+        """Write every out-of-date page. Study pages are rendered on `jobs` processes."""
+        writer = OutputWriter(self.output_dir)
+        code = source_digest(__file__, boilerplate.__file__, critical_css.__file__, image_meta.__file__,
+                             image_pipeline.__file__, link_resolver.__file__, search_index.__file__,
+                             self.search_js_path, *self.assets.sources)
+        manifest = BuildManifest(self.output_dir, self.corpus, f"{code}:{self.images.signature}", force=force)
+        self.assets.write()
         count = 0
 
         # Core pages
         pages = {
-            "all-studies.html": self.generate_all_studies_page(),
-            "books.html": self.generate_books_page(),
-            "podcast.html": self.generate_podcast_page(),
+            "all-studies.html": self.generate_all_studies_page,
+            "books.html": self.generate_books_page,
+            "podcast.html": self.generate_podcast_page,
         }
 
-        for fname, html in pages.items():
-            path = os.path.join(self.output_dir, fname)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(html)
+        for fname, generate in pages.items():
             count += 1
+            html = manifest.render(fname, generate)
+            if html is None:
+                continue
+            writer.write(fname, html)
 
         # Individual study/article pages
-        for page in self.jw_pages:
-            fname = page["_filename"].replace(".json", ".html")
-            # Skip the main index
-            if fname == "jw_index.html":
-                fname = "all-studies-home.html"
-            html = self.generate_study_article_page(page)
-            path = os.path.join(self.output_dir, fname)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(html)
-            count += 1
+        count += len(self.jw_pages)
+        stale = [page for page in self.jw_pages if not manifest.is_current(self.output_name(page))]
+        for page, html, deps in render_pages(self, "generate_study_article_page", stale, jobs, track=True):
+            fname = self.output_name(page)
+            writer.write(fname, html)
+            manifest.record(fname, deps, html)
 
         # Create aliases for key pages
         aliases = {
@@ -394,22 +450,38 @@ class JWPageGenerator:
             "bible-study-tips.html": "jw_bible-study.html",
         }
         for alias, target in aliases.items():
-            src_path = os.path.join(self.output_dir, target)
-            dst_path = os.path.join(self.output_dir, alias)
-            if os.path.exists(src_path):
-                import shutil
-                shutil.copy2(src_path, dst_path)
+            if os.path.exists(os.path.join(self.output_dir, target)):
                 count += 1
+                if target in manifest.outputs and manifest.is_current(alias):
+                    continue
+                writer.copy(target, alias)
+                if target in manifest.outputs:
+                    manifest.alias(alias, target)
+
+        removed = manifest.prune()
+        manifest.save()
+        compressor = Precompressor(jobs).run(self.output_dir, self.assets.assets_dir)
 
         print(f"\n{'='*53}")
         print(f"  Generated {count} JesusWalk pages")
+        print(f"  Rendered {manifest.rendered}, {manifest.current} up to date"
+              + (f", {len(removed)} removed" if removed else ""))
+        print(f"  Files: {writer.summary()}")
+        print(f"  Compressed: {compressor.summary()}")
         print(f"  Output: {self.output_dir}")
         print(f"{'='*53}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the JesusWalk redesign pages from scraped data")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="render study pages on N processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every page, ignoring the build manifest")
+    args = parser.parse_args()
+
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     scraped = os.path.join(os.path.dirname(base), "joyful-heart-redesign", "scraped_data")
     output = os.path.join(base, "pages")
     gen = JWPageGenerator(scraped, output)
-    gen.generate_all()
+    gen.generate_all(jobs=resolve_jobs(args.jobs), force=args.force)
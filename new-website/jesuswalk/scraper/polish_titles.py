@@ -11,9 +11,14 @@ Fixes:
   4. Cleans up ".Spanish version." appended to titles
   5. Shortens overly long titles with clean truncation
   6. Fixes "(for new Christians...)" junk in h3 tags
+
+The fixes are rules for html_rewriter.Rewriter, applied in one pass over
+each file (python html_rewriter.py also runs them after the catalog link fixes).
 """
 import re, os
 
+from html_rewriter import Rewriter
+
 base = r"c:\Users\ADMIN\Desktop\J_project\Automated website develop"
 
 FILES = [
@@ -106,76 +111,55 @@ DESC_FIXES = {
     "not e-mail":                        "(self-paced)",
 }
 
-total_changes = 0
-
-for fpath in FILES:
-    if not os.path.exists(fpath):
-        print(f"SKIP (not found): {fpath}")
-        continue
-
-    with open(fpath, "r", encoding="utf-8") as f:
-        html = f.read()
-
-    original = html
-    changes = 0
-
-    # 1. Apply title fixes inside <h3>...</h3>
-    for old, new in TITLE_FIXES.items():
-        old_tag = f"<h3>{old}</h3>"
-        new_tag = f"<h3>{new}</h3>"
-        if old_tag in html:
-            html = html.replace(old_tag, new_tag)
-            changes += 1
-            print(f"  Title: '{old[:50]}' -> '{new}'")
-
-    # 2. Apply description fixes inside <p>...</p>
-    for old, new in DESC_FIXES.items():
-        old_tag = f"<p>{old}</p>"
-        new_tag = f"<p>{new}</p>"
-        if old_tag in html:
-            html = html.replace(old_tag, new_tag)
-            changes += 1
-            print(f"  Desc : '{old[:50]}' -> '{new}'")
-
-    # 3. Global cleanup: remove double spaces anywhere in h3/p tags
-    def fix_tag_content(m):
-        tag = m.group(1)
-        content = m.group(2)
-        # collapse multiple spaces/newlines
-        content = re.sub(r'  +', ' ', content)
-        content = re.sub(r'\s*\n\s*', ' ', content)
-        content = content.strip()
-        return f'<{tag}>{content}</{tag}>'
-
-    new_html = re.sub(r'<(h3|p)>(.*?)</(h3|p)>', fix_tag_content, html, flags=re.DOTALL)
-    if new_html != html:
-        html = new_html
-        changes += 5  # approximate
-
-    # 4. Remove any raw trailing ".Spanish version." anywhere in card text
-    html = re.sub(r'\.Spanish version\.', '', html)
-
-    # 5. Fix "JesusWalk: " prefix that remains in any h3
-    html = re.sub(r'<h3>JesusWalk:\s+', '<h3>', html)
-
-    # 6. Fix "(for new Christians...)" junk still in title
-    html = re.sub(r'\(for new Christians[^)]*\)', '', html)
-
-    # 7. Clean up empty <p></p> or <p> </p>
-    html = re.sub(r'<p>\s*</p>', '', html)
-
-    # 8. Fix apostrophe entities &#x27; → proper '
-    html = html.replace("&#x27;", "'")
-
-    # Write back if changed
-    if html != original:
-        with open(fpath, "w", encoding="utf-8") as f:
-            f.write(html)
+# Junk removed anywhere in the card text
+SPANISH_VERSION = re.compile(r'\.Spanish version\.')
+NEW_CHRISTIANS  = re.compile(r'\(for new Christians[^)]*\)')
+
+
+def clean_text(text):
+    """Fixes 4, 6 and the &#x27; -> ' cleanup, for any stretch of the page."""
+    text = SPANISH_VERSION.sub('', text)
+    text = NEW_CHRISTIANS.sub('', text)
+    return text.replace("&#x27;", "'")
+
+
+def add_rules(rw):
+    """Add the title and description fixes to a Rewriter."""
+
+    def fix_tag(tag, fixes):
+        def handler(m):
+            content = m.group(1)
+            if content in fixes:
+                content = fixes[content]
+            else:
+                # Links and other markup inside the element get the other rules
+                content = rw.rewrite(content)
+            # Collapse multiple spaces/newlines
+            content = re.sub(r'  +', ' ', content)
+            content = re.sub(r'\s*\n\s*', ' ', content)
+            content = clean_text(content.strip())
+            if tag == "h3":
+                content = re.sub(r'^JesusWalk:\s+', '', content)
+            elif not content.strip():
+                return ""  # Empty <p></p>
+            return f"<{tag}>{content}</{tag}>"
+        return handler
+
+    rw.rule(r'<h3>(.*?)</h3>', fix_tag("h3", TITLE_FIXES), "title", re.DOTALL)
+    rw.rule(r'<p>(.*?)</p>', fix_tag("p", DESC_FIXES), "description", re.DOTALL)
+    rw.rule(f"{SPANISH_VERSION.pattern}|{NEW_CHRISTIANS.pattern}|&#x27;", lambda m: clean_text(m.group()), "cleanup")
+    return rw
+
+
+if __name__ == "__main__":
+    for fpath in FILES:
+        if not os.path.exists(fpath):
+            print(f"SKIP (not found): {fpath}")
+            continue
+        rw = add_rules(Rewriter())
         fname = os.path.basename(fpath)
-        print(f"\n[SAVED] {fname} — {changes}+ changes applied")
-        total_changes += changes
-    else:
-        print(f"\n[NO CHANGES] {os.path.basename(fpath)}")
-
-print(f"\nTotal changes across all files: {total_changes}+")
-print("Polishing complete!")
+        if rw.rewrite_file(fpath):
+            print(f"[SAVED] {fname} — {rw.summary()}")
+        else:
+            print(f"[NO CHANGES] {fname}")
+    print("Polishing complete!")
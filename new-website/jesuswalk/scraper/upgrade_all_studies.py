@@ -2,12 +2,22 @@
 """
 Completely rewrites all-studies.html with:
 1. All 58 card links updated to local jesuswalk-redesign pages
-2. A sticky section jump navigation bar
-3. A live search/filter input
+2. A sticky section jump navigation bar (the pill of the section in view is
+   highlighted by an IntersectionObserver, not a scroll handler)
+3. The search input for the catalog search (the cards index and the script
+   that queries it are emitted by jw_page_generator.py)
 4. Section anchor scroll-offset fix (for fixed navbar)
 5. Smooth scroll behavior
+
+The edits are rules for html_rewriter.Rewriter, applied in one pass over the
+page (python html_rewriter.py also runs the title polish in the same pass).
 """
-import re, os, json
+import re, os, sys, json
+
+from html_rewriter import Rewriter, add_link_rules
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "joyful-heart", "scraper"))
+from link_resolver import study_page_name
 
 base     = r"c:\Users\ADMIN\Desktop\J_project\Automated website develop"
 src      = os.path.join(base, "jesuswalk-redesign", "pages", "all-studies.html")
@@ -90,41 +100,8 @@ URL_MAP = {
     "https://www.jesuswalk.com/christmas-incarnation/": f"{CATALOG}#topical",
 }
 
-# Also add individual scraped article pages
-for fname in os.listdir(jw_scrp):
-    if not fname.startswith("jw_") or not fname.endswith(".json"):
-        continue
-    try:
-        with open(os.path.join(jw_scrp, fname), encoding="utf-8") as fh:
-            d = json.load(fh)
-        url  = d.get("url", "")
-        html = fname.replace(".json", ".html")
-        if url and os.path.exists(os.path.join(jw_pages, html)):
-            URL_MAP[url] = html
-    except Exception:
-        pass
-
-# Read the current file
-with open(src, "r", encoding="utf-8") as f:
-    content = f.read()
-
-# Step 1: Replace all external URLs with local ones
-replaced = 0
-for ext_url, local in URL_MAP.items():
-    old = f'href="{ext_url}"'
-    new = f'href="{local}"'
-    if old in content:
-        content = content.replace(old, new)
-        replaced += 1
-
-# Step 2: Remove target=_blank from all study cards
-content = re.sub(
-    r'(<a href="[^"]+" class="study-card"[^>]*?) target="_blank" rel="noopener"',
-    r'\1',
-    content
-)
 
-# Step 3: Inject section jump bar + search after the hero section and before first section
+# Section jump bar + search, injected after the hero section and before the first section
 JUMP_BAR = '''
   <!-- Section Jump Bar + Search -->
   <div id="section-jump-bar" style="
@@ -172,111 +149,106 @@ JUMP_BAR = '''
     [id^="revelation"],[id^="topical"] {
       scroll-margin-top: 130px;
     }
-    /* Search hidden state */
-    .study-card.hidden { display: none !important; }
-    .section-group.empty { display: none !important; }
-    #no-results {
-      display:none; text-align:center; padding:60px 20px;
-      color: var(--text-muted, #888); font-size:1.1rem;
-    }
     html { scroll-behavior: smooth; }
   </style>
   <script>
-    // Live search filter
-    const searchInput = document.getElementById('study-search');
-    const noResults   = document.getElementById('no-results');
-    if (searchInput) {
-      searchInput.addEventListener('input', function() {
-        const q = this.value.trim().toLowerCase();
-        const cards = document.querySelectorAll('.study-card');
-        let visibleCount = 0;
-        cards.forEach(card => {
-          const text = card.textContent.toLowerCase();
-          const show = !q || text.includes(q);
-          card.classList.toggle('hidden', !show);
-          if (show) visibleCount++;
-        });
-        // Hide empty section groups
-        document.querySelectorAll('.section-group').forEach(sg => {
-          const visible = sg.querySelectorAll('.study-card:not(.hidden)').length;
-          sg.classList.toggle('empty', visible === 0);
+    // Active pill: the last section whose top has passed a line 160px below
+    // the top of the window. An IntersectionObserver whose area is everything
+    // above that line reports each crossing, so scrolling runs no code and
+    // reads no layout
+    (() => {
+      const LINE = 160;
+      const pills = document.querySelectorAll('.jump-pill');
+      const sections = ['old-testament','gospels','acts','pauls-letters','general-letters','revelation','topical']
+        .map(id => document.getElementById(id)).filter(Boolean);
+      if (!sections.length || !('IntersectionObserver' in window)) return;
+      const passed = new Set();
+      let current = -1, observer = null;
+      const update = entries => {
+        entries.forEach(e => {
+          const i = sections.indexOf(e.target);
+          if (e.isIntersecting) passed.add(i); else passed.delete(i);
         });
-        if (noResults) noResults.style.display = visibleCount === 0 ? 'block' : 'none';
-      });
-    }
-    // Active pill on scroll
-    const pills = document.querySelectorAll('.jump-pill');
-    const sections = ['old-testament','gospels','acts','pauls-letters','general-letters','revelation','topical'];
-    window.addEventListener('scroll', () => {
-      let current = '';
-      sections.forEach(id => {
-        const el = document.getElementById(id);
-        if (el && window.scrollY >= el.offsetTop - 160) current = id;
-      });
-      pills.forEach(p => {
-        p.classList.toggle('active', p.getAttribute('href') === '#' + current);
-      });
-    });
+        const last = passed.size ? Math.max(...passed) : -1;
+        if (last === current) return;
+        current = last;
+        const href = last >= 0 ? '#' + sections[last].id : '';
+        pills.forEach(p => p.classList.toggle('active', p.getAttribute('href') === href));
+      };
+      const observe = () => {
+        if (observer) observer.disconnect();
+        passed.clear();
+        // Far above the page top down to the line
+        observer = new IntersectionObserver(update,
+          {rootMargin: `100000px 0px ${LINE - window.innerHeight}px 0px`});
+        sections.forEach(s => observer.observe(s));
+      };
+      observe();
+      // The bottom margin depends on the window height
+      let resized = 0;
+      window.addEventListener('resize', () => {
+        clearTimeout(resized);
+        resized = setTimeout(observe, 200);
+      }, {passive: true});
+    })();
   </script>
-  <div id="no-results" class="container" style="display:none;">
-    No studies found. Try a different search term.
-  </div>
 '''
 
-# Inject jump bar right before the main section
-content = content.replace(
-    '  <section class="section"><div class="container">',
-    JUMP_BAR + '\n  <section class="section"><div class="container">'
-)
+# The main section the jump bar goes in front of
+MAIN_SECTION = '  <section class="section"><div class="container">'
+
+
+def build_url_map():
+    """URL_MAP plus the individual scraped article pages that were generated."""
+    url_map = dict(URL_MAP)
+    for fname in os.listdir(jw_scrp):
+        if not fname.startswith("jw_") or not fname.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(jw_scrp, fname), encoding="utf-8") as fh:
+                d = json.load(fh)
+            url  = d.get("url", "")
+            html = study_page_name(fname[:-len(".json")])
+            if url and os.path.exists(os.path.join(jw_pages, html)):
+                url_map[url] = html
+        except Exception:
+            pass
+    return url_map
 
-# Step 4: Wrap each section group (header + grid) in a .section-group div for search hiding
-# Pattern: <div id="old-testament" ...>...</div><div class="studies-grid">...</div>
-# We need to wrap each pair in <div class="section-group">...</div>
-for section_id in ['old-testament', 'gospels', 'acts', 'pauls-letters', 'general-letters', 'revelation', 'topical']:
-    # Find the section header start
-    pattern = f'<div id="{section_id}"'
-    if pattern in content:
-        # Find the position and wrap until the next section-header or end of section
-        idx = content.find(pattern)
-        # Insert opening wrapper before the section header
-        content = content[:idx] + f'<div class="section-group" id="sg-{section_id}">' + content[idx:]
 
-# Close each section-group before the next one opens, or before </div></section>
-# Insert closing tags before each new section-group (except the first)
-for section_id in ['gospels', 'acts', 'pauls-letters', 'general-letters', 'revelation', 'topical']:
-    content = content.replace(
-        f'<div class="section-group" id="sg-{section_id}">',
-        f'</div><div class="section-group" id="sg-{section_id}">'
-    )
+def add_rules(rw, url_map=None):
+    """Add the all-studies.html upgrades to a Rewriter."""
+    if url_map is None:
+        url_map = build_url_map()
+    # Local card links, and no study card opens in a new tab
+    add_link_rules(rw, url_map, lambda href: True)
+    rw.replace(MAIN_SECTION, JUMP_BAR + '\n' + MAIN_SECTION, "jump bar")
+    # The section groups the search hides (.section-group) are emitted by
+    # jw_page_generator.py along with the search index
+    return rw
 
-# Close the last section-group before </div></section>
-content = content.replace(
-    '</div></div></section>',
-    '</div></div></div></section>',
-    1  # only the first occurrence (the studies section)
-)
 
-# Write back
-with open(src, "w", encoding="utf-8") as f:
-    f.write(content)
+if __name__ == "__main__":
+    rw = add_rules(Rewriter())
+    rw.rewrite_file(src)
 
-# Verify
-with open(src, "r", encoding="utf-8") as f:
-    verify = f.read()
+    # Verify
+    with open(src, "r", encoding="utf-8") as f:
+        verify = f.read()
 
-ext_links = re.findall(r'href="https://www.jesuswalk.com[^"]*" class="study-card"', verify)
-local_links = re.findall(r'href="[^h][^"]*" class="study-card"', verify)
-has_search  = 'study-search' in verify
-has_jump    = 'jump-pill' in verify
-has_groups  = 'section-group' in verify
+    ext_links = re.findall(r'href="https://www.jesuswalk.com[^"]*" class="study-card"', verify)
+    local_links = re.findall(r'href="[^h][^"]*" class="study-card"', verify)
+    has_search  = 'study-search' in verify
+    has_jump    = 'jump-pill' in verify
+    has_groups  = 'section-group' in verify
 
-print(f"Replaced: {replaced} URLs")
-print(f"External links remaining: {len(ext_links)}")
-print(f"Local links: {len(local_links)}")
-print(f"Has search input: {has_search}")
-print(f"Has jump bar: {has_jump}")
-print(f"Has section groups: {has_groups}")
-if ext_links:
-    print("Still external:", ext_links[:5])
-else:
-    print("ALL links are local!")
+    print(f"Replaced: {rw.counts['link']} URLs ({rw.summary()})")
+    print(f"External links remaining: {len(ext_links)}")
+    print(f"Local links: {len(local_links)}")
+    print(f"Has search input: {has_search}")
+    print(f"Has jump bar: {has_jump}")
+    print(f"Has section groups: {has_groups}")
+    if ext_links:
+        print("Still external:", ext_links[:5])
+    else:
+        print("ALL links are local!")
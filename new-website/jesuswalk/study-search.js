@@ -0,0 +1,62 @@
+// Studies catalog search over the index prebuilt by jw_page_generator (search_index.py)
+(() => {
+  const input = document.getElementById('study-search');
+  const data = document.getElementById('study-index');
+  if (!input || !data) return;
+  const index = JSON.parse(data.textContent);
+  const cards = Array.from(document.querySelectorAll('.study-card'));
+  const groups = Array.from(document.querySelectorAll('.section-group'));
+  const noResults = document.getElementById('no-results');
+  let visible = null;  // Set of shown card numbers, null when all are
+
+  // Same word splitting as search_index.tokenize
+  const tokenize = q => q.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+    .replace(/['’]/g, '').split(/[^a-z0-9]+/).filter(Boolean);
+
+  // Items with a word starting with prefix: the matching terms are adjacent in the sorted list
+  const lookup = prefix => {
+    const terms = index.terms;
+    let lo = 0, hi = terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+    }
+    const items = new Set();
+    for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) {
+      index.postings[i].forEach(item => items.add(item));
+    }
+    return items;
+  };
+
+  const search = q => {
+    const words = tokenize(q);
+    if (!words.length) return null;
+    let result = lookup(words[0]);
+    for (const word of words.slice(1)) {
+      const items = lookup(word);
+      result = new Set([...result].filter(item => items.has(item)));
+    }
+    return result;
+  };
+
+  // Only the cards in the old or new result are looked at
+  const isShown = (set, i) => !set || set.has(i);
+  const apply = result => {
+    const candidates = result && visible ? new Set([...result, ...visible]) : cards.keys();
+    for (const i of candidates) {
+      const show = isShown(result, i);
+      if (show !== isShown(visible, i)) cards[i].classList.toggle('hidden', !show);
+    }
+    visible = result;
+    const perGroup = groups.map(() => (result ? 0 : 1));
+    if (result) result.forEach(i => perGroup[index.groups[i]]++);
+    groups.forEach((group, g) => group.classList.toggle('empty', !perGroup[g]));
+    if (noResults) noResults.hidden = !(result && result.size === 0);
+  };
+
+  let timer = 0;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => apply(search(input.value)), 120);
+  });
+})();
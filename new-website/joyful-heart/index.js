@@ -0,0 +1,9 @@
+const navbar=document.getElementById('navbar');
+// Navbar state: 'scrolled' once a 40px marker at the top of the page is out of view (no scroll listener)
+const navMark=document.createElement('div');navMark.setAttribute('aria-hidden','true');navMark.style.cssText='position:absolute;top:0;left:0;width:1px;height:40px;pointer-events:none';document.body.prepend(navMark);
+new IntersectionObserver(es=>navbar.classList.toggle('scrolled',!es[es.length-1].isIntersecting)).observe(navMark);
+const mt=document.getElementById('mobileToggle'),nl=document.getElementById('navLinks');
+mt.addEventListener('click',()=>{const e=mt.getAttribute('aria-expanded')==='true';mt.setAttribute('aria-expanded',!e);nl.classList.toggle('active')});
+nl.querySelectorAll('a').forEach(a=>a.addEventListener('click',()=>{nl.classList.remove('active');mt.setAttribute('aria-expanded','false')}));
+const obs=new IntersectionObserver(e=>{e.forEach(en=>{if(en.isIntersecting){en.target.style.animationPlayState='running';obs.unobserve(en.target)}})},{threshold:0.1});
+document.querySelectorAll('.animate-in').forEach(el=>{el.style.animationPlayState='paused';obs.observe(el)});
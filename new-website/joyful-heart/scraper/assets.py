@@ -0,0 +1,139 @@
+"""
+Site Assets
+===========
+Shared, minified stylesheet and script for the generated pages.
+
+Both sites' pages link one stylesheet and one script in new-website/assets,
+named after a hash of their minified content (site.<hash>.css,
+site.<hash>.js). Both generators build the stylesheet from the same source,
+SITE_CSS (joyful-heart/index.css), so they always agree on its name. A page
+only ever points at the exact version it was built with, so the assets can
+be cached forever: the _headers file written next to them (Netlify format)
+marks /assets/* as immutable. Editing index.css or index.js gives a new
+file name; generators add `SiteAssets.sources` to their build manifest code
+digest so that every page is rebuilt with it.
+
+The previous version of each asset is kept, so pages still cached by
+browsers or a CDN (or the other site, until its generator runs again) keep
+working after a deploy; older versions and their .gz/.br copies are
+removed by `write()`. The current and previous names are listed in
+assets/.assets.json.
+
+Usage:
+    assets = SiteAssets(site_dir, js_source="joyful-heart/index.js")
+    assets.href("css", from_dir=pages_dir)   # ../../assets/site.1a2b3c4d5e.css
+    assets.write()
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from output_writer import OutputWriter
+
+
+ASSETS_DIR = "assets"
+# The stylesheet source of both sites' generated pages
+SITE_CSS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "index.css")
+# Current and previous asset names per kind, in ASSETS_DIR
+ASSET_LIST = ".assets.json"
+HEADERS = """/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+_CSS_STRING = r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')'
+# Strings are matched first, so a "/*" inside one is not a comment
+_CSS_COMMENT = re.compile(_CSS_STRING + r"|/\*.*?\*/", re.DOTALL)
+
+
+def minify_css(css):
+    """Drop comments and layout whitespace; strings are kept verbatim."""
+    # A comment still separates the tokens around it
+    css = _CSS_COMMENT.sub(lambda m: m.group(1) or " ", css)
+    parts = re.split(_CSS_STRING, css)
+    return "".join(part if i % 2 else _squeeze_css(part) for i, part in enumerate(parts)).strip()
+
+
+def _squeeze_css(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    # Not before ':' - "a :hover" and "a:hover" are different selectors
+    text = re.sub(r":\s+", ":", text)
+    return text.replace(";}", "}")
+
+
+def minify_js(js):
+    """Strip indentation and blank lines; line breaks are kept so semicolon insertion is unchanged."""
+    return "\n".join(line.strip() for line in js.splitlines() if line.strip())
+
+
+def content_name(stem, ext, text):
+    return f"{stem}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}.{ext}"
+
+
+class SiteAssets:
+    def __init__(self, site_dir, css_source=SITE_CSS, js_source=None):
+        """site_dir is the web root (new-website); sources are paths to the unminified files."""
+        self.site_dir = site_dir
+        self.removed = []
+        self.assets_dir = os.path.join(site_dir, ASSETS_DIR)
+        # Files that decide the asset names (this module's minifiers included)
+        self.sources = [os.path.abspath(__file__), css_source] + ([js_source] if js_source else [])
+        self.files = {}  # kind -> (file name, minified text)
+
+        with open(css_source, "r", encoding="utf-8") as f:
+            css = minify_css(f.read())
+        self.files["css"] = (content_name("site", "css", css), css)
+        if js_source:
+            with open(js_source, "r", encoding="utf-8") as f:
+                js = minify_js(f.read())
+            self.files["js"] = (content_name("site", "js", js), js)
+
+    def name(self, kind):
+        return self.files[kind][0]
+
+    def text(self, kind):
+        """Minified content of an asset."""
+        return self.files[kind][1]
+
+    def href(self, kind, from_dir):
+        """URL of an asset relative to a page in from_dir."""
+        rel = os.path.relpath(os.path.join(self.assets_dir, self.name(kind)), from_dir)
+        return rel.replace(os.sep, "/")
+
+    def write(self):
+        """Write the assets and _headers (only files whose content changed). Returns the writer.
+
+        Versions older than the previous one are removed (names in self.removed)."""
+        writer = OutputWriter(self.assets_dir)
+        for name, text in self.files.values():
+            writer.write(name, text)
+        OutputWriter(self.site_dir).write("_headers", HEADERS)
+        self.removed = self._prune(writer)
+        return writer
+
+    def _prune(self, writer):
+        try:
+            with open(os.path.join(self.assets_dir, ASSET_LIST), "r", encoding="utf-8") as f:
+                listed = json.load(f)
+        except (OSError, ValueError):
+            listed = {}
+
+        removed = []
+        # Only the kinds this generator writes: the other one may have more
+        for kind, (name, _) in self.files.items():
+            entry = listed.get(kind) or {}
+            if entry.get("current") != name:
+                entry = {"current": name, "previous": entry.get("current")}
+            listed[kind] = entry
+            pattern = re.compile(rf"site\.[0-9a-f]{{10}}\.{kind}")
+            for other in sorted(os.listdir(self.assets_dir)):
+                if pattern.fullmatch(other) and other not in entry.values():
+                    for path in (other, other + ".gz", other + ".br"):
+                        path = os.path.join(self.assets_dir, path)
+                        if os.path.exists(path):
+                            os.remove(path)
+                    removed.append(other)
+        writer.write(ASSET_LIST, json.dumps(listed, indent=1, sort_keys=True))
+        return removed
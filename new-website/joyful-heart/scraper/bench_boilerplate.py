@@ -0,0 +1,124 @@
+"""
+Boilerplate Classifier Benchmark
+================================
+Micro-benchmark for boilerplate.py: per-paragraph cost of the classifier
+versus the old one-check-per-rule loops, and of the marker loop versus the
+Aho-Corasick automaton as the number of markers grows.
+
+Paragraphs come from the site pages on disk (as in bench_parsers.py), plus
+one copy of each site marker embedded in filler text so that matches are
+exercised too. Before timing, the approaches are checked to give the same
+answer for every paragraph: the classifier with the real per-site rule
+sets, the automaton with every marker count.
+
+Usage:
+    python bench_boilerplate.py
+    python bench_boilerplate.py --rules 10 100 1000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from bench_parsers import DEFAULT_CORPUS, load_corpus
+from boilerplate import (JESUSWALK_NAV, JOYFUL_HEART_BOILERPLATE, JOYFUL_HEART_NAV,
+                         BoilerplateClassifier, MarkerAutomaton)
+from parser_backends import get_backend
+
+
+def naive_markers(markers):
+    """The old page_generator check: one substring scan per marker."""
+    def check(text):
+        for marker in markers:
+            if marker in text:
+                return True
+        return False
+    return check
+
+
+def naive_patterns(patterns, flags):
+    """The old JWPageGenerator check: one re.search per pattern."""
+    def check(text):
+        for pat in patterns:
+            if re.search(pat, text, flags):
+                return True
+        return False
+    return check
+
+
+def load_paragraphs(dirs):
+    backend = get_backend()
+    paragraphs = []
+    for url, html in load_corpus(dirs):
+        paragraphs.extend(backend.extract(html, url)["paragraphs"])
+    filler = "The Lord is my shepherd; I shall not want. "
+    for marker in JOYFUL_HEART_NAV + JOYFUL_HEART_BOILERPLATE:
+        paragraphs.append(filler + marker + " " + filler)
+    return paragraphs
+
+
+def random_markers(count, seed=1):
+    rng = random.Random(seed)
+    letters = string.ascii_letters + " "
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(12, 40))) for _ in range(count)]
+
+
+def per_paragraph_us(check, paragraphs, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in paragraphs:
+            check(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(paragraphs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS, help="folders of .html files")
+    parser.add_argument("--rules", nargs="+", type=int, default=[10, 50, 100, 500, 1000, 5000],
+                        help="synthetic rule-set sizes to time")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    paragraphs = load_paragraphs(args.corpus)
+    print(f"\n{'='*70}")
+    print(f"  BOILERPLATE CLASSIFIER BENCHMARK")
+    print(f"  Corpus: {len(paragraphs)} paragraphs")
+    print(f"{'='*70}\n")
+
+    # Same answers as the old checks on the real rule sets
+    jh_markers = JOYFUL_HEART_NAV + JOYFUL_HEART_BOILERPLATE
+    jw_flags = re.IGNORECASE | re.DOTALL
+    site_rules = [
+        ("joyfulheart", naive_markers(jh_markers), BoilerplateClassifier(markers=jh_markers)),
+        ("jesuswalk", naive_patterns(JESUSWALK_NAV, jw_flags),
+         BoilerplateClassifier(patterns=JESUSWALK_NAV, flags=jw_flags)),
+    ]
+    for name, old, new in site_rules:
+        same = sum(1 for text in paragraphs if old(text) == new.matches(text))
+        flagged = sum(1 for text in paragraphs if new.matches(text))
+        print(f"  {name:12s} {new.rule_count:3d} rules   agree: {same}/{len(paragraphs)}   "
+              f"flagged: {flagged}   old {per_paragraph_us(old, paragraphs, args.repeat):6.2f} us/para   "
+              f"classifier {per_paragraph_us(new.matches, paragraphs, args.repeat):6.2f} us/para")
+
+    # Cost as the rule count grows
+    print(f"\n  {'rules':>6s}   {'agree':>11s}   {'loop us/para':>12s}   {'automaton us/para':>17s}   "
+          f"{'classifier us/para':>18s}")
+    for count in args.rules:
+        markers = random_markers(count)
+        loop = naive_markers(markers)
+        automaton = MarkerAutomaton(markers)
+        same = sum(1 for text in paragraphs if loop(text) == automaton.search(text))
+        print(f"  {count:6d}   {same:5d}/{len(paragraphs):<5d}   "
+              f"{per_paragraph_us(loop, paragraphs, args.repeat):12.2f}   "
+              f"{per_paragraph_us(automaton.search, paragraphs, args.repeat):17.2f}   "
+              f"{per_paragraph_us(BoilerplateClassifier(markers=markers).matches, paragraphs, args.repeat):18.2f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parser Backend Benchmark
+========================
+Measures extraction throughput (pages/sec) of each installed parser backend
+on a corpus of saved HTML files, and checks how many pages each backend
+extracts identically to the html.parser compatibility path.
+
+By default the corpus is the site pages already on disk (joyful-heart/pages
+and jesuswalk/pages); point --corpus at any folder of .html files instead.
+
+Usage:
+    python bench_parsers.py
+    python bench_parsers.py --corpus path/to/html --repeat 5
+"""
+
+import argparse
+import os
+import time
+
+from parser_backends import DEFAULT_BACKEND, available_backends, get_backend
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SITE_ROOT = os.path.dirname(os.path.dirname(HERE))
+DEFAULT_CORPUS = [
+    os.path.join(SITE_ROOT, "joyful-heart", "pages"),
+    os.path.join(SITE_ROOT, "jesuswalk", "pages"),
+]
+
+
+def load_corpus(dirs):
+    docs = []
+    for d in dirs:
+        for fname in sorted(os.listdir(d)):
+            if fname.endswith((".html", ".htm")):
+                path = os.path.join(d, fname)
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    docs.append((f"https://www.joyfulheart.com/{fname}", f.read()))
+    return docs
+
+
+def run(backend, docs, repeat):
+    best = None
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [backend.extract(html, url) for url, html in docs]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--corpus", nargs="+", default=DEFAULT_CORPUS, help="folders of .html files")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend (best is reported)")
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus)
+    total_bytes = sum(len(html) for _, html in docs)
+    print(f"\n{'='*70}")
+    print(f"  PARSER BACKEND BENCHMARK")
+    print(f"  Corpus: {len(docs)} pages, {total_bytes / 1024:.0f} KB")
+    print(f"{'='*70}\n")
+
+    names = available_backends()
+    baseline = None
+    base_time = None
+    for name in [DEFAULT_BACKEND] + [n for n in names if n != DEFAULT_BACKEND]:
+        if name not in names:
+            print(f"  {name:12s} not installed")
+            continue
+        elapsed, results = run(get_backend(name), docs, args.repeat)
+        if baseline is None:
+            baseline, base_time = results, elapsed
+        same = sum(1 for a, b in zip(baseline, results) if a == b)
+        print(f"  {name:12s} {len(docs) / elapsed:8.1f} pages/sec   "
+              f"{base_time / elapsed:5.2f}x   identical: {same}/{len(docs)}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
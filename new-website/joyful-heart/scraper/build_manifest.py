@@ -0,0 +1,130 @@
+"""
+Build Manifest
+==============
+Incremental builds for PageGenerator and JWPageGenerator.
+
+The manifest (.build_manifest.json in the output folder) records, for every
+generated file:
+
+  - code    digest of the generator's template source files
+  - inputs  {dependency key: digest} of everything the page read from the
+            scrape while it was rendered (see corpus_index.py): its own
+            record, related pages, category listings, URL lookups, ...
+  - sha1    digest of the HTML that was written
+
+On the next build an output is up to date when its code digest is the same,
+every input still has the recorded digest and the file on disk still has
+the recorded content; only the other outputs are rendered again. Outputs a
+previous build wrote that are no longer produced (a page dropped from the
+scrape, an empty category) are removed.
+
+Usage:
+    manifest = BuildManifest(output_dir, corpus, source_digest(__file__))
+    html = manifest.render("about.html", generate_about_page)
+    if html is not None:
+        ...write it...
+    manifest.save()
+"""
+
+import hashlib
+import json
+import os
+
+from output_writer import OutputWriter
+
+
+MANIFEST_NAME = ".build_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def source_digest(*paths):
+    """Digest of source files (the generator module and the template code it uses)."""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def html_digest(html):
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    def __init__(self, output_dir, corpus, code, force=False):
+        """code is the generator's source_digest; force rebuilds every output."""
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.corpus = corpus
+        self.code = code
+        self.force = force
+        self.previous = {}
+        self.outputs = {}
+        self.rendered = 0
+        self.current = 0
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    self.previous = manifest.get("outputs", {})
+            except (OSError, ValueError):
+                # Everything is rebuilt
+                self.previous = {}
+
+    def is_current(self, name):
+        """True (and the output is kept) if name needs no rebuild."""
+        entry = self.previous.get(name)
+        if self.force or entry is None or entry.get("code") != self.code:
+            return False
+        if any(self.corpus.digest(key) != digest for key, digest in entry["inputs"].items()):
+            return False
+        if _file_digest(os.path.join(self.output_dir, name)) != entry["sha1"]:
+            return False  # Deleted or edited by hand
+        self.outputs[name] = entry
+        self.current += 1
+        return True
+
+    def record(self, name, inputs, html):
+        """Note that name was rendered from inputs ({key: digest})."""
+        self.outputs[name] = {"code": self.code, "inputs": dict(sorted(inputs.items())),
+                              "sha1": html_digest(html)}
+        self.rendered += 1
+
+    def render(self, name, generate, *args):
+        """HTML of generate(*args) with its inputs recorded, or None if name is up to date."""
+        if self.is_current(name):
+            return None
+        with self.corpus.recording() as inputs:
+            html = generate(*args)
+        self.record(name, inputs, html)
+        return html
+
+    def alias(self, name, target):
+        """Record name as a copy of the output target."""
+        self.outputs[name] = dict(self.outputs[target])
+
+    def prune(self):
+        """Remove files written by an earlier build that this build no longer produces."""
+        removed = []
+        for name in self.previous:
+            if name not in self.outputs:
+                path = os.path.join(self.output_dir, name)
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed.append(name)
+        return removed
+
+    def save(self):
+        """Write the manifest atomically (left untouched if nothing changed)."""
+        manifest = {"version": MANIFEST_VERSION, "outputs": dict(sorted(self.outputs.items()))}
+        OutputWriter(self.output_dir).write(MANIFEST_NAME, json.dumps(manifest, indent=1, ensure_ascii=False))
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
@@ -0,0 +1,148 @@
+"""
+Site Search Index Builder
+=========================
+Full-text search over both sites' article and study pages, with no server.
+
+Every Joyful Heart article page and JesusWalk study page is indexed from
+the same cleaned paragraphs the generators render (extract_clean_paragraphs),
+into the sharded BM25 index of search_index.FullTextIndex. The shard and
+page-list files go to <site>/assets/search under content-hashed names, with
+.gz/.br copies (precompress.py); joyful-heart/pages/search.html embeds the
+small manifest and search.js, which fetches only the shards a query needs.
+
+Run it after the page generators. The files of the previous build are kept
+so a search page still cached somewhere can load its shards; older ones are
+removed.
+
+Usage:
+    python build_search_index.py
+    python build_search_index.py --jobs 4
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# The JesusWalk generator lives with the JesusWalk scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jesuswalk", "scraper"))
+from assets import minify_js
+from jw_page_generator import JWPageGenerator
+from output_writer import OutputWriter
+from page_generator import PageGenerator
+from parallel_render import resolve_jobs
+from precompress import Precompressor
+from search_index import FullTextIndex
+
+
+SEARCH_DIR = "search"
+# Index files of the current and previous build, in SEARCH_DIR
+FILE_LIST = ".files.json"
+
+
+def index_pages(gen, jw):
+    """FullTextIndex of the Joyful Heart articles and JesusWalk studies."""
+    index = FullTextIndex()
+    for page in gen.article_pages():
+        paragraphs = [text for _, text in gen.extract_clean_paragraphs(page)]
+        index.add(f"joyful-heart/pages/{gen._url_to_filename(page['url'])}.html",
+                  gen.clean_title(page.get("title", "Untitled")), "Joyful Heart",
+                  paragraphs, gen.get_article_excerpt(page))
+    for page in jw.jw_pages:
+        index.add(f"jesuswalk/pages/{jw.output_name(page)}",
+                  jw.clean_title(page.get("title", "Study")), "JesusWalk",
+                  jw.extract_clean_paragraphs(page), jw.get_excerpt(page))
+    return index
+
+
+def write_index(files, search_dir):
+    """Write the index files and drop those older than the previous build. Returns (writer, removed)."""
+    writer = OutputWriter(search_dir)
+    for name, text in sorted(files.items()):
+        writer.write(name, text)
+
+    try:
+        with open(os.path.join(search_dir, FILE_LIST), "r", encoding="utf-8") as f:
+            listed = json.load(f)
+    except (OSError, ValueError):
+        listed = {"current": [], "previous": []}
+    current = sorted(files)
+    previous = listed["previous"] if listed["current"] == current else listed["current"]
+
+    keep = set(current) | set(previous)
+    removed = 0
+    for name in os.listdir(search_dir):
+        # .gz/.br copies of removed files are cleaned up by the Precompressor
+        if name.startswith(".") or name.endswith((".gz", ".br")) or name in keep:
+            continue
+        os.remove(os.path.join(search_dir, name))
+        removed += 1
+    writer.write(FILE_LIST, json.dumps({"current": current, "previous": previous}, indent=1))
+    return writer, removed
+
+
+def generate_search_page(gen, manifest, script):
+    data = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    content = f'''
+  <section class="cta-section" style="padding-top: calc(var(--nav-height) + 80px);">
+    <div class="container animate-in">
+      <h2 style="font-size: var(--fs-h1);">Search</h2>
+      <p style="max-width: 600px; margin: 0 auto 16px;">Search the full text of {manifest["pages"]} Joyful Heart articles and JesusWalk Bible studies.</p>
+      <form class="cta-form" action="search.html" method="get" role="search" style="max-width: 500px;">
+        <input type="search" id="site-search" name="q" placeholder="Words or a phrase" aria-label="Search articles and studies" autocomplete="off">
+        <button type="submit" class="btn btn-gold">Search</button>
+      </form>
+    </div>
+  </section>
+  <section class="section">
+    <div class="container">
+      <p id="search-status" aria-live="polite" style="text-align: center; color: var(--text-muted); margin-bottom: 24px;"></p>
+      <div class="studies-grid" id="search-results"></div>
+    </div>
+  </section>
+  <script type="application/json" id="search-manifest">{data}</script>
+  <script>{script}</script>'''
+    return gen.build_page("Search", content, description="Search every Joyful Heart article and JesusWalk Bible study.")
+
+
+def build_search(gen, jw, jobs=1):
+    """Index both sites, write the index files and joyful-heart/pages/search.html."""
+    index = index_pages(gen, jw)
+    files, manifest = index.files()
+
+    search_dir = os.path.join(gen.assets.assets_dir, SEARCH_DIR)
+    writer, removed = write_index(files, search_dir)
+    # URLs as seen from the search page
+    manifest["base"] = os.path.relpath(search_dir, gen.pages_dir).replace(os.sep, "/") + "/"
+    manifest["root"] = os.path.relpath(gen.assets.site_dir, gen.pages_dir).replace(os.sep, "/") + "/"
+
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "search.js"),
+              "r", encoding="utf-8") as f:
+        script = minify_js(f.read())
+    page_writer = OutputWriter(gen.pages_dir)
+    page_writer.write("search.html", generate_search_page(gen, manifest, script))
+    compressor = Precompressor(jobs).run(search_dir, gen.pages_dir)
+
+    shard_sizes = [len(files[name].encode("utf-8")) for _, name in manifest["shards"]]
+    print(f"\n  [SEARCH]   {manifest['pages']} pages, {len(index.postings)} words")
+    print(f"  [SHARDS]   {len(shard_sizes)} shards, {max(shard_sizes, default=0) / 1024:.0f} KB largest, "
+          f"{sum(shard_sizes) / 1024:.0f} KB in all; {len(manifest['chunks'])} page lists")
+    print(f"  [WRITE]    {writer.summary()}" + (f", {removed} old files removed" if removed else "")
+          + f"; search.html {'written' if page_writer.written else 'unchanged'}")
+    print(f"  [COMPRESS] {compressor.summary()}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the site-wide full-text search index and page")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="compress the index files on N processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    # Same scraped data and output folders as the two generators' defaults
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    site_dir = os.path.dirname(base)
+    gen = PageGenerator(os.path.join(base, "scraped_data"), base)
+    jw = JWPageGenerator(os.path.join(site_dir, "joyful-heart-redesign", "scraped_data"),
+                         os.path.join(site_dir, "jesuswalk", "pages"))
+    build_search(gen, jw, jobs=resolve_jobs(args.jobs))
@@ -8,51 +8,156 @@ Features:
 - Crawls from homepage, discovers all internal links
 - Extracts: title, headings, paragraphs, images, links, navigation
 - Saves structured JSON per page + full sitemap
-- Downloads key images (Dr. Wilson's photo, logos, etc.)
+- Streams all pages to all_pages.ndjson (one record per line) and indexes
+  them in pages.db (SQLite) for lookup by URL or category
+- Downloads images in the background into a content-addressed (SHA-256) store
+- Optional concurrent (asyncio) crawl with per-host rate limiting
 - Zero cloud cost — runs 100% locally
 
 Usage:
     python content_scraper.py
+    python content_scraper.py --concurrent --workers 8 --per-host 4
 """
 
 import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
 import os
 import re
 import time
-import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager
 from urllib.parse import urljoin, urlparse, urlunparse
 from datetime import datetime
 from collections import deque
 
+from http_cache import ValidatorCache, content_hash
+from image_store import ImageStore
+from page_store import NDJSON_NAME, SQLITE_NAME, NDJSONPageStore, SQLitePageStore
+from parser_backends import BACKENDS, DEFAULT_BACKEND, get_backend
+
+
+# fetch_page() result for a page that hasn't changed since the last crawl
+NOT_MODIFIED = object()
+
+
+class HostThrottle:
+    """Per-host concurrency cap plus a minimum delay between request starts.
+
+    Used by the concurrent crawl so that a large worker pool never hammers a
+    single site: at most `max_per_host` requests are in flight per host, and
+    consecutive requests to the same host start at least `delay` seconds apart.
+    """
+
+    def __init__(self, max_per_host=4, delay=0.3):
+        self.max_per_host = max_per_host
+        self.delay = delay
+        self._slots = {}
+        self._locks = {}
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.max_per_host)
+            self._locks[host] = asyncio.Lock()
+
+        async with self._slots[host]:
+            # Reserve the next start time for this host, then wait for it
+            async with self._locks[host]:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class ThreadSessions:
+    """A requests.Session per thread, created on first use.
+
+    requests.Session is not documented as thread-safe, and the crawl fetches
+    pages on worker threads while images download on their own pool. Calling
+    the object returns the calling thread's session.
+    """
+
+    def __init__(self, headers):
+        self.headers = headers
+        self._local = threading.local()
+
+    def __call__(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+
+class FrontierQueue(asyncio.Queue):
+    """asyncio.Queue whose pending items can be snapshotted for checkpoints."""
+
+    def snapshot(self):
+        return list(self._queue)
+
 
 class JoyfulHeartScraper:
-    def __init__(self, output_dir="scraped_data"):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, output_dir="scraped_data", allowed_domains=None, parser_backend=DEFAULT_BACKEND,
+                 use_cache=True, image_workers=4):
+        # One session per thread: pages and images are fetched on several
+        self.sessions = ThreadSessions({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
                           '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
         })
 
+        # HTML parser used for extraction (see parser_backends.py)
+        self.parser = get_backend(parser_backend)
+
         self.output_dir = output_dir
         self.images_dir = os.path.join(output_dir, "images")
         self.pages_dir = os.path.join(output_dir, "pages")
         os.makedirs(self.images_dir, exist_ok=True)
         os.makedirs(self.pages_dir, exist_ok=True)
 
+        # ETag / Last-Modified / content hash per URL from previous crawls.
+        # With use_cache=False every page is refetched and re-extracted, but
+        # the validators are still recorded for the next run.
+        self.use_cache = use_cache
+        self.http_cache = ValidatorCache(os.path.join(output_dir, "http_cache.json"))
+        self._fresh_validators = {}
+        self.unchanged = 0
+
+        # Checkpoint bookkeeping: URLs taken off the frontier but not finished,
+        # and the concurrent crawl's live frontier / counter
+        self._in_flight = set()
+        self._frontier = None
+        self._total_scraped = 0
+
         # Tracking
         self.visited = set()
         self.failed = []
-        self.all_pages = []
         self.sitemap = {}
-        self.downloaded_images = {}
 
-        # Domains we're allowed to crawl
-        self.allowed_domains = ["www.joyfulheart.com", "joyfulheart.com",
-                                 "www.jesuswalk.com", "jesuswalk.com"]
+        # Page records are streamed to all_pages.ndjson as they are saved
+        self.pages = NDJSONPageStore(os.path.join(output_dir, NDJSON_NAME))
+
+        # Images download in the background into a content-addressed store;
+        # page JSON is written once a page's images have landed
+        self.images = ImageStore(self.images_dir, os.path.join(output_dir, "image_index.json"),
+                                 self.sessions, self.http_cache, use_cache, image_workers)
+        self._page_writes = []
+
+        # Order in which URLs were taken off the frontier (keeps output
+        # deterministic when pages complete out of order)
+        self.crawl_order = {}
+
+        # Domains we're allowed to crawl (overridable, e.g. for a local fixture server)
+        self.allowed_domains = allowed_domains or ["www.joyfulheart.com", "joyfulheart.com",
+                                                   "www.jesuswalk.com", "jesuswalk.com"]
 
         # Skip patterns (binary files, external links, anchors-only)
         self.skip_extensions = {'.pdf', '.doc', '.docx', '.mp3', '.mp4', '.wav',
@@ -65,6 +170,16 @@ class JoyfulHeartScraper:
             'javascript:', 'mailto:', 'tel:', '#',
         ]
 
+    @property
+    def session(self):
+        """The calling thread's requests.Session"""
+        return self.sessions()
+
+    @property
+    def downloaded_images(self):
+        """Image URL -> local file name, for every image in the store"""
+        return {url: self.images.objects.get(sha) for url, sha in self.images.aliases.items()}
+
     def normalize_url(self, url):
         """Normalize URL for deduplication"""
         parsed = urlparse(url)
@@ -100,12 +215,32 @@ class JoyfulHeartScraper:
 
         return True
 
-    def fetch_page(self, url, retries=2):
-        """Fetch a page with retries"""
+    def fetch_page(self, url, retries=2, conditional=True):
+        """Fetch a page with retries.
+
+        Returns (html, final_url), (None, None) on failure, or
+        (NOT_MODIFIED, final_url) when the page is unchanged since the last
+        crawl — either the server answered our conditional request with 304,
+        or the body hashes the same as before. Unchanged pages are only
+        reported when their previous page JSON is still on disk.
+        """
+        cached = self.http_cache.get(url) if conditional and self.use_cache else None
+        page_file = cached.get('page_file') if cached else None
+        if not page_file or not os.path.isfile(os.path.join(self.pages_dir, page_file)):
+            cached = None
+        headers = self.http_cache.conditional_headers(url) if cached else {}
+
         for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=20, allow_redirects=True)
+                response = self.session.get(url, headers=headers, timeout=20, allow_redirects=True)
+                if response.status_code == 304 and cached:
+                    return NOT_MODIFIED, cached.get('final_url') or url
                 if response.status_code == 200:
+                    body_hash = content_hash(response.content)
+                    # Validators are committed once the page has been processed
+                    self._fresh_validators[url] = (response.headers, body_hash)
+                    if cached and cached.get('sha256') == body_hash:
+                        return NOT_MODIFIED, response.url
                     return response.text, response.url
                 elif response.status_code == 404:
                     return None, None
@@ -119,128 +254,59 @@ class JoyfulHeartScraper:
         return None, None
 
     def download_image(self, img_url, page_url):
-        """Download an image and save locally"""
-        if img_url in self.downloaded_images:
-            return self.downloaded_images[img_url]
+        """Download an image and save locally; blocks until it is stored"""
+        return self.images.fetch(self.normalize_url(urljoin(page_url, img_url))).result()
 
-        try:
-            full_url = urljoin(page_url, img_url)
-            response = self.session.get(full_url, timeout=15, stream=True)
-            if response.status_code == 200:
-                # Generate filename from URL
-                parsed = urlparse(full_url)
-                ext = os.path.splitext(parsed.path)[1] or '.jpg'
-                name = os.path.basename(parsed.path) or 'image'
-                if not name.endswith(ext):
-                    name = name + ext
-
-                # Make unique
-                hash_prefix = hashlib.md5(full_url.encode()).hexdigest()[:8]
-                safe_name = f"{hash_prefix}_{name}"
-                safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', safe_name)
-
-                filepath = os.path.join(self.images_dir, safe_name)
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(8192):
-                        f.write(chunk)
-
-                self.downloaded_images[img_url] = safe_name
-                return safe_name
-        except Exception:
-            pass
-        return None
+    def parse_page(self, html, url):
+        """Parse a page once and return (page_data, new_links).
+
+        The structured record and the frontier links come from the same
+        parse tree and the same walk over its anchors. new_links holds every
+        crawlable link on the page; the crawl loop skips visited ones.
+        """
+        fields = self.parser.extract(html, url)
+        return self._build_record(fields, url, discover=True)
 
     def extract_content(self, html, url):
-        """Extract structured content from a page"""
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # --- Title ---
-        title = ""
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-
-        # --- Meta Description ---
-        meta_desc = ""
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        if meta_tag:
-            meta_desc = meta_tag.get('content', '')
-
-        # --- Headings ---
-        headings = []
-        for level in range(1, 7):
-            for h in soup.find_all(f'h{level}'):
-                text = h.get_text(strip=True)
-                if text:
-                    headings.append({
-                        'level': level,
-                        'text': text
-                    })
-
-        # --- Main Content ---
-        # Try to find the main content area (skip nav/footer)
-        # JoyfulHeart uses tables, so we look for the widest content area
-        content_blocks = []
-
-        # Remove script, style, nav elements
-        for tag in soup.find_all(['script', 'style', 'noscript']):
-            tag.decompose()
-
-        # Extract paragraphs
-        paragraphs = []
-        for p in soup.find_all('p'):
-            text = p.get_text(strip=True)
-            if text and len(text) > 20:  # Skip tiny fragments
-                paragraphs.append(text)
-
-        # Extract lists
-        lists = []
-        for ul in soup.find_all(['ul', 'ol']):
-            items = []
-            for li in ul.find_all('li', recursive=False):
-                li_text = li.get_text(strip=True)
-                li_link = None
-                a_tag = li.find('a')
-                if a_tag and a_tag.get('href'):
-                    li_link = urljoin(url, a_tag['href'])
-                if li_text:
-                    items.append({
-                        'text': li_text,
-                        'link': li_link
-                    })
-            if items:
-                lists.append(items)
-
-        # Extract blockquotes
-        quotes = []
-        for bq in soup.find_all('blockquote'):
-            text = bq.get_text(strip=True)
-            if text:
-                quotes.append(text)
+        """Extract structured content from a page (waits for its images)"""
+        page_data, _ = self._build_record(self.parser.extract(html, url), url)
+        for img in page_data['images']:
+            img['local_file'] = self.images.fetch(self.normalize_url(img['src'])).result()
+        return page_data
+
+    def _build_record(self, fields, url, discover=False):
+        """Turn a parser backend's raw fields into the page record; optionally collect new crawl links too."""
+        # --- Anchors ---
+        # Frontier discovery sees every anchor on the page; internal_links
+        # only the ones left after script/noscript removal.
+        full_hrefs = {}
+        new_links = set()
+        for href in fields['hrefs']:
+            if href in full_hrefs:
+                continue
+            full_href = full_hrefs[href] = urljoin(url, href)
+            if discover:
+                normalized = self.normalize_url(full_href)
+                if self.is_valid_url(normalized):
+                    new_links.add(normalized)
 
         # --- Images ---
+        # local_file is filled in once the image store has the file
         images = []
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            if src:
-                full_src = urljoin(url, src)
-                # Download image
-                local_name = self.download_image(src, url)
-                images.append({
-                    'src': full_src,
-                    'alt': alt,
-                    'local_file': local_name,
-                    'width': img.get('width', ''),
-                    'height': img.get('height', ''),
-                })
+        for img in fields['images']:
+            full_src = urljoin(url, img['src'])
+            images.append({
+                'src': full_src,
+                'alt': img['alt'],
+                'local_file': None,
+                'width': img['width'],
+                'height': img['height'],
+            })
 
         # --- Internal Links ---
         internal_links = []
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            full_href = urljoin(url, href)
-            text = a.get_text(strip=True)
+        for href, text in fields['anchors']:
+            full_href = full_hrefs.get(href) or urljoin(url, href)
             parsed = urlparse(full_href)
             if parsed.netloc.lower() in self.allowed_domains:
                 internal_links.append({
@@ -248,157 +314,407 @@ class JoyfulHeartScraper:
                     'url': full_href,
                 })
 
-        # --- Navigation Links ---
-        nav_links = []
-        nav = soup.find('nav') or soup.find('ul', class_=re.compile('nav|menu', re.I))
-        if nav:
-            for a in nav.find_all('a', href=True):
-                nav_links.append({
-                    'text': a.get_text(strip=True),
-                    'url': urljoin(url, a['href'])
-                })
-
-        # --- Tables (often used for content in old sites) ---
-        tables = []
-        for table in soup.find_all('table'):
-            rows = []
-            for tr in table.find_all('tr'):
-                cells = []
-                for td in tr.find_all(['td', 'th']):
-                    cell_text = td.get_text(strip=True)
-                    cell_html = str(td)
-                    cells.append({
-                        'text': cell_text,
-                        'has_image': bool(td.find('img')),
-                        'has_link': bool(td.find('a')),
-                    })
-                if cells:
-                    rows.append(cells)
-            if rows:
-                tables.append(rows)
-
-        # --- Raw body text (fallback) ---
-        body = soup.find('body')
-        body_text = body.get_text(separator='\n', strip=True) if body else ""
-
         # --- Determine page category ---
         parsed_url = urlparse(url)
         path_parts = [p for p in parsed_url.path.split('/') if p]
         category = path_parts[0] if path_parts else "home"
 
-        return {
+        page_data = {
             'url': url,
-            'title': title,
-            'meta_description': meta_desc,
+            'title': fields['title'],
+            'meta_description': fields['meta_description'],
             'category': category,
-            'headings': headings,
-            'paragraphs': paragraphs,
-            'lists': lists,
-            'quotes': quotes,
+            'headings': fields['headings'],
+            'paragraphs': fields['paragraphs'],
+            'lists': fields['lists'],
+            'quotes': fields['quotes'],
             'images': images,
             'internal_links': internal_links,
-            'nav_links': nav_links,
-            'tables': tables,
-            'body_text': body_text[:5000],  # First 5000 chars of body
+            'nav_links': fields['nav_links'],
+            'tables': fields['tables'],
+            'body_text': fields['body_text'][:5000],  # First 5000 chars of body
             'scraped_at': datetime.now().isoformat(),
         }
+        return page_data, new_links
 
-    def discover_links(self, html, base_url):
-        """Find all internal links on a page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        links = set()
-
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            full_url = urljoin(base_url, href)
-            normalized = self.normalize_url(full_url)
-
-            if self.is_valid_url(normalized) and normalized not in self.visited:
-                links.add(normalized)
-
-        return links
-
-    def crawl(self, start_urls, max_pages=300):
-        """BFS crawl starting from given URLs"""
-        queue = deque()
-        for url in start_urls:
-            normalized = self.normalize_url(url)
-            queue.append(normalized)
-
-        total_scraped = 0
-        start_time = time.time()
-
+    def _print_banner(self, start_urls, max_pages, mode="sequential"):
         print(f"\n{'='*70}")
         print(f"  JOYFUL HEART CONTENT SCRAPER")
         print(f"  Starting crawl of {len(start_urls)} seed URL(s)")
         print(f"  Max pages: {max_pages}")
+        print(f"  Mode: {mode}")
         print(f"  Output: {os.path.abspath(self.output_dir)}")
         print(f"{'='*70}\n")
 
-        while queue and total_scraped < max_pages:
-            url = queue.popleft()
+    def _process_page(self, url, html, final_url):
+        """Extract, save and index one fetched page. Returns (page_data, new_links).
+
+        For an unchanged page (html is NOT_MODIFIED) the previous page JSON
+        and its recorded links are reused instead of re-extracting. The URL
+        leaves `_in_flight` once its page JSON is written, which for a new
+        page is after its images have downloaded.
+        """
+        safe_filename = self._url_to_filename(url)
+        page_path = os.path.join(self.pages_dir, f"{safe_filename}.json")
+
+        if html is NOT_MODIFIED:
+            with open(page_path, 'r', encoding='utf-8') as f:
+                page_data = json.load(f)
+            new_links = set(self.http_cache.get(url).get('links', []))
+            self.pages.append(url, page_data)
+            self.unchanged += 1
+            self._in_flight.discard(url)
+            # A 200 with the same body brings fresh validators: keep them so the
+            # next crawl can ask for a 304 (a 304 leaves nothing here)
+            if url in self._fresh_validators:
+                response_headers, body_hash = self._fresh_validators.pop(url)
+                self.http_cache.update(url, response_headers, body_hash)
+        else:
+            # Extract content and new frontier links from a single parse
+            page_data, new_links = self.parse_page(html, final_url or url)
+
+            # Queue the page's images; its JSON is saved when they are stored
+            response_headers, body_hash = self._fresh_validators.pop(url, (None, None))
+            cache_fields = {
+                'final_url': final_url or url,
+                'page_file': f"{safe_filename}.json",
+                'links': sorted(new_links),
+            }
 
-            if url in self.visited:
-                continue
+            def saved():
+                self.http_cache.update(url, response_headers, body_hash, **cache_fields)
+                # Only now is the page finished for a checkpoint
+                self._in_flight.discard(url)
+
+            self._save_page_when_ready(url, page_path, page_data, saved)
+
+        # Add to sitemap
+        self.sitemap[url] = {
+            'title': page_data['title'],
+            'category': page_data['category'],
+            'heading_count': len(page_data['headings']),
+            'paragraph_count': len(page_data['paragraphs']),
+            'image_count': len(page_data['images']),
+            'internal_link_count': len(page_data['internal_links']),
+        }
 
-            self.visited.add(url)
-            total_scraped += 1
+        return page_data, new_links
 
-            elapsed = time.time() - start_time
-            print(f"  [{total_scraped:3d}/{max_pages}] ({elapsed:.0f}s) Scraping: {url[:80]}...", end=" ")
+    def _save_page_when_ready(self, url, page_path, page_data, on_saved):
+        """Write the page JSON once all of its image downloads have finished.
 
-            html, final_url = self.fetch_page(url)
-            if html is None:
-                print("[FAIL]")
-                self.failed.append(url)
-                continue
+        Runs as a callback on the image workers, so the crawl moves on to the
+        next page straight away; `_wait_for_pages` drains pending writes.
+        """
+        futures = [self.images.fetch(self.normalize_url(img['src'])) for img in page_data['images']]
+        written = Future()
+        self._page_writes.append(written)
+        remaining = [len(futures)]
+        lock = threading.Lock()
 
-            # Extract content
-            page_data = self.extract_content(html, final_url or url)
-            self.all_pages.append(page_data)
-
-            # Save individual page JSON
-            safe_filename = self._url_to_filename(url)
-            page_path = os.path.join(self.pages_dir, f"{safe_filename}.json")
-            with open(page_path, 'w', encoding='utf-8') as f:
-                json.dump(page_data, f, indent=2, ensure_ascii=False)
-
-            # Add to sitemap
-            self.sitemap[url] = {
-                'title': page_data['title'],
-                'category': page_data['category'],
-                'heading_count': len(page_data['headings']),
-                'paragraph_count': len(page_data['paragraphs']),
-                'image_count': len(page_data['images']),
-                'internal_link_count': len(page_data['internal_links']),
-            }
+        def save():
+            try:
+                for img, future in zip(page_data['images'], futures):
+                    img['local_file'] = future.result()
+                with open(page_path, 'w', encoding='utf-8') as f:
+                    json.dump(page_data, f, indent=2, ensure_ascii=False)
+                self.pages.append(url, page_data)
+                on_saved()
+                written.set_result(url)
+            except Exception as e:
+                print(f"  [ERROR] saving {url[:80]}: {e}")
+                written.set_exception(e)
+
+        def image_done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                save()
+
+        if not futures:
+            save()
+        for future in futures:
+            future.add_done_callback(image_done)
+
+    def _wait_for_pages(self):
+        """Block until every queued page JSON has been written."""
+        wait(self._page_writes)
+        self._page_writes = [f for f in self._page_writes if not f.done()]
+
+    def crawl(self, start_urls, max_pages=300, resume=False, checkpoint_every=25):
+        """BFS crawl starting from given URLs.
+
+        The frontier and visited set are checkpointed every `checkpoint_every`
+        pages and on interruption; with resume=True the crawl continues from
+        the last checkpoint instead of the seed URLs.
+
+        Returns the NDJSONPageStore holding the crawled pages (it used to be
+        a list of page dicts). Iterating it streams the page dicts in crawl
+        order from all_pages.ndjson and len() gives the page count; it does
+        not support indexing, so use list(...) if that is needed.
+        """
+        queue = deque()
+        self.pages.create()
+        restored = self.load_checkpoint() if resume else None
+        if restored:
+            frontier, total_scraped = restored
+            queue.extend(frontier)
+        else:
+            for url in start_urls:
+                normalized = self.normalize_url(url)
+                queue.append(normalized)
+            total_scraped = 0
 
-            print(f"[OK] h:{len(page_data['headings'])} p:{len(page_data['paragraphs'])} img:{len(page_data['images'])}")
+        start_time = time.time()
 
-            # Discover new links
-            new_links = self.discover_links(html, final_url or url)
-            for link in new_links:
-                if link not in self.visited:
-                    queue.append(link)
+        self._print_banner(start_urls, max_pages)
 
-            # Polite delay
-            time.sleep(0.3)
+        try:
+            while queue and total_scraped < max_pages:
+                url = queue.popleft()
+
+                if url in self.visited:
+                    continue
+
+                self.visited.add(url)
+                self._in_flight.add(url)
+                total_scraped += 1
+                self.crawl_order[url] = total_scraped
+
+                elapsed = time.time() - start_time
+                print(f"  [{total_scraped:3d}/{max_pages}] ({elapsed:.0f}s) Scraping: {url[:80]}...", end=" ")
+
+                html, final_url = self.fetch_page(url)
+                if html is None:
+                    print("[FAIL]")
+                    self.failed.append(url)
+                    self._in_flight.discard(url)
+                    continue
+
+                status = "[UNCHANGED]" if html is NOT_MODIFIED else "[OK]"
+                page_data, new_links = self._process_page(url, html, final_url)
+                print(f"{status} h:{len(page_data['headings'])} p:{len(page_data['paragraphs'])} img:{len(page_data['images'])}")
+
+                for link in new_links:
+                    if link not in self.visited:
+                        queue.append(link)
+
+                if checkpoint_every and total_scraped % checkpoint_every == 0:
+                    self.save_checkpoint(queue, total_scraped)
+
+                # Polite delay
+                time.sleep(0.3)
+        except BaseException:
+            # Ctrl-C or a crash: keep what we have so --resume can pick it up
+            self.save_checkpoint(queue, total_scraped)
+            print(f"\n  Crawl interrupted — checkpoint saved to {self._checkpoint_path()}")
+            raise
+
+        return self._finish_crawl(total_scraped, start_time)
+
+    def crawl_concurrent(self, start_urls, max_pages=300, workers=8, per_host=4, delay=0.3,
+                         resume=False, checkpoint_every=25):
+        """Concurrent BFS crawl — runs `crawl_async` on a fresh event loop.
+
+        Returns the NDJSONPageStore of crawled pages, as `crawl` does.
+        """
+        try:
+            return asyncio.run(self.crawl_async(start_urls, max_pages, workers, per_host, delay,
+                                                resume, checkpoint_every))
+        except KeyboardInterrupt:
+            # asyncio.run cancels the workers; the frontier is still on self
+            if self._frontier is not None:
+                self.save_checkpoint(self._frontier.snapshot(), self._total_scraped)
+                print(f"\n  Crawl interrupted — checkpoint saved to {self._checkpoint_path()}")
+            raise
+
+    async def crawl_async(self, start_urls, max_pages=300, workers=8, per_host=4, delay=0.3,
+                          resume=False, checkpoint_every=25):
+        """BFS crawl with a bounded pool of asyncio workers.
+
+        Frontier/visited semantics match `crawl`: a URL is marked visited when
+        it is taken off the frontier, and `max_pages` caps how many URLs are
+        taken. Blocking fetches and parsing run on a thread pool sized to
+        `workers`; `HostThrottle` caps in-flight requests and spaces request
+        starts per host. Checkpointing, resume and the returned page store
+        work as in `crawl`.
+        """
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=workers))
+
+        queue = self._frontier = FrontierQueue()
+        self.pages.create()
+        restored = self.load_checkpoint() if resume else None
+        if restored:
+            frontier, self._total_scraped = restored
+            for url in frontier:
+                queue.put_nowait(url)
+        else:
+            for url in start_urls:
+                queue.put_nowait(self.normalize_url(url))
+            self._total_scraped = 0
+
+        throttle = HostThrottle(per_host, delay)
+        start_time = time.time()
 
+        self._print_banner(start_urls, max_pages, mode=f"concurrent ({workers} workers, {per_host}/host)")
+
+        async def worker():
+            while True:
+                url = await queue.get()
+                try:
+                    if url in self.visited or self._total_scraped >= max_pages:
+                        continue
+
+                    self.visited.add(url)
+                    self._in_flight.add(url)
+                    self._total_scraped += 1
+                    n = self._total_scraped
+                    self.crawl_order[url] = n
+
+                    async with throttle.slot(url):
+                        html, final_url = await asyncio.to_thread(self.fetch_page, url)
+
+                    elapsed = time.time() - start_time
+                    if html is None:
+                        print(f"  [{n:3d}/{max_pages}] ({elapsed:.0f}s) Scraping: {url[:80]}... [FAIL]")
+                        self.failed.append(url)
+                        self._in_flight.discard(url)
+                        continue
+
+                    status = "[UNCHANGED]" if html is NOT_MODIFIED else "[OK]"
+                    page_data, new_links = await asyncio.to_thread(self._process_page, url, html, final_url)
+                    print(f"  [{n:3d}/{max_pages}] ({elapsed:.0f}s) Scraping: {url[:80]}... "
+                          f"{status} h:{len(page_data['headings'])} p:{len(page_data['paragraphs'])} img:{len(page_data['images'])}")
+
+                    for link in new_links:
+                        if link not in self.visited:
+                            queue.put_nowait(link)
+
+                    if checkpoint_every and n % checkpoint_every == 0:
+                        self.save_checkpoint(queue.snapshot(), self._total_scraped)
+                except Exception as e:
+                    print(f"  [ERROR] {url[:80]}: {e}")
+                    self.failed.append(url)
+                    self._in_flight.discard(url)
+                finally:
+                    # A cancelled worker leaves its URL in flight for the checkpoint
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Pages finish out of order — restore frontier order for the output files
+        self.sitemap = dict(sorted(self.sitemap.items(), key=lambda kv: self.crawl_order.get(kv[0], 0)))
+        self.failed.sort(key=lambda u: self.crawl_order.get(u, 0))
+        self._frontier = None
+
+        return self._finish_crawl(self._total_scraped, start_time)
+
+    # ==========================================
+    # CHECKPOINTS
+    # ==========================================
+
+    def _checkpoint_path(self):
+        return os.path.join(self.output_dir, "crawl_checkpoint.json")
+
+    def save_checkpoint(self, frontier, total_scraped):
+        """Atomically write the frontier, visited set and crawl bookkeeping.
+
+        Pages that were taken off the frontier but not finished yet go back
+        to the front of the saved frontier, so a resumed crawl fetches them
+        again; finished pages are never refetched. A page is finished once
+        its page JSON is written: one still waiting for its images counts as
+        not finished, so a resume never picks up an older copy of its file.
+        """
+        in_flight = set(self._in_flight)
+        requeue = sorted(in_flight, key=lambda u: self.crawl_order.get(u, 0))
+        state = {
+            'saved_at': datetime.now().isoformat(),
+            'total_scraped': total_scraped - len(in_flight),
+            'visited': sorted(self.visited - in_flight),
+            'frontier': requeue + [u for u in frontier if u not in in_flight],
+            'crawl_order': {u: n for u, n in dict(self.crawl_order).items() if u not in in_flight},
+            'sitemap': {u: e for u, e in dict(self.sitemap).items() if u not in in_flight},
+            'failed': list(self.failed),
+            'unchanged': self.unchanged,
+        }
+        path = self._checkpoint_path()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        # Validators and image index for the pages done so far
+        self.http_cache.save()
+        self.images.save()
+
+    def load_checkpoint(self):
+        """Restore crawl state from the last checkpoint.
+
+        Returns (frontier, total_scraped), or None when there is no checkpoint.
+        Finished pages are reloaded from their page JSON files.
+        """
+        path = self._checkpoint_path()
+        if not os.path.exists(path):
+            print("  No checkpoint found — starting a fresh crawl")
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        self.visited = set(state['visited'])
+        self.sitemap = state['sitemap']
+        self.failed = state['failed']
+        self.crawl_order = state['crawl_order']
+        self.unchanged = state.get('unchanged', 0)
+        frontier = state['frontier']
+        total_scraped = state['total_scraped']
+
+        for url in list(self.sitemap):
+            page_path = os.path.join(self.pages_dir, f"{self._url_to_filename(url)}.json")
+            try:
+                with open(page_path, 'r', encoding='utf-8') as f:
+                    self.pages.append(url, json.load(f))
+            except (OSError, ValueError):
+                # Lost page file: crawl it again
+                del self.sitemap[url]
+                self.visited.discard(url)
+                frontier.insert(0, url)
+                total_scraped -= 1
+
+        print(f"  Resuming from checkpoint ({state['saved_at']}): "
+              f"{len(self.sitemap)} pages done, {len(frontier)} URLs queued")
+        return frontier, total_scraped
+
+    def _finish_crawl(self, total_scraped, start_time):
+        # Let outstanding image downloads and page writes land first
+        self._wait_for_pages()
         total_time = time.time() - start_time
 
         # Save master files
         self._save_master_files(total_time)
 
+        # The crawl finished — nothing left to resume
+        if os.path.exists(self._checkpoint_path()):
+            os.remove(self._checkpoint_path())
+
         print(f"\n{'='*70}")
         print(f"  CRAWL COMPLETE")
         print(f"  Pages scraped: {total_scraped}")
         print(f"  Pages failed:  {len(self.failed)}")
-        print(f"  Images saved:  {len(self.downloaded_images)}")
+        print(f"  Unchanged:     {self.unchanged}")
+        print(f"  Images saved:  {len(self.images.objects)} ({len(self.images.aliases)} URLs)")
         print(f"  Total time:    {total_time:.1f}s")
         print(f"  Output dir:    {os.path.abspath(self.output_dir)}")
         print(f"{'='*70}\n")
 
-        return self.all_pages
+        return self.pages
 
     def _url_to_filename(self, url):
         """Convert URL to a safe filename"""
@@ -420,10 +736,18 @@ class JoyfulHeartScraper:
         with open(sitemap_path, 'w', encoding='utf-8') as f:
             json.dump(self.sitemap, f, indent=2, ensure_ascii=False)
 
-        # All pages combined JSON
-        all_pages_path = os.path.join(self.output_dir, "all_pages.json")
-        with open(all_pages_path, 'w', encoding='utf-8') as f:
-            json.dump(self.all_pages, f, indent=2, ensure_ascii=False)
+        # All pages, one per line, in crawl order
+        self.pages.compact(list(self.sitemap))
+
+        # Same records in SQLite, indexed by URL / file name / category for the generators
+        SQLitePageStore.build(
+            os.path.join(self.output_dir, SQLITE_NAME),
+            ((key, self._url_to_filename(key), page) for key, page in self.pages.items()),
+        ).close()
+
+        # HTTP validators for the next incremental crawl, and the image index
+        self.http_cache.save()
+        self.images.save()
 
         # Failed URLs
         if self.failed:
@@ -434,31 +758,53 @@ class JoyfulHeartScraper:
         # Summary report
         summary = {
             'scrape_date': datetime.now().isoformat(),
-            'total_pages': len(self.all_pages),
+            'total_pages': len(self.pages),
             'total_failed': len(self.failed),
-            'total_images': len(self.downloaded_images),
+            'total_unchanged': self.unchanged,
+            'total_images': len(self.images.objects),
             'total_time_seconds': round(total_time, 1),
             'domains_crawled': list(set(
-                urlparse(p['url']).netloc for p in self.all_pages
+                urlparse(url).netloc for url in self.sitemap
             )),
             'categories': {},
         }
 
         # Count by category
-        for page in self.all_pages:
-            cat = page['category']
+        for entry in self.sitemap.values():
+            cat = entry['category']
             summary['categories'][cat] = summary['categories'].get(cat, 0) + 1
 
         summary_path = os.path.join(self.output_dir, "scrape_summary.json")
         with open(summary_path, 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
 
-        print(f"\n  Saved: sitemap.json, all_pages.json, scrape_summary.json")
+        print(f"\n  Saved: sitemap.json, {NDJSON_NAME}, {SQLITE_NAME}, scrape_summary.json")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape joyfulheart.com and jesuswalk.com")
+    parser.add_argument("--max-pages", type=int, default=250)
+    parser.add_argument("--concurrent", action="store_true",
+                        help="use the asyncio crawl engine instead of the sequential crawl")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent crawl: worker pool size")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent crawl: max in-flight requests per host")
+    parser.add_argument("--delay", type=float, default=0.3, help="concurrent crawl: min seconds between requests to a host")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted crawl from scraped_data/crawl_checkpoint.json")
+    parser.add_argument("--checkpoint-every", type=int, default=25,
+                        help="write a crawl checkpoint every N pages (0 = only on interrupt)")
+    parser.add_argument("--image-workers", type=int, default=4, help="parallel image downloads")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore cached ETag/Last-Modified and refetch everything")
+    parser.add_argument("--parser", default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                        help="HTML parser backend (html.parser is the compatibility default)")
+    args = parser.parse_args()
+
     scraper = JoyfulHeartScraper(
-        output_dir=os.path.join(os.path.dirname(__file__), "..", "scraped_data")
+        output_dir=os.path.join(os.path.dirname(__file__), "..", "scraped_data"),
+        parser_backend=args.parser,
+        use_cache=not args.refresh,
+        image_workers=args.image_workers,
     )
 
     # Seed URLs — start from both homepages
@@ -491,4 +837,10 @@ if __name__ == "__main__":
     ]
 
     # Crawl with a reasonable limit
-    scraper.crawl(seed_urls, max_pages=250)
+    if args.concurrent:
+        scraper.crawl_concurrent(seed_urls, max_pages=args.max_pages, workers=args.workers,
+                                 per_host=args.per_host, delay=args.delay,
+                                 resume=args.resume, checkpoint_every=args.checkpoint_every)
+    else:
+        scraper.crawl(seed_urls, max_pages=args.max_pages,
+                      resume=args.resume, checkpoint_every=args.checkpoint_every)
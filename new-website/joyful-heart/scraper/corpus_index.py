@@ -0,0 +1,285 @@
+"""
+Corpus Index
+============
+In-memory index over a scrape's pages, shared by the Joyful Heart and
+JesusWalk page generators.
+
+Built once at load time from the page store's metadata (URL, crawl key,
+page-file name, category). Lookups by URL, file name, category or domain
+are dictionary hits, so their cost does not grow with the archive. Page
+records are read from the store on first use and kept, so every generator
+method that asks for a page gets the same dict.
+
+The index can also record what a piece of code read from the scrape, for
+build_manifest.py. Inside `recording()`, each lookup notes a dependency key
+with a digest of what it saw:
+
+  page:<filename>     the page's record was read (anything but its url,
+                      category or _filename)
+  category:<name>     the list of pages in a category
+  domain:<site>       the list of pages of a site
+  corpus              the list of all pages
+  url:<url>           which page a URL resolves to
+  filename:<name>     whether a page file exists
+  dir:<name>          the file names in a folder of the scrape (images)
+  file:<path>         whether a file of the scrape exists, and its size
+                      (images are stored under a content hash, see
+                      image_store.py, so a file never changes in place)
+
+`digest(key)` gives the current digest for a key, so a later build can tell
+whether anything an output was made from has changed.
+
+Usage:
+    corpus = CorpusIndex(open_page_store("scraped_data"))
+    books = corpus.get("https://www.jesuswalk.com/books/")
+    for page in corpus.category("prayer"):
+        ...
+    with corpus.recording() as deps:
+        html = render()
+"""
+
+import contextlib
+import hashlib
+import os
+from urllib.parse import urlparse
+
+
+# Page fields that are index metadata: reading them is covered by the
+# category/domain/corpus listing, not a dependency on the page's content
+METADATA_FIELDS = frozenset(["url", "category", "_filename"])
+
+
+def page_domain(url):
+    """Site a URL belongs to, without a leading www. (jesuswalk.com, joyfulheart.com)."""
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class _Page(dict):
+    """A page record that tells its index when its content is read during a recording."""
+
+    __slots__ = ("_index", "_seq")
+
+    def __init__(self, index, seq, data):
+        super().__init__(data)
+        self._index = index
+        self._seq = seq
+
+    def _read(self, field=None):
+        if self._index._recording is not None and field not in METADATA_FIELDS:
+            self._index._record("page:" + self._index._filename_of[self._seq])
+
+    def __getitem__(self, field):
+        self._read(field)
+        return super().__getitem__(field)
+
+    def get(self, field, default=None):
+        self._read(field)
+        return super().get(field, default)
+
+    def __contains__(self, field):
+        self._read(field)
+        return super().__contains__(field)
+
+    # Whole-record reads. Overriding __iter__ also sends dict(page) and
+    # {**page} through keys()/__getitem__ instead of dict's fast copy
+    def __iter__(self):
+        self._read()
+        return super().__iter__()
+
+    def __len__(self):
+        self._read()
+        return super().__len__()
+
+    def keys(self):
+        self._read()
+        return super().keys()
+
+    def items(self):
+        self._read()
+        return super().items()
+
+    def values(self):
+        self._read()
+        return super().values()
+
+    def copy(self):
+        self._read()
+        return dict.copy(self)
+
+    def __reduce__(self):
+        # Sent to render processes as a plain dict (copy.copy goes through here too)
+        self._read()
+        return dict, (dict.copy(self),)
+
+
+class CorpusIndex:
+    def __init__(self, store):
+        self.store = store
+        self.scraped_dir = os.path.dirname(os.path.abspath(store.path))
+        self._pages = {}
+        self._order = []
+        self._by_url = {}
+        self._by_key = {}
+        self._by_filename = {}
+        self._filename_of = {}
+        self._by_category = {}
+        self._by_domain = {}
+        self._entries = {}
+        self._content_digests = None
+        self._digests = {}
+        self._recording = None
+
+        for seq, key, url, filename, category in store.entries():
+            self._entries[seq] = (key, url, filename, category)
+            self._order.append(seq)
+            self._by_url.setdefault(url, seq)
+            self._by_key.setdefault(key, seq)
+            self._by_filename[filename] = seq
+            self._filename_of[seq] = filename
+            self._by_category.setdefault(category, []).append(seq)
+            self._by_domain.setdefault(page_domain(url), []).append(seq)
+
+    def _page(self, seq):
+        page = self._pages.get(seq)
+        if page is None:
+            page = self._pages[seq] = _Page(self, seq, self.store.get_seq(seq))
+        return page
+
+    def get(self, url):
+        """Page crawled at url (its final URL, else the URL requested), or None."""
+        self._record("url:" + url)
+        seq = self._by_url.get(url, self._by_key.get(url))
+        return self._page(seq) if seq is not None else None
+
+    def get_by_filename(self, filename):
+        """Page saved as filename (no .json extension), or None."""
+        self._record("filename:" + filename)
+        seq = self._by_filename.get(filename)
+        return self._page(seq) if seq is not None else None
+
+    def category(self, category):
+        """Pages of one category, in crawl order."""
+        self._record("category:" + category)
+        return [self._page(seq) for seq in self._by_category.get(category, [])]
+
+    def category_size(self, category):
+        self._record("category:" + category)
+        return len(self._by_category.get(category, []))
+
+    @property
+    def categories(self):
+        self._record("corpus")
+        return list(self._by_category)
+
+    def domain(self, domain):
+        """Pages of one site (see page_domain), in crawl order."""
+        self._record("domain:" + domain)
+        return [self._page(seq) for seq in self._by_domain.get(domain, [])]
+
+    def files(self, domain=None):
+        """(filename, page) pairs ordered by file name, optionally for one site only."""
+        self._record("domain:" + domain if domain else "corpus")
+        seqs = self._by_domain.get(domain, []) if domain else self._order
+        return [(self._filename_of[seq], self._page(seq))
+                for seq in sorted(seqs, key=self._filename_of.__getitem__)]
+
+    def urls(self, domain):
+        """(requested URL, final URL, filename) of one site's pages, in crawl order, without loading them."""
+        self._record("domain:" + domain)
+        return [self._entries[seq][:3] for seq in self._by_domain.get(domain, [])]
+
+    def listdir(self, name):
+        """File names in a folder of the scrape (e.g. images), or [] if it doesn't exist."""
+        self._record("dir:" + name)
+        return self._listdir(name)
+
+    def file_size(self, path):
+        """Size of a file of the scrape (e.g. images/x.jpg), or None if it doesn't exist."""
+        self._record("file:" + path)
+        return self._file_size(path)
+
+    def _file_size(self, path):
+        full_path = os.path.join(self.scraped_dir, path)
+        return os.path.getsize(full_path) if os.path.isfile(full_path) else None
+
+    def _listdir(self, name):
+        path = os.path.join(self.scraped_dir, name)
+        return os.listdir(path) if os.path.isdir(path) else []
+
+    def __contains__(self, url):
+        self._record("url:" + url)
+        return url in self._by_url or url in self._by_key
+
+    def __iter__(self):
+        self._record("corpus")
+        for seq in self._order:
+            yield self._page(seq)
+
+    def __len__(self):
+        self._record("corpus")
+        return len(self._order)
+
+    @contextlib.contextmanager
+    def recording(self):
+        """Collect {dependency key: digest} for the lookups made inside the block."""
+        outer, self._recording = self._recording, {}
+        try:
+            yield self._recording
+        finally:
+            self._recording = outer
+
+    def _record(self, key):
+        if self._recording is not None and key not in self._recording:
+            self._recording[key] = self.digest(key)
+
+    def note(self, *keys):
+        """Record dependency keys directly, for answers cached from lookups made earlier (link_resolver.py)."""
+        for key in keys:
+            self._record(key)
+
+    def page_dependency(self, page):
+        """{key: digest} for the content of a page record this index returned."""
+        if not isinstance(page, _Page):
+            return {}
+        key = "page:" + self._filename_of[page._seq]
+        return {key: self.digest(key)}
+
+    def digest(self, key):
+        """Current digest for a dependency key (see the module docstring); None if it no longer resolves."""
+        if key not in self._digests:
+            self._digests[key] = self._compute_digest(key)
+        return self._digests[key]
+
+    def _compute_digest(self, key):
+        kind, _, name = key.partition(":")
+        if kind == "page":
+            seq = self._by_filename.get(name)
+            if seq is None:
+                return None
+            if self._content_digests is None:
+                self._content_digests = self.store.digests()
+            return self._content_digests.get(seq)
+        if kind == "url":
+            seq = self._by_url.get(name, self._by_key.get(name))
+            return self._filename_of[seq] if seq is not None else None
+        if kind == "filename":
+            return name if name in self._by_filename else None
+        if kind == "dir":
+            return _hash_lines(sorted(self._listdir(name)))
+        if kind == "file":
+            size = self._file_size(name)
+            return str(size) if size is not None else None
+        if kind == "category":
+            seqs = self._by_category.get(name, [])
+        elif kind == "domain":
+            seqs = self._by_domain.get(name, [])
+        elif kind == "corpus":
+            seqs = self._order
+        else:
+            return None
+        return _hash_lines("\t".join(self._entries[seq]) for seq in seqs)
+
+
+def _hash_lines(lines):
+    return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
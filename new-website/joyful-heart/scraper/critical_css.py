@@ -0,0 +1,170 @@
+"""
+Critical CSS
+============
+Inlines the part of the site stylesheet a page needs for its first paint,
+and loads the full stylesheet without blocking rendering.
+
+The stylesheet is parsed once into rules. For each page, the tags, classes
+and ids in its HTML are collected, and a rule is critical when one of its
+selectors only names tags, classes and ids the page has (pseudo-classes and
+attribute tests are ignored, so the match errs on the side of keeping a
+rule). @media blocks keep their critical rules, @keyframes are kept when a
+critical rule names them, and :root and universal rules are always kept.
+@import (the web fonts) is left to the full stylesheet: text first paints
+in the fallback fonts instead of waiting for a font request. Pages built from the same template have the same tag/class/id set,
+so the subset is computed once per set.
+
+The page's <link rel="stylesheet"> is then replaced with the critical rules
+in a <style> block plus a preload of the full stylesheet that switches to a
+stylesheet once loaded, with a <noscript> fallback. Rules that only apply
+after interaction (.navbar.scrolled, .nav-links.active) arrive with the
+full stylesheet.
+
+Usage:
+    critical = CriticalCSS(css_text)
+    html = critical.inline(html, "../../assets/site.1a2b3c4d5e.css")
+"""
+
+import re
+
+
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_PSEUDO = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+_ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+_CLASS = re.compile(r"\.([\w-]+)")
+_ID = re.compile(r"#([\w-]+)")
+_TAG = re.compile(r"(?:^|[\s>+~])([a-zA-Z][\w-]*)")
+
+_HTML_TAG = re.compile(r"<([a-zA-Z][\w-]*)")
+_HTML_CLASS = re.compile(r'\sclass="([^"]*)"')
+_HTML_ID = re.compile(r'\sid="([^"]*)"')
+
+
+def parse_css(css):
+    """Split CSS into top-level items: (prelude, block) for rules and at-rule
+    blocks, (statement, None) for statements like @import."""
+    items = []
+    start = depth = 0
+    i = 0
+    while i < len(css):
+        c = css[i]
+        if c in "\"'":
+            match = _STRING.match(css, i)
+            i = match.end() if match else i + 1
+            continue
+        if c == "{":
+            if depth == 0:
+                prelude, block_start = css[start:i].strip(), i + 1
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                items.append((prelude, css[block_start:i]))
+                start = i + 1
+        elif c == ";" and depth == 0:
+            items.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return items
+
+
+def _split_selectors(prelude):
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == "," and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def selector_needs(selector):
+    """(tags, classes, ids) an element tree must have for selector to match anything."""
+    bare = _ATTRIBUTE.sub("", _PSEUDO.sub("", selector))
+    classes = frozenset(_CLASS.findall(bare))
+    ids = frozenset(_ID.findall(bare))
+    tags = frozenset(t.lower() for t in _TAG.findall(_ID.sub("", _CLASS.sub("", bare))))
+    return tags, classes, ids
+
+
+class _Rule:
+    def __init__(self, prelude, block):
+        self.text = f"{prelude}{{{block}}}"
+        self.needs = [selector_needs(s) for s in _split_selectors(prelude)]
+        self.animations = set(re.findall(r"animation(?:-name)?:\s*([\w-]+)", block))
+
+    def used_by(self, tags, classes, ids):
+        return any(t <= tags and c <= classes and i <= ids for t, c, i in self.needs)
+
+
+class CriticalCSS:
+    def __init__(self, css):
+        # ("always", text) | ("rule", rule) | ("block", prelude, rules) | ("keyframes", name, text)
+        self.items = []
+        for prelude, block in parse_css(css):
+            if prelude.startswith("@import"):
+                continue  # Web fonts arrive with the full stylesheet; fetching them first would block paint
+            if block is None or prelude.startswith("@font-face"):
+                self.items.append(("always", f"{prelude};" if block is None else f"{prelude}{{{block}}}"))
+            elif prelude.startswith("@keyframes") or prelude.startswith("@-webkit-keyframes"):
+                self.items.append(("keyframes", prelude.split()[-1], f"{prelude}{{{block}}}"))
+            elif prelude.startswith("@"):
+                rules = [_Rule(p, b) for p, b in parse_css(block) if b is not None]
+                self.items.append(("block", prelude, rules))
+            else:
+                self.items.append(("rule", _Rule(prelude, block)))
+        self._cache = {}
+        self.hits = 0
+
+    def critical(self, html):
+        """The critical subset of the stylesheet for a page."""
+        tags = frozenset(t.lower() for t in _HTML_TAG.findall(html))
+        classes = frozenset(c for value in _HTML_CLASS.findall(html) for c in value.split())
+        ids = frozenset(_HTML_ID.findall(html))
+        key = (tags, classes, ids)
+        css = self._cache.get(key)
+        if css is None:
+            css = self._cache[key] = self._select(tags, classes, ids)
+        else:
+            self.hits += 1
+        return css
+
+    def _select(self, tags, classes, ids):
+        # Universal and :root rules have no needs, so they always match
+        out = []
+        animations = set()
+        for item in self.items:
+            kind = item[0]
+            if kind == "always":
+                out.append(item[1])
+            elif kind == "rule":
+                if item[1].used_by(tags, classes, ids):
+                    out.append(item[1].text)
+                    animations |= item[1].animations
+            elif kind == "block":
+                used = [rule for rule in item[2] if rule.used_by(tags, classes, ids)]
+                if used:
+                    out.append(item[1] + "{" + "".join(rule.text for rule in used) + "}")
+                    for rule in used:
+                        animations |= rule.animations
+        # Keyframes go last: which ones are needed is only known now
+        out.extend(item[2] for item in self.items if item[0] == "keyframes" and item[1] in animations)
+        return "".join(out)
+
+    def inline(self, html, href):
+        """Replace <link rel="stylesheet" href="href"> with critical CSS and a non-blocking load."""
+        link = f'<link rel="stylesheet" href="{href}">'
+        pos = html.find(link)
+        if pos < 0:
+            return html
+        indent = html[html.rfind("\n", 0, pos) + 1:pos]
+        indent = indent if not indent.strip() else ""
+        replacement = (
+            f"<style>{self.critical(html)}</style>\n"
+            f'{indent}<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f"{indent}<noscript>{link}</noscript>")
+        return html[:pos] + replacement + html[pos + len(link):]
@@ -0,0 +1,72 @@
+"""
+HTTP Validator Cache
+====================
+Persistent store of HTTP validators for incremental recrawls.
+
+Each entry is keyed by normalized URL and remembers the response's ETag,
+Last-Modified and the SHA-256 of its body, plus whatever the scraper needs
+to reuse the previous result (the page JSON file and discovered links, or
+the saved image file). The scraper turns these into conditional requests
+(If-None-Match / If-Modified-Since); a 304 — or a 200 whose body hashes the
+same as last time — means the previous output can be kept as is.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+class ValidatorCache:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                # A damaged cache only costs a full refetch
+                self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def conditional_headers(self, key):
+        """Request headers that let the server answer 304 Not Modified."""
+        entry = self.entries.get(key) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def update(self, key, response_headers=None, content_hash=None, **extra):
+        """Record validators from a response plus any extra fields for this URL."""
+        with self._lock:
+            entry = dict(self.entries.get(key) or {})
+            if response_headers is not None:
+                entry['etag'] = response_headers.get('ETag')
+                entry['last_modified'] = response_headers.get('Last-Modified')
+            if content_hash is not None:
+                entry['sha256'] = content_hash
+            entry.update(extra)
+            self.entries[key] = entry
+
+    def save(self):
+        """Write the cache atomically (temp file + rename)."""
+        with self._lock:
+            data = dict(self.entries)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def content_hash(data):
+    """SHA-256 hex digest of a response body (bytes or str)."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,162 @@
+"""
+Image Metadata Index
+====================
+Pixel dimensions of the scraped images, read from their file headers.
+
+The scraper records the width/height attributes of each <img> tag, which are
+empty on most pages. The generators need the real size twice: to drop icons
+and spacers (filter_content_images) and to give every <img> intrinsic
+width/height attributes, so the browser reserves its box before the file
+arrives and the text below doesn't jump when it does.
+
+Dimensions are probed with the standard library only, from the first bytes
+of the file (PNG, GIF, JPEG, WebP and BMP; other files are unknown). A JPEG
+whose EXIF orientation turns it on its side is reported as displayed. The
+results are cached in image_meta.json next to the images folder and only
+files that are new or changed size since the last build are probed again.
+
+Usage:
+    meta = ImageMetaIndex(corpus)
+    meta.size("1a2b3c4d_photo.jpg")   # (468, 300), or None if unknown
+"""
+
+import json
+import os
+import struct
+
+from output_writer import OutputWriter
+
+
+CACHE_NAME = "image_meta.json"
+CACHE_VERSION = 1
+# JPEG segment markers that carry the frame size (SOF0-SOF15 but DHT, JPG and DAC)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_EXIF_ORIENTATION = 0x0112
+
+
+def probe_size(path):
+    """(width, height) of an image file from its header, or None."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+            if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+                return _webp_size(head)
+            if head.startswith(b"BM") and len(head) >= 26:
+                width, height = struct.unpack("<ii", head[18:26])
+                return width, abs(height)  # Negative height: rows stored top-down
+            if head.startswith(b"\xff\xd8"):
+                f.seek(2)
+                return _jpeg_size(f)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def _jpeg_size(f):
+    rotated = False
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        kind = marker[1]
+        if kind == 0xFF:
+            f.seek(-1, 1)  # Fill byte
+            continue
+        if kind in (0x01, 0xD8) or 0xD0 <= kind <= 0xD7:
+            continue  # Markers without a segment
+        if kind in (0xD9, 0xDA):
+            return None  # End of image / start of scan before any frame header
+        length = struct.unpack(">H", f.read(2))[0]
+        if kind in _JPEG_SOF:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return (height, width) if rotated else (width, height)
+        segment = f.read(length - 2)
+        if kind == 0xE1 and segment.startswith(b"Exif\x00\x00"):
+            rotated = _exif_orientation(segment[6:]) in (5, 6, 7, 8)
+
+
+def _exif_orientation(tiff):
+    """Orientation tag of the first IFD of an EXIF TIFF block (1 if absent)."""
+    order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if order is None or len(tiff) < 8:
+        return 1
+    offset = struct.unpack(order + "I", tiff[4:8])[0]
+    if offset + 2 > len(tiff):
+        return 1
+    count = struct.unpack(order + "H", tiff[offset:offset + 2])[0]
+    for i in range(count):
+        entry = tiff[offset + 2 + 12 * i:offset + 14 + 12 * i]
+        if len(entry) < 12:
+            break
+        tag, _type, _count, value = struct.unpack(order + "HHIH", entry[:10])
+        if tag == _EXIF_ORIENTATION:
+            return value
+    return 1
+
+
+class ImageMetaIndex:
+    def __init__(self, corpus, folder="images"):
+        """Index the images in corpus.scraped_dir/folder, probing new or changed files."""
+        self.corpus = corpus
+        self.folder = folder
+        self.images_dir = os.path.join(corpus.scraped_dir, folder)
+        self.cache_path = os.path.join(corpus.scraped_dir, CACHE_NAME)
+        self.probed = 0
+        cached = self._load()
+
+        # name -> [width, height, file size]; width/height are None when unknown
+        self.entries = {}
+        names = sorted(os.listdir(self.images_dir)) if os.path.isdir(self.images_dir) else []
+        for name in names:
+            path = os.path.join(self.images_dir, name)
+            if not os.path.isfile(path):
+                continue
+            file_size = os.path.getsize(path)
+            entry = cached.get(name)
+            if entry is None or entry[2] != file_size:
+                size = probe_size(path)
+                entry = [size[0], size[1], file_size] if size else [None, None, file_size]
+                self.probed += 1
+            self.entries[name] = entry
+        if self.entries != cached:
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("version") == CACHE_VERSION:
+                return cache.get("images", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self):
+        cache = {"version": CACHE_VERSION, "images": self.entries}
+        OutputWriter(os.path.dirname(self.cache_path)).write(CACHE_NAME, json.dumps(cache, indent=1, sort_keys=True))
+
+    def size(self, local_file):
+        """(width, height) of an image in the folder, or None if it's missing or unknown."""
+        # The answer changes when the file does, so pages depend on it
+        self.corpus.file_size(os.path.join(self.folder, local_file))
+        entry = self.entries.get(local_file)
+        if entry is None or entry[0] is None:
+            return None
+        return entry[0], entry[1]
@@ -0,0 +1,192 @@
+"""
+Image Pipeline
+==============
+Resized, recompressed variants of the scraped images for the generated
+pages, and the <picture> markup that serves them.
+
+For each content image the generators show, the pipeline writes (once) to
+<site>/assets/img:
+
+  - the image at each width in WIDTHS that is smaller than the original,
+    plus the original width (at most twice MAX_DISPLAY_WIDTH)
+  - each of those as AVIF (when Pillow has AVIF support) and WebP
+  - each of those as a JPEG (PNG for images with transparency), the
+    fallback for browsers without either
+
+Variants are saved without EXIF, XMP, colour profiles or other metadata,
+after applying the EXIF orientation and converting to sRGB (scanned
+artwork often carries a large print profile). Scraped images are stored under a content hash
+(image_store.py), so a variant name stays valid for as long as the file
+exists and is never regenerated.
+
+The markup is a <picture> with one <source> per modern format and an <img>
+carrying the fallback srcset, width/height (so the browser reserves the
+space before the image loads) and the caller's attributes.
+
+Pillow is optional: without it, or for images it can't handle (animated
+GIFs, unreadable files), `picture()` returns None and the generators keep
+their plain <img> tag.
+
+Usage:
+    images = ImagePipeline(site_dir, "scraped_data/images")
+    html = images.picture("1a2b3c4d_photo.jpg", alt="...", from_dir=pages_dir)
+"""
+
+import io
+import os
+import tempfile
+import warnings
+from html import escape
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+try:
+    from PIL import ImageCms  # Needs Pillow built with LittleCMS
+except ImportError:
+    ImageCms = None
+
+
+IMAGES_DIR = os.path.join("assets", "img")
+WIDTHS = (240, 480, 960)
+# Images are shown at their own width, up to the 800px article column
+MAX_DISPLAY_WIDTH = 800
+QUALITY = {"avif": 55, "webp": 80, "jpeg": 82}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+EXIF_ORIENTATION = 0x0112
+
+
+def available_formats():
+    """Modern formats this Pillow can write, best first."""
+    if Image is None:
+        return []
+    with warnings.catch_warnings():
+        # Pillow before native AVIF support warns about an unknown feature
+        warnings.simplefilter("ignore")
+        avif = features.check("avif")
+    if not avif:
+        try:
+            import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+            avif = True
+        except ImportError:
+            pass
+    return (["avif"] if avif else []) + (["webp"] if features.check("webp") else [])
+
+
+class ImagePipeline:
+    def __init__(self, site_dir, source_dir, widths=WIDTHS, max_display_width=MAX_DISPLAY_WIDTH):
+        self.source_dir = source_dir
+        self.output_dir = os.path.join(site_dir, IMAGES_DIR)
+        self.widths = widths
+        self.max_display_width = max_display_width
+        self.formats = available_formats()
+        self._variants = {}
+
+    @property
+    def enabled(self):
+        return Image is not None
+
+    @property
+    def signature(self):
+        """What the markup depends on besides the code: Pillow's formats and the widths."""
+        if not self.enabled:
+            return "off"
+        return ",".join(self.formats) + "@" + ",".join(str(w) for w in self.widths) + f"/{self.max_display_width}"
+
+    def variants(self, local_file):
+        """(width, height, fallback format, [widths]) for an image, writing missing variants; None if not handled."""
+        if local_file not in self._variants:
+            self._variants[local_file] = self._process(local_file)
+        return self._variants[local_file]
+
+    def _process(self, local_file):
+        path = os.path.join(self.source_dir, local_file)
+        if not self.enabled or not os.path.isfile(path):
+            return None
+        try:
+            with Image.open(path) as im:
+                if getattr(im, "is_animated", False):
+                    return None  # A still image would lose the animation
+                # Everything up to the missing check is read from the header
+                width, height = im.size
+                if im.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+                    width, height = height, width  # exif_transpose turns it by 90 degrees
+                alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+                fallback = "png" if alpha else "jpeg"
+                # Nothing wider than a 2x screen needs at the largest display width
+                largest = min(width, 2 * self.max_display_width)
+                widths = [w for w in self.widths if w < largest] + [largest]
+                missing = [(w, fmt) for w in widths for fmt in self.formats + [fallback]
+                           if not os.path.exists(os.path.join(self.output_dir, self.variant_name(local_file, w, fmt)))]
+                if missing:
+                    im = _to_srgb(ImageOps.exif_transpose(im).convert("RGBA" if alpha else "RGB"))
+                    # The WebP and AVIF encoders would copy EXIF/XMP/ICC from info
+                    im.info = {}
+                    os.makedirs(self.output_dir, exist_ok=True)
+                    resized = {}
+                    for w, fmt in missing:
+                        if w not in resized:
+                            resized[w] = im if w == width else im.resize((w, round(height * w / width)), Image.LANCZOS)
+                        _save(resized[w], os.path.join(self.output_dir, self.variant_name(local_file, w, fmt)), fmt)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+        return width, height, fallback, widths
+
+    def variant_name(self, local_file, width, fmt):
+        stem = os.path.splitext(local_file)[0]
+        return f"{stem}-{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+    def picture(self, local_file, alt="", from_dir=".", **img_attrs):
+        """<picture> markup for a scraped image, or None if the pipeline doesn't handle it.
+
+        alt is inserted as is (already escaped); img_attrs are added to the <img>.
+        """
+        info = self.variants(local_file)
+        if info is None:
+            return None
+        width, height, fallback, widths = info
+        prefix = os.path.relpath(self.output_dir, from_dir).replace(os.sep, "/") + "/"
+        shown = min(width, self.max_display_width)
+        sizes = f"(max-width: {shown}px) 100vw, {shown}px"
+
+        def srcset(fmt):
+            return ", ".join(f"{prefix}{self.variant_name(local_file, w, fmt)} {w}w" for w in widths)
+
+        sources = "".join(f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(fmt)}" sizes="{sizes}">'
+                          for fmt in self.formats)
+        attrs = "".join(f' {name}="{escape(str(value))}"' for name, value in img_attrs.items())
+        return (f'<picture>{sources}'
+                f'<img src="{prefix}{self.variant_name(local_file, widths[-1], fallback)}" '
+                f'srcset="{srcset(fallback)}" sizes="{sizes}" width="{width}" height="{height}" '
+                f'alt="{alt}"{attrs}></picture>')
+
+
+def _to_srgb(im):
+    """Convert an image with an embedded colour profile to sRGB, so the profile can be dropped."""
+    icc_profile = im.info.get("icc_profile")
+    if not icc_profile or ImageCms is None:
+        return im
+    try:
+        source = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+        return ImageCms.profileToProfile(im, source, ImageCms.createProfile("sRGB"), outputMode=im.mode)
+    except (OSError, ImageCms.PyCMSError):
+        return im  # Unusable profile: the pixels are taken as sRGB
+
+
+def _save(im, target, fmt):
+    # Written under a temp name: render processes may make the same variant
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "jpeg":
+            im.save(tmp_path, "JPEG", quality=QUALITY["jpeg"], optimize=True, progressive=True)
+        elif fmt == "png":
+            im.save(tmp_path, "PNG", optimize=True)
+        else:
+            im.save(tmp_path, fmt.upper(), quality=QUALITY[fmt])
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,139 @@
+"""
+Content-Addressed Image Store
+=============================
+Background image downloader for the content scraper.
+
+Images are fetched on a thread pool, so extracting a page never waits on
+image I/O: `fetch(url)` returns a Future right away. Each image is stored
+once, under a name derived from the SHA-256 of its bytes
+(`<sha256[:16]>_<original name>`), and every URL that served those bytes is
+recorded as an alias of it. The same picture linked through different
+relative paths, or copied under several URLs, is therefore saved once.
+
+The index lives in image_index.json next to the images folder:
+
+    {"objects": {sha256: local_file}, "aliases": {url: sha256}}
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+
+class ImageStore:
+    def __init__(self, images_dir, index_path, sessions, http_cache, use_cache=True, workers=4):
+        """sessions() returns the requests.Session for the calling thread (content_scraper.ThreadSessions)."""
+        self.images_dir = images_dir
+        self.index_path = index_path
+        self.sessions = sessions
+        self.http_cache = http_cache
+        self.use_cache = use_cache
+        self.objects = {}
+        self.aliases = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image')
+
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                self.objects = index.get('objects', {})
+                self.aliases = index.get('aliases', {})
+            except (OSError, ValueError):
+                # Images are re-downloaded (and deduplicated) again
+                self.objects, self.aliases = {}, {}
+
+    def fetch(self, url):
+        """Queue a download of url (absolute, normalized); returns a Future of its local file name or None."""
+        with self._lock:
+            future = self._futures.get(url)
+            if future is None:
+                future = self._futures[url] = self._pool.submit(self._download, url)
+        return future
+
+    def local_file(self, url):
+        """Local file name already known for url, or None."""
+        sha = self.aliases.get(url)
+        return self.objects.get(sha) if sha else None
+
+    def _exists(self, local_file):
+        return bool(local_file) and os.path.exists(os.path.join(self.images_dir, local_file))
+
+    def _download(self, url):
+        tmp_path = None
+        try:
+            cached = self.http_cache.get(url) if self.use_cache else None
+            if cached and not self._exists(cached.get('local_file')):
+                cached = None
+            headers = self.http_cache.conditional_headers(url) if cached else {}
+
+            response = self.sessions().get(url, headers=headers, timeout=15, stream=True)
+            if response.status_code == 304 and cached:
+                if cached.get('sha256'):
+                    self._add(url, cached['sha256'], cached['local_file'])
+                return cached['local_file']
+            if response.status_code != 200:
+                return None
+
+            # Stream to a temp file while hashing, then file it under its hash
+            digest = hashlib.sha256()
+            fd, tmp_path = tempfile.mkstemp(dir=self.images_dir, suffix='.part')
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(8192):
+                    digest.update(chunk)
+                    f.write(chunk)
+            sha = digest.hexdigest()
+
+            with self._lock:
+                local_file = self.objects.get(sha)
+                if self._exists(local_file):
+                    os.remove(tmp_path)  # Same bytes already stored under another URL
+                else:
+                    local_file = self._object_name(sha, url)
+                    os.replace(tmp_path, os.path.join(self.images_dir, local_file))
+                tmp_path = None
+                self.objects[sha] = local_file
+                self.aliases[url] = sha
+
+            self.http_cache.update(url, response.headers, sha, local_file=local_file)
+            return local_file
+        except Exception:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    def _add(self, url, sha, local_file):
+        with self._lock:
+            self.objects.setdefault(sha, local_file)
+            self.aliases[url] = sha
+
+    def _object_name(self, sha, url):
+        # Keep the original file name readable: the generators filter
+        # icons and find photos by name
+        path = urlparse(url).path
+        ext = os.path.splitext(path)[1] or '.jpg'
+        name = os.path.basename(path) or 'image'
+        if not name.endswith(ext):
+            name = name + ext
+        return re.sub(r'[^a-zA-Z0-9._-]', '_', f"{sha[:16]}_{name}")
+
+    def save(self):
+        """Write the object/alias index atomically."""
+        with self._lock:
+            index = {'objects': dict(self.objects), 'aliases': dict(self.aliases)}
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def wait(self):
+        """Block until every queued download has finished."""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures)
@@ -0,0 +1,146 @@
+"""
+Link Resolver
+=============
+Where a jesuswalk.com URL lives on the rebuilt site, for links rendered
+by the Joyful Heart generator (the Bible Studies page).
+
+The map used to be a literal pasted into page_generator.py by one-off
+patch scripts, with the links it missed rewritten in the generated page
+afterwards, so every new scrape meant patching and generating again. It is
+now built from the scrape itself:
+
+  - every JesusWalk page in the corpus, by the URL it was requested at and
+    the URL it ended at, points to the page jw_page_generator.py writes for
+    it (study_page_name)
+  - the home page and the generated books/podcast pages (SPECIAL_PAGES)
+    override that
+  - any other study listed on the JesusWalk home page points to its
+    section of the catalog (all-studies.html#<anchor>, CATALOG_SECTIONS)
+
+Building it reads only the index metadata and the home page. The map is
+cached in link_map.json next to the scraped pages, with the digests of the
+corpus entries it came from, and only rebuilt when those change. Targets
+are kept relative to the site root, and `href()` turns them into links
+relative to the page being rendered. During a manifest recording every
+lookup notes the keys the map depends on, so a page is rendered again when
+the set of JesusWalk pages or the home page lists change.
+
+Usage:
+    links = LinkResolver(corpus, site_dir)
+    links.href("https://www.jesuswalk.com/acts/", pages_dir)
+    # "../../jesuswalk/pages/jw_acts.html", or None if not on the site
+"""
+
+import json
+import os
+
+from build_manifest import source_digest
+from output_writer import OutputWriter
+
+
+CACHE_NAME = "link_map.json"
+CACHE_VERSION = 1
+
+JW_DOMAIN = "jesuswalk.com"
+JW_HOME = "https://www.jesuswalk.com/"
+# Folders and pages of the JesusWalk site, relative to the site root
+JW_ROOT = "jesuswalk/index.html"
+JW_PAGES = "jesuswalk/pages"
+CATALOG = JW_PAGES + "/all-studies.html"
+
+# Pages written under another name than the scraped page's (jw_page_generator.py)
+SPECIAL_PAGES = {
+    JW_HOME: JW_ROOT,
+    "https://www.jesuswalk.com/books/": JW_PAGES + "/books.html",
+    "https://www.jesuswalk.com/podcast/": JW_PAGES + "/podcast.html",
+}
+
+# JesusWalk home page list -> section id on all-studies.html, as in
+# JWPageGenerator.generate_all_studies_page
+CATALOG_SECTIONS = [
+    (2, "old-testament"),
+    (3, "gospels"),
+    (4, "acts"),
+    (5, "pauls-letters"),
+    (6, "general-letters"),
+    (7, "revelation"),
+    (8, "topical"),
+]
+
+
+def study_page_name(filename):
+    """Output file name for the JesusWalk page saved as filename (no extension)."""
+    # The scraped home page is not the site's home page
+    return "all-studies-home.html" if filename == "jw_index" else filename + ".html"
+
+
+class LinkResolver:
+    def __init__(self, corpus, site_dir):
+        """Map the JesusWalk URLs of corpus onto the site in site_dir, from the cache when it is current."""
+        self.corpus = corpus
+        self.site_dir = site_dir
+        self.cache_path = os.path.join(corpus.scraped_dir, CACHE_NAME)
+        self.code = source_digest(__file__)
+        self.keys = self._dependency_keys()
+        deps = {key: corpus.digest(key) for key in self.keys}
+
+        cached = self._load()
+        if cached.get("deps") != deps:
+            self.links = self._build()
+            self._save(deps)
+        else:
+            self.links = cached["links"]
+
+    def _dependency_keys(self):
+        keys = ["domain:" + JW_DOMAIN, "url:" + JW_HOME]
+        # A url: key's digest is the file name the URL resolves to
+        home_file = self.corpus.digest("url:" + JW_HOME)
+        if home_file:
+            keys.append("page:" + home_file)
+        return keys
+
+    def _build(self):
+        links = {}
+        home = self.corpus.get(JW_HOME)
+        lists = home.get("lists", []) if home else []
+        for idx, anchor in CATALOG_SECTIONS:
+            for study in lists[idx] if idx < len(lists) else []:
+                link = study.get("link", "")
+                if link:
+                    links.setdefault(link, f"{CATALOG}#{anchor}")
+        for key, url, filename in self.corpus.urls(JW_DOMAIN):
+            target = f"{JW_PAGES}/{study_page_name(filename)}"
+            links[key] = links[url] = target
+        links.update(SPECIAL_PAGES)
+        return links
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("version") == CACHE_VERSION and cache.get("code") == self.code:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save(self, deps):
+        cache = {"version": CACHE_VERSION, "code": self.code, "deps": deps, "links": self.links}
+        OutputWriter(os.path.dirname(self.cache_path)).write(CACHE_NAME, json.dumps(cache, indent=1, sort_keys=True))
+
+    def resolve(self, url):
+        """Target of url relative to the site root (may carry a #fragment), or None."""
+        # Answered from the map, so note what the map was built from
+        self.corpus.note(*self.keys)
+        return self.links.get(url)
+
+    def href(self, url, from_dir):
+        """Link to url's page on the site from a page in from_dir, or None if it isn't on the site."""
+        target = self.resolve(url)
+        return self.relative(target, from_dir) if target else None
+
+    def relative(self, target, from_dir):
+        """Link from a page in from_dir to a target relative to the site root."""
+        path, hash_mark, fragment = target.partition("#")
+        link = os.path.relpath(os.path.join(self.site_dir, path), from_dir).replace(os.sep, "/")
+        return link + hash_mark + fragment
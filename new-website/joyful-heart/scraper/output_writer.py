@@ -0,0 +1,75 @@
+"""
+Output Writer
+=============
+Skip-unchanged, atomic file writes for PageGenerator and JWPageGenerator.
+
+A page is only written when its bytes differ from the file already on
+disk, so unchanged pages keep their mtime and rsync / Netlify / CDN
+diffing only sees real changes. Changed files are written to a temp file in
+the same folder and renamed over the old one, so a reader (or a deploy
+running alongside a build) never sees a half-written page.
+
+Usage:
+    writer = OutputWriter(output_dir)
+    writer.write("about.html", html)
+    print(writer.summary())
+"""
+
+import hashlib
+import os
+import tempfile
+
+
+def _default_mode():
+    # Permissions a plain open(path, "w") would give (mkstemp uses 0600)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class OutputWriter:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.mode = _default_mode()
+        self.written = 0
+        self.unchanged = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, name, text):
+        """Write text to output_dir/name unless the file already has that content. True if written."""
+        data = text.encode("utf-8")
+        path = os.path.join(self.output_dir, name)
+        if _same_content(path, data):
+            self.unchanged += 1
+            return False
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix="." + name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp_path, self.mode)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.written += 1
+        return True
+
+    def copy(self, source, name):
+        """Write a copy of the output source under name. True if written."""
+        with open(os.path.join(self.output_dir, source), "r", encoding="utf-8") as f:
+            return self.write(name, f.read())
+
+    def summary(self):
+        return f"{self.written} written, {self.unchanged} unchanged"
+
+
+def _same_content(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).digest() == hashlib.sha1(data).digest()
+    except OSError:
+        return False
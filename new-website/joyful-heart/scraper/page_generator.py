@@ -11,56 +11,53 @@ with intelligent content cleaning:
   - Adds related articles at the bottom
   - Dr. Wilson's photo on About page
 
+Pages are rebuilt incrementally: .build_manifest.json in the output folder
+records what each page was made from, and only pages whose scraped inputs
+or template code changed are rendered again (see build_manifest.py), and
+gzip/brotli copies are written for the files that changed (precompress.py).
+
 Usage:
     python page_generator.py
+    python page_generator.py --jobs 8
+    python page_generator.py --force
 """
 
+import argparse
+import functools
+import hashlib
 import json
 import os
 import re
 from urllib.parse import urlparse
 from html import escape
 
+import boilerplate
+import critical_css
+import image_meta
+import image_pipeline
+import link_resolver
+from assets import SiteAssets
+from boilerplate import JOYFUL_HEART_BOILERPLATE, JOYFUL_HEART_NAV, JOYFUL_HEART_RULES
+from build_manifest import BuildManifest, source_digest
+from corpus_index import CorpusIndex
+from critical_css import CriticalCSS
+from image_meta import ImageMetaIndex
+from image_pipeline import ImagePipeline
+from link_resolver import CATALOG, JW_HOME, LinkResolver
+from output_writer import OutputWriter
+from page_store import open_page_store
+from parallel_render import render_pages, resolve_jobs
+from precompress import Precompressor
+from templates import compile_template
+
 
 # =========================================================
 # CONTENT CLEANING ENGINE
 # =========================================================
 
-# Patterns that indicate nav/boilerplate paragraphs
-NAV_PATTERNS = [
-    "HomeBible StudiesArticles",
-    "Bible StudiesArticlesBooks",
-    "SearchMenuDonate",
-    "About UsFAQContact Us",
-    "Site Map",
-    "Free \r\n\tE-mail Bible Study",
-    "Free \n\tE-mail Bible Study",
-    "Free E-mail Bible Study",
-    "Newsletter\nPodcast",
-    "Joyful Heart Renewal Ministries, Inc.- Dr. Ralph F. Wilson",
-    "Contributions\nto Joyful Heart",
-    "Contributionsto Joyful Heart",
-    "Country(2-letter abbreviation",
-    "Preferred FormatHTML",
-    "(recommended)Plain text",
-    "FirstLastE-mail",
-    "See legal, copyright, and reprint information",
-    "don't subscribe your friends",
-    "never sell, rent, or loan our lists",
-    "[X] Close Window",
-]
-
-# End-of-article boilerplate markers
-BOILERPLATE_MARKERS = [
-    "Copyright ©",
-    "copyright ©",
-    "All rights reserved",
-    "Do not put this on a website",
-    "See legal, copyright",
-    "To be notified about future articles",
-    "why don't you subscribe",
-    "placing your e-mail address",
-]
+# Nav/boilerplate rules live in boilerplate.py, compiled into one matcher
+NAV_PATTERNS = JOYFUL_HEART_NAV
+BOILERPLATE_MARKERS = JOYFUL_HEART_BOILERPLATE
 
 # References/footnotes section markers
 ENDNOTE_MARKERS = [
@@ -72,13 +69,7 @@ ENDNOTE_MARKERS = [
 
 def is_nav_or_boilerplate(text):
     """Check if a paragraph is navigation or boilerplate text."""
-    for pattern in NAV_PATTERNS:
-        if pattern in text:
-            return True
-    for marker in BOILERPLATE_MARKERS:
-        if marker in text:
-            return True
-    return False
+    return JOYFUL_HEART_RULES.matches(text)
 
 
 def is_endnote(text):
@@ -121,8 +112,12 @@ def clean_paragraph(text):
     return t.strip()
 
 
-def filter_content_images(images):
-    """Filter out nav/UI images, keep only content images."""
+def filter_content_images(images, image_meta=None):
+    """Filter out nav/UI images, keep only content images.
+
+    Images scraped without width/height attributes are measured with
+    image_meta (an ImageMetaIndex), when given.
+    """
     content_imgs = []
     skip_names = [
         "search-icon", "menu-icon", "at_sign", "pencil",
@@ -137,6 +132,8 @@ def filter_content_images(images):
         local = (img.get("local_file", "") or "").lower()
         w = int(img.get("width", 0) or 0)
         h = int(img.get("height", 0) or 0)
+        if not (w and h) and local and image_meta is not None:
+            w, h = image_meta.size(img["local_file"]) or (w, h)
 
         # Skip tiny icons
         if w > 0 and w < 50:
@@ -170,22 +167,35 @@ class PageGenerator:
         self.pages_dir = os.path.join(output_dir, "pages")
         os.makedirs(self.pages_dir, exist_ok=True)
 
-        # Load all scraped data
-        with open(os.path.join(scraped_dir, "all_pages.json"), "r", encoding="utf-8") as f:
-            self.all_pages = json.load(f)
-
         with open(os.path.join(scraped_dir, "sitemap.json"), "r", encoding="utf-8") as f:
             self.sitemap = json.load(f)
 
-        print(f"Loaded {len(self.all_pages)} pages from scraped data")
-
-        # Group pages by category
-        self.by_category = {}
-        for page in self.all_pages:
-            cat = page.get("category", "misc")
-            if cat not in self.by_category:
-                self.by_category[cat] = []
-            self.by_category[cat].append(page)
+        # Scraped pages live in pages.db; the corpus index answers lookups
+        # by URL, file name, category and domain
+        self.corpus = CorpusIndex(open_page_store(scraped_dir))
+
+        print(f"Loaded {len(self.corpus)} pages from scraped data")
+        # Real pixel sizes of the scraped images (most <img> tags had none)
+        self.image_meta = ImageMetaIndex(self.corpus)
+
+        # Cleaned paragraphs per (url, content hash), shared by article bodies,
+        # excerpts, related cards and category cards
+        self._clean_cache = {}
+        self.clean_hits = 0
+
+        # Page layouts compiled once per depth (see build_page)
+        self._layouts = {}
+
+        # Shared stylesheet and script, written to <site>/assets by generate_all
+        site_src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assets = SiteAssets(os.path.dirname(os.path.abspath(output_dir)),
+                                 js_source=os.path.join(site_src, "index.js"))
+        # Above-the-fold rules are inlined into each page (see build_page)
+        self.critical_css = CriticalCSS(self.assets.text("css"))
+        # Resized WebP/AVIF variants of article images, in <site>/assets/img
+        self.images = ImagePipeline(self.assets.site_dir, os.path.join(scraped_dir, "images"))
+        # Local pages for jesuswalk.com links (the Bible Studies cards)
+        self.links = LinkResolver(self.corpus, self.assets.site_dir)
 
         # Category display names & styles
         self.category_meta = {
@@ -212,7 +222,7 @@ class PageGenerator:
         }
 
     def get_css_path(self, depth=1):
-        return "../" * depth + "index.css"
+        return "../" * depth + self.assets.href("css", self.output_dir)
 
     def get_nav_html(self, depth=1):
         root = "../" * depth
@@ -287,21 +297,22 @@ class PageGenerator:
     </div>
   </footer>'''
 
-    def get_js(self):
-        return '''<script>
-    const navbar=document.getElementById('navbar');
-    window.addEventListener('scroll',()=>{navbar.classList.toggle('scrolled',window.scrollY>40)});
-    const mt=document.getElementById('mobileToggle'),nl=document.getElementById('navLinks');
-    mt.addEventListener('click',()=>{const e=mt.getAttribute('aria-expanded')==='true';mt.setAttribute('aria-expanded',!e);nl.classList.toggle('active')});
-    nl.querySelectorAll('a').forEach(a=>a.addEventListener('click',()=>{nl.classList.remove('active');mt.setAttribute('aria-expanded','false')}));
-    const obs=new IntersectionObserver(e=>{e.forEach(en=>{if(en.isIntersecting){en.target.style.animationPlayState='running';obs.unobserve(en.target)}})},{threshold:0.1});
-    document.querySelectorAll('.animate-in').forEach(el=>{el.style.animationPlayState='paused';obs.observe(el)});
-  </script>'''
+    def get_js(self, depth=1):
+        src = "../" * depth + self.assets.href("js", self.output_dir)
+        return f'<script src="{src}"></script>'
 
     def build_page(self, title, content_html, depth=1, description=""):
         desc = description or f"{title} — Joyful Heart Renewal Ministries"
-        desc_escaped = escape(desc[:160])
-        title_escaped = escape(title)
+        layout = self._layouts.get(depth)
+        if layout is None:
+            layout = self._layouts[depth] = compile_template(
+                functools.partial(self.page_layout, depth=depth), "title_escaped", "desc_escaped", "content_html")
+        html = layout.render(title_escaped=escape(title), desc_escaped=escape(desc[:160]),
+                           content_html=content_html)
+        return self.critical_css.inline(html, self.get_css_path(depth))
+
+    def page_layout(self, title_escaped, desc_escaped, content_html, depth=1):
+        """Page skeleton around the content; compiled once per depth by build_page."""
         return f'''<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -316,7 +327,7 @@ class PageGenerator:
   {self.get_nav_html(depth)}
   {content_html}
   {self.get_footer_html(depth)}
-  {self.get_js()}
+  {self.get_js(depth)}
 </body>
 </html>'''
 
@@ -330,8 +341,19 @@ class PageGenerator:
 
     def extract_clean_paragraphs(self, page_data):
         """Extract paragraphs, filtering out navigation and boilerplate.
-        Returns list of (type, text) tuples where type is 'p', 'quote', 'question', 'endnote'."""
+        Returns a tuple of (type, text) pairs where type is 'p', 'quote', 'question', 'endnote'.
+        Memoized per page URL and paragraph content."""
         raw = page_data.get("paragraphs", [])
+        digest = hashlib.sha1("\x00".join(raw).encode("utf-8")).hexdigest()
+        key = (page_data.get("url", ""), digest)
+        cached = self._clean_cache.get(key)
+        if cached is not None:
+            self.clean_hits += 1
+            return cached
+        cleaned = self._clean_cache[key] = tuple(self._clean_paragraphs(raw))
+        return cleaned
+
+    def _clean_paragraphs(self, raw):
         cleaned = []
         hit_endnotes = False
 
@@ -380,11 +402,22 @@ class PageGenerator:
                 return text
         return ""
 
+    def image_tag(self, local_file, alt, **attrs):
+        """Markup for a scraped image on a page in pages/: a <picture> of optimized
+        variants, or the original file with its intrinsic width/height."""
+        size = self.image_meta.size(local_file)
+        html = self.images.picture(local_file, alt=alt, from_dir=self.pages_dir, loading="lazy", **attrs)
+        if html is None:
+            dims = f' width="{size[0]}" height="{size[1]}"' if size else ""
+            extra = "".join(f' {name}="{value}"' for name, value in attrs.items())
+            html = f'<img src="../scraped_data/images/{local_file}" alt="{alt}"{dims}{extra} loading="lazy">'
+        return html
+
     def render_article_body(self, page_data):
         """Render article body HTML with proper formatting."""
         paras = self.extract_clean_paragraphs(page_data)
         headings = page_data.get("headings", [])
-        content_images = filter_content_images(page_data.get("images", []))
+        content_images = filter_content_images(page_data.get("images", []), self.image_meta)
 
         html_parts = []
 
@@ -415,7 +448,7 @@ class PageGenerator:
                     if local_file:
                         html_parts.append(f'''
         <figure class="article-figure animate-in">
-          <img src="../scraped_data/images/{local_file}" alt="{alt}" loading="lazy">
+          {self.image_tag(local_file, alt)}
           {f'<figcaption>{alt}</figcaption>' if alt and alt != "Article illustration" else ""}
         </figure>''')
 
@@ -437,6 +470,12 @@ class PageGenerator:
 
         return '\n'.join(html_parts)
 
+    def article_pages(self):
+        """Scraped pages that get an article page, in crawl order."""
+        return [page for page in self.corpus
+                if ".htm" in page.get("url", "")
+                and page.get("category", "") not in ["home", "menu", "search", "admin", "sitemap.html"]]
+
     def _url_to_filename(self, url):
         parsed = urlparse(url)
         path = parsed.path.strip("/")
@@ -465,7 +504,7 @@ class PageGenerator:
 
         # Related articles in same category
         related_html = ""
-        same_cat = [p for p in self.by_category.get(cat, [])
+        same_cat = [p for p in self.corpus.category(cat)
                     if p["url"] != page_data["url"] and ".htm" in p.get("url", "")]
         related = same_cat[:3]
         if related:
@@ -522,7 +561,7 @@ class PageGenerator:
     def generate_category_page(self, category):
         """Generate a category listing page with cleaned excerpts."""
         meta = self.category_meta.get(category, {"name": category.title(), "gradient": "135deg, #5B4A8A, #7B6AAF"})
-        pages = self.by_category.get(category, [])
+        pages = self.corpus.category(category)
         articles = [p for p in pages if ".htm" in p.get("url", "")]
 
         cards_html = ""
@@ -567,19 +606,18 @@ class PageGenerator:
 
     def generate_about_page(self):
         photo = None
-        images_dir = os.path.join(self.scraped_dir, "images")
-        if os.path.isdir(images_dir):
-            for fname in os.listdir(images_dir):
-                if "ralph" in fname.lower() or "wilson" in fname.lower():
-                    photo = fname
-                    break
+        for fname in self.corpus.listdir("images"):
+            if "ralph" in fname.lower() or "wilson" in fname.lower():
+                photo = fname
+                break
 
-        photo_html = f'<img src="../scraped_data/images/{photo}" alt="Dr. Ralph F. Wilson" style="width:100%;height:400px;object-fit:cover;border-radius:16px;" loading="lazy">' if photo else '<div style="width:100%;height:400px;background:linear-gradient(135deg, #5B4A8A, #7B6AAF);border-radius:16px;display:flex;align-items:center;justify-content:center;"><svg viewBox="0 0 24 24" fill="none" stroke="rgba(255,255,255,0.3)" stroke-width="1.5" width="80" height="80"><path d="M20 21v-2a4 4 0 0 0-4-4H8a4 4 0 0 0-4 4v2"/><circle cx="12" cy="7" r="4"/></svg></div>'
+        photo_html = self.image_tag(photo, "Dr. Ralph F. Wilson",
+                                    style="width:100%;height:400px;object-fit:cover;border-radius:16px;") if photo else '<div style="width:100%;height:400px;background:linear-gradient(135deg, #5B4A8A, #7B6AAF);border-radius:16px;display:flex;align-items:center;justify-content:center;"><svg viewBox="0 0 24 24" fill="none" stroke="rgba(255,255,255,0.3)" stroke-width="1.5" width="80" height="80"><path d="M20 21v-2a4 4 0 0 0-4-4H8a4 4 0 0 0-4 4v2"/><circle cx="12" cy="7" r="4"/></svg></div>'
 
         # Extract about content
         about_data = None
-        for p in self.all_pages:
-            if "about" in p.get("url", "").lower() and p.get("category") == "about":
+        for p in self.corpus.category("about"):
+            if "about" in p.get("url", "").lower():
                 about_data = p
                 break
 
@@ -700,7 +738,7 @@ class PageGenerator:
                               "plant", "holiday"]
         for cat in article_categories:
             meta = self.category_meta.get(cat, {"name": cat.title(), "gradient": "135deg, #5B4A8A, #7B6AAF"})
-            count = len([p for p in self.by_category.get(cat, []) if ".htm" in p.get("url", "")])
+            count = len([p for p in self.corpus.category(cat) if ".htm" in p.get("url", "")])
             if count == 0:
                 continue
             cards_html += f'''
@@ -729,16 +767,8 @@ class PageGenerator:
     def generate_bible_studies_page(self):
         """Generate Bible Studies page dynamically from scraped JesusWalk data."""
 
-        # URL map: original jesuswalk.com URL -> local redesign page
-        # Built dynamically from scraped JSON + hardcoded anchors
-        JW_URL_MAP = {'https://www.jesuswalk.com/abraham/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/jacob/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/moses/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/samuel/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/david/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/solomon/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/elijah/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/psalms/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/isaiah/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/daniel/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/lamb/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament', 'https://www.jesuswalk.com/john/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/luke/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/mark/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/sermon/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/parables/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/7lastwords/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/resurrection/': '../../jesuswalk-redesign/pages/all-studies.html#gospels', 'https://www.jesuswalk.com/acts/': '../../jesuswalk-redesign/pages/all-studies.html#acts', 'https://www.jesuswalk.com/early-church/': '../../jesuswalk-redesign/pages/all-studies.html#acts', 'https://www.jesuswalk.com/romans/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/1corinthians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/2corinthians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/galatians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/ephesians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/philippians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/colossians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/1thessalonians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/timothy/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters', 'https://www.jesuswalk.com/hebrews/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters', 'https://www.jesuswalk.com/james/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters', 'https://www.jesuswalk.com/1peter/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters', 'https://www.jesuswalk.com/123john/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters', 'https://www.jesuswalk.com/revelation/': '../../jesuswalk-redesign/pages/all-studies.html#revelation', 'https://www.jesuswalk.com/grace/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/holy-spirit/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/greatprayers/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/humility/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/names-of-god/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/manifesto/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/proverbs/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/voice/': '../../jesuswalk-redesign/pages/all-studies.html#topical', 'https://www.jesuswalk.com/lords-supper/': '../../jesuswalk-redesign/pages/jw_lords-supper.html', 'https://www.jesuswalk.com/christian-symbols/': '../../jesuswalk-redesign/pages/jw_christian-symbols.html', 'https://www.jesuswalk.com/': '../../jesuswalk-redesign/index.html', 'https://www.jesuswalk.com/beginning/': '../../jesuswalk-redesign/pages/jw_beginning.html', 'https://www.jesuswalk.com/discipleship/': '../../jesuswalk-redesign/pages/jw_discipleship.html', 'https://www.jesuswalk.com/books/': '../../jesuswalk-redesign/pages/jw_books.html', 'https://www.jesuswalk.com/podcast/': '../../jesuswalk-redesign/pages/jw_podcast.html', 'https://www.jesuswalk.com/bible-study/': '../../jesuswalk-redesign/pages/jw_bible-study.html', 'https://www.jesuswalk.com/123john/children-of-god-1jn3-1a.htm': '../../jesuswalk-redesign/pages/jw_123john_children-of-god-1jn3-1a_htm.html', 'https://www.jesuswalk.com/123john/spokesman-sacrifice.htm': '../../jesuswalk-redesign/pages/jw_123john_spokesman-sacrifice_htm.html', 'https://www.jesuswalk.com/1corinthians/steadfast-immoveable.htm': '../../jesuswalk-redesign/pages/jw_1corinthians_steadfast-immoveable_htm.html', 'https://www.jesuswalk.com/1peter/healed-by-his-wounds.htm': '../../jesuswalk-redesign/pages/jw_1peter_healed-by-his-wounds_htm.html', 'https://www.jesuswalk.com/2corinthians/comfort-for-downcast.htm': '../../jesuswalk-redesign/pages/jw_2corinthians_comfort-for-downcast_htm.html', 'https://www.jesuswalk.com/bible-study/bible-study-journal.htm': '../../jesuswalk-redesign/pages/jw_bible-study_bible-study-journal_htm.html', 'https://www.jesuswalk.com/books/beginning.htm': '../../jesuswalk-redesign/pages/jw_books_beginning_htm.html', 'https://www.jesuswalk.com/books/luke.htm': '../../jesuswalk-redesign/pages/jw_books_luke_htm.html', 'https://www.jesuswalk.com/colossians/archippus.htm': '../../jesuswalk-redesign/pages/jw_colossians_archippus_htm.html', 'https://www.jesuswalk.com/colossians/forbearance-forgiveness.htm': '../../jesuswalk-redesign/pages/jw_colossians_forbearance-forgiveness_htm.html', 'https://www.jesuswalk.com/david/david-and-goliath-its-not-your-fight.htm': '../../jesuswalk-redesign/pages/jw_david_david-and-goliath-its-not-your-fight_htm.html', 'https://www.jesuswalk.com/early-church/sweet-incense.htm': '../../jesuswalk-redesign/pages/jw_early-church_sweet-incense_htm.html', 'https://www.jesuswalk.com/books/lords-supper.htm': '../../jesuswalk-redesign/pages/jw_ebooks_lords-supper_htm.html', 'https://www.jesuswalk.com/greatprayers/10_thy_will.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_10_thy_will_htm.html', 'https://www.jesuswalk.com/greatprayers/2_moses_intercession.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_2_moses_intercession_htm.html', 'https://www.jesuswalk.com/greatprayers/3_abraham_sodom.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_3_abraham_sodom_htm.html', 'https://www.jesuswalk.com/greatprayers/4_david_confession.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_4_david_confession_htm.html', 'https://www.jesuswalk.com/greatprayers/5_david_end.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_5_david_end_htm.html', 'https://www.jesuswalk.com/greatprayers/6_hezekiah_petition.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_6_hezekiah_petition_htm.html', 'https://www.jesuswalk.com/greatprayers/8_daniel_confession.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_8_daniel_confession_htm.html', 'https://www.jesuswalk.com/greatprayers/artwork_prayer.htm': '../../jesuswalk-redesign/pages/jw_greatprayers_artwork_prayer_htm.html', 'https://www.jesuswalk.com/hebrews/dont-neglect-church.htm': '../../jesuswalk-redesign/pages/jw_hebrews_dont-neglect-church_htm.html', 'https://www.jesuswalk.com/hebrews/sacrifice-of-praise.htm': '../../jesuswalk-redesign/pages/jw_hebrews_sacrifice-of-praise_htm.html', 'https://www.jesuswalk.com/humility/humility-husbands-serving-wives.htm': '../../jesuswalk-redesign/pages/jw_humility_humility-husbands-serving-wives_htm.html', 'https://www.jesuswalk.com/isaiah/new-thing.htm': '../../jesuswalk-redesign/pages/jw_isaiah_new-thing_htm.html', 'https://www.jesuswalk.com/jacob/why-did-this-happen-to-me.htm': '../../jesuswalk-redesign/pages/jw_jacob_why-did-this-happen-to-me_htm.html', 'https://www.jesuswalk.com/john/half-healing-bethesda.htm': '../../jesuswalk-redesign/pages/jw_john_half-healing-bethesda_htm.html', 'https://www.jesuswalk.com/kutoa/': '../../jesuswalk-redesign/pages/jw_kutoa.html', 'https://www.jesuswalk.com/lamb/lamb_4passover.htm': '../../jesuswalk-redesign/pages/jw_lamb_lamb_4passover_htm.html', 'https://www.jesuswalk.com/luke/049-ask-seek-knock.htm': '../../jesuswalk-redesign/pages/jw_lessons_11_5-13_htm.html', 'https://www.jesuswalk.com/luke/077-unjust-judge.htm': '../../jesuswalk-redesign/pages/jw_lessons_18_1-8_htm.html', 'https://www.jesuswalk.com/luke/luke.htm': '../../jesuswalk-redesign/pages/jw_lessons_22_7-20_htm.html', 'https://www.jesuswalk.com/luke/7-essential-elements-for-growing-as-disciples.htm': '../../jesuswalk-redesign/pages/jw_luke_7-essential-elements-for-growing-as-disciples_htm.html', 'https://www.jesuswalk.com/luke/catch-and-release-luke-5.htm': '../../jesuswalk-redesign/pages/jw_luke_catch-and-release-luke-5_htm.html', 'https://www.jesuswalk.com/luke/gentle-jesus-matt-11-28-30.htm': '../../jesuswalk-redesign/pages/jw_luke_gentle-jesus-matt-11-28-30_htm.html', 'https://www.jesuswalk.com/manifesto/hating-enemies.htm': '../../jesuswalk-redesign/pages/jw_manifesto_hating-enemies_htm.html', 'https://www.jesuswalk.com/peter/worship-as-incense.htm': '../../jesuswalk-redesign/pages/jw_peter_worship-as-incense_htm.html', 'https://www.jesuswalk.com/proverbs/lean-not-on-own-understanding.htm': '../../jesuswalk-redesign/pages/jw_proverbs_lean-not-on-own-understanding_htm.html', 'https://www.jesuswalk.com/psalms/admiring-legs-ps147.htm': '../../jesuswalk-redesign/pages/jw_psalms_admiring-legs-ps147_htm.html', 'https://www.jesuswalk.com/psalms/confidant-ps25-14.htm': '../../jesuswalk-redesign/pages/jw_psalms_confidant-ps25-14_htm.html', 'https://www.jesuswalk.com/psalms/heart-pilgrimage-ps84-5.htm': '../../jesuswalk-redesign/pages/jw_psalms_heart-pilgrimage-ps84-5_htm.html', 'https://www.jesuswalk.com/psalms/higher-rock-psalm-61.htm': '../../jesuswalk-redesign/pages/jw_psalms_higher-rock-psalm-61_htm.html', 'https://www.jesuswalk.com/psalms/psalm-73-glory-portion.htm': '../../jesuswalk-redesign/pages/jw_psalms_psalm-73-glory-portion_htm.html', 'https://www.jesuswalk.com/psalms/psalm-84.htm': '../../jesuswalk-redesign/pages/jw_psalms_psalm-84_htm.html', 'https://www.jesuswalk.com/psalms/psalm-86.htm': '../../jesuswalk-redesign/pages/jw_psalms_psalm-86_htm.html', 'https://www.jesuswalk.com/psalms/psalm32-hiding-place.htm': '../../jesuswalk-redesign/pages/jw_psalms_psalm32-hiding-place_htm.html', 'https://www.jesuswalk.com/psalms/thanksgiving-ps-100.htm': '../../jesuswalk-redesign/pages/jw_psalms_thanksgiving-ps-100_htm.html', 'https://www.jesuswalk.com/timothy/inspiration.htm': '../../jesuswalk-redesign/pages/jw_timothy_inspiration_htm.html', 'https://www.jesuswalk.com/timothy/skilled-workmen.htm': '../../jesuswalk-redesign/pages/jw_timothy_skilled-workmen_htm.html', 'https://www.jesuswalk.com/voice/hearing-aids.htm': '../../jesuswalk-redesign/pages/jw_voice_hearing-aids_htm.html'}
-
         # Find the JesusWalk homepage data which contains the full study listings
-        jw_home = None
-        for p in self.all_pages:
-            if p.get("url") == "https://www.jesuswalk.com/":
-                jw_home = p
-                break
+        jw_home = self.corpus.get(JW_HOME)
 
         # Define sections with their list indices from the scraped data
         # The JesusWalk homepage has lists organized as:
@@ -801,14 +831,16 @@ class PageGenerator:
                             desc = ""
 
                     total_studies += 1
+                    # The study's page on the JesusWalk site, else jesuswalk.com
+                    local = self.links.href(orig_link, self.pages_dir)
 
                     cards_html += f'''
-        <a href="{JW_URL_MAP.get(orig_link) or escape(orig_link)}" class="study-card" style="text-decoration: none; color: inherit;">
+        <a href="{escape(local or orig_link)}" class="study-card" style="text-decoration: none; color: inherit;">
           <div class="study-card-category">{section["label"]}</div>
           <h3>{escape(name)}</h3>
           {f'<p>{escape(desc)}</p>' if desc else ''}
           <div class="study-card-meta"><span>
-            {"Start Study →" if JW_URL_MAP.get(orig_link) else "Open on JesusWalk.com →"}
+            {"Start Study →" if local else "Open on JesusWalk.com →"}
           </span></div>
         </a>'''
 
@@ -825,8 +857,8 @@ class PageGenerator:
       <h1>Free Bible Study <em>Series</em></h1>
       <p class="hero-description">Over {total_studies} free, e-mail delivered Bible studies designed to build disciples. Join tens of thousands studying in 120+ countries.</p>
       <div class="hero-actions">
-    <a href="../../jesuswalk-redesign/index.html" class="btn btn-primary">Browse JesusWalk Site</a>
-    <a href="../../jesuswalk-redesign/pages/all-studies.html" class="btn btn-secondary">Full Study Catalog</a>
+    <a href="{self.links.href(JW_HOME, self.pages_dir)}" class="btn btn-primary">Browse JesusWalk Site</a>
+    <a href="{self.links.relative(CATALOG, self.pages_dir)}" class="btn btn-secondary">Full Study Catalog</a>
   </div>
     </div></div>
   </section>
@@ -887,11 +919,7 @@ class PageGenerator:
         return self.build_page("Podcast", content, description="The Joyful Heart Podcast — meditations by Dr. Ralph F. Wilson.")
 
     def generate_faq_page(self):
-        faq_data = None
-        for p in self.all_pages:
-            if p.get("category") == "faq":
-                faq_data = p
-                break
+        faq_data = next(iter(self.corpus.category("faq")), None)
         faq_items = ""
         if faq_data:
             paras = self.extract_clean_paragraphs(faq_data)
@@ -923,50 +951,42 @@ class PageGenerator:
     # MAIN GENERATION
     # ==========================================
 
-    def generate_all(self):
+    def generate_all(self, jobs=1, force=False):
+        """Write every out-of-date page. Article pages are rendered on `jobs` processes."""
         print(f"\n{'='*70}")
         print(f"  JOYFUL HEART PAGE GENERATOR — PHASE 3 (REFINED)")
         print(f"  Output: {os.path.abspath(self.output_dir)}")
         print(f"{'='*70}\n")
 
+        # Pages link the assets by content hash, inline part of the CSS and use the
+        # image variants, so all of those count as template code
+        code = source_digest(__file__, boilerplate.__file__, critical_css.__file__, image_meta.__file__,
+                             image_pipeline.__file__, link_resolver.__file__, *self.assets.sources)
+        manifest = BuildManifest(self.pages_dir, self.corpus, f"{code}:{self.images.signature}", force=force)
+        writer = OutputWriter(self.pages_dir)
+        asset_writer = self.assets.write()
+        print(f"  [ASSETS] {self.assets.name('css')}, {self.assets.name('js')} ({asset_writer.summary()}"
+              + (f", {len(self.assets.removed)} old versions removed" if self.assets.removed else "") + ")")
         generated = 0
 
         # 1. Core pages
         core = {
-            "about.html": self.generate_about_page(),
-            "contact.html": self.generate_contact_page(),
-            "giving.html": self.generate_giving_page(),
-            "newsletter.html": self.generate_newsletter_page(),
-            "bible-studies.html": self.generate_bible_studies_page(),
-            "books.html": self.generate_books_page(),
-            "podcast.html": self.generate_podcast_page(),
-            "faq.html": self.generate_faq_page(),
-            "articles.html": self.generate_articles_index(),
-    'https://www.jesuswalk.com/2peter/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters',
-    'https://www.jesuswalk.com/7-last-words/': '../../jesuswalk-redesign/pages/all-studies.html#gospels',
-    'https://www.jesuswalk.com/advent/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/ascent/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament',
-    'https://www.jesuswalk.com/christ-power/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/christmas-incarnation/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/church/': '../../jesuswalk-redesign/pages/all-studies.html#acts',
-    'https://www.jesuswalk.com/gideon/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament',
-    'https://www.jesuswalk.com/glory/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/joshua/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament',
-    'https://www.jesuswalk.com/kingdom/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/lamb-revelation/': '../../jesuswalk-redesign/pages/all-studies.html#revelation',
-    'https://www.jesuswalk.com/lords-supper': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/names-god/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/names-jesus/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/paul/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters',
-    'https://www.jesuswalk.com/peter/': '../../jesuswalk-redesign/pages/all-studies.html#general-letters',
-    'https://www.jesuswalk.com/rebuild/': '../../jesuswalk-redesign/pages/all-studies.html#old-testament',
-    'https://www.jesuswalk.com/spirit/': '../../jesuswalk-redesign/pages/all-studies.html#topical',
-    'https://www.jesuswalk.com/thessalonians/': '../../jesuswalk-redesign/pages/all-studies.html#pauls-letters',
+            "about.html": self.generate_about_page,
+            "contact.html": self.generate_contact_page,
+            "giving.html": self.generate_giving_page,
+            "newsletter.html": self.generate_newsletter_page,
+            "bible-studies.html": self.generate_bible_studies_page,
+            "books.html": self.generate_books_page,
+            "podcast.html": self.generate_podcast_page,
+            "faq.html": self.generate_faq_page,
+            "articles.html": self.generate_articles_index,
         }
-        for filename, html in core.items():
-            with open(os.path.join(self.pages_dir, filename), "w", encoding="utf-8") as f:
-                f.write(html)
+        for filename, generate in core.items():
             generated += 1
+            html = manifest.render(filename, generate)
+            if html is None:
+                continue
+            writer.write(filename, html)
             print(f"  [CORE] {filename}")
 
         # 2. Category pages
@@ -975,29 +995,39 @@ class PageGenerator:
                 "thanksgiving", "pentecost", "stpatrick", "art", "misc",
                 "plant", "holiday", "psalms", "luke", "greatprayers"]
         for cat in cats:
-            if cat in self.by_category:
-                html = self.generate_category_page(cat)
-                with open(os.path.join(self.pages_dir, f"cat-{cat}.html"), "w", encoding="utf-8") as f:
-                    f.write(html)
+            if self.corpus.category_size(cat):
                 generated += 1
-                print(f"  [CAT]  cat-{cat}.html ({len(self.by_category[cat])} articles)")
+                html = manifest.render(f"cat-{cat}.html", self.generate_category_page, cat)
+                if html is None:
+                    continue
+                writer.write(f"cat-{cat}.html", html)
+                print(f"  [CAT]  cat-{cat}.html ({self.corpus.category_size(cat)} articles)")
 
         # 3. Individual article pages
+        articles = self.article_pages()
+        generated += len(articles)
+        stale = [page for page in articles
+                 if not manifest.is_current(self._url_to_filename(page["url"]) + ".html")]
         article_count = 0
-        for page in self.all_pages:
-            url = page.get("url", "")
-            if ".htm" not in url:
-                continue
-            if page.get("category", "") in ["home", "menu", "search", "admin", "sitemap.html"]:
-                continue
-            html = self.generate_article_page(page)
-            filename = self._url_to_filename(url) + ".html"
-            with open(os.path.join(self.pages_dir, filename), "w", encoding="utf-8") as f:
-                f.write(html)
+        for page, html, deps in render_pages(self, "generate_article_page", stale, jobs, track=True):
+            filename = self._url_to_filename(page["url"]) + ".html"
+            writer.write(filename, html)
+            manifest.record(filename, deps, html)
             article_count += 1
-            generated += 1
 
-        print(f"\n  [ARTICLES] Generated {article_count} article pages")
+        removed = manifest.prune()
+        manifest.save()
+        # .gz/.br copies of the pages and assets that changed
+        compressor = Precompressor(jobs).run(self.pages_dir, self.assets.assets_dir)
+
+        print(f"\n  [ARTICLES] Generated {article_count} article pages"
+              + (f" on {jobs} processes" if jobs > 1 else ""))
+        if jobs <= 1:
+            print(f"  [CLEAN]    {len(self._clean_cache)} pages cleaned, {self.clean_hits} reused from cache")
+        print(f"  [BUILD]    {manifest.rendered} rendered, {manifest.current} up to date"
+              + (f", {len(removed)} removed" if removed else ""))
+        print(f"  [WRITE]    {writer.summary()}")
+        print(f"  [COMPRESS] {compressor.summary()}")
         print(f"\n{'='*70}")
         print(f"  GENERATION COMPLETE — {generated} pages")
         print(f"  Output: {os.path.abspath(self.pages_dir)}")
@@ -1005,6 +1035,13 @@ class PageGenerator:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the Joyful Heart redesign pages from scraped data")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="render article pages on N processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every page, ignoring the build manifest")
+    args = parser.parse_args()
+
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     gen = PageGenerator(os.path.join(base, "scraped_data"), base)
-    gen.generate_all()
+    gen.generate_all(jobs=resolve_jobs(args.jobs), force=args.force)
@@ -0,0 +1,273 @@
+"""
+Page Stores
+===========
+Storage for scraped page records.
+
+  - all_pages.ndjson  Append-only, one JSON record per line. The scraper
+                      appends each page as soon as it is saved, so it never
+                      holds the whole corpus in memory, and readers stream it
+                      a line at a time with `iter_pages`. Pages are appended
+                      in completion order; `compact` rewrites the file in
+                      crawl order at the end of a crawl.
+  - pages.db          SQLite table written by the scraper after each crawl,
+                      with the record (zlib-compressed compact JSON) indexed
+                      by URL, page-file name and category. Generators use it
+                      to fetch single pages or one category without
+                      deserializing the rest of the corpus. Each row also
+                      keeps the SHA-1 of the record, which build manifests
+                      compare to find pages that changed between scrapes.
+
+Usage:
+    from page_store import load_pages, open_page_store
+    for page in load_pages("scraped_data"):
+        ...
+    store = open_page_store("scraped_data")
+    books = store.get("https://www.jesuswalk.com/books/")
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from urllib.parse import urlparse
+
+
+NDJSON_NAME = "all_pages.ndjson"
+LEGACY_JSON_NAME = "all_pages.json"
+SQLITE_NAME = "pages.db"
+
+
+class NDJSONPageStore:
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def create(self):
+        """Start a new, empty store (truncates any previous file)."""
+        self.close()
+        self._file = open(self.path, 'wb')
+        self.offsets = {}
+
+    def append(self, key, page):
+        """Append one page record, indexed under key (the crawl URL)."""
+        line = json.dumps(page, ensure_ascii=False).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'ab')
+            self.offsets[key] = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+
+    def compact(self, order):
+        """Rewrite the store with one record per key, in the given key order.
+
+        Keys that were appended more than once keep their latest record;
+        keys not in order are dropped.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            tmp_path = self.path + '.tmp'
+            offsets = {}
+            with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for key in order:
+                    if key not in self.offsets:
+                        continue
+                    src.seek(self.offsets[key])
+                    offsets[key] = dst.tell()
+                    dst.write(src.readline())
+            os.replace(tmp_path, self.path)
+            self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        return iter_pages(self.path)
+
+    def items(self):
+        """Yield (key, page) in key order, reading one record at a time."""
+        with open(self.path, 'rb') as f:
+            for key, offset in list(self.offsets.items()):
+                f.seek(offset)
+                yield key, json.loads(f.readline())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_pages(path):
+    """Yield page records from an NDJSON store one at a time."""
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_pages(scraped_dir):
+    """Stream the pages of a scrape; falls back to a legacy all_pages.json."""
+    path = os.path.join(scraped_dir, NDJSON_NAME)
+    if os.path.exists(path):
+        return iter_pages(path)
+    with open(os.path.join(scraped_dir, LEGACY_JSON_NAME), 'r', encoding='utf-8') as f:
+        return iter(json.load(f))
+
+
+class SQLitePageStore:
+    """Read-only random access to a pages.db written by `build`."""
+
+    SCHEMA = """
+        CREATE TABLE pages (
+            seq      INTEGER PRIMARY KEY,
+            key      TEXT NOT NULL,
+            url      TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            category TEXT NOT NULL,
+            digest   TEXT NOT NULL,
+            data     BLOB NOT NULL
+        );
+        CREATE INDEX pages_url ON pages (url);
+        CREATE INDEX pages_key ON pages (key);
+        CREATE UNIQUE INDEX pages_filename ON pages (filename);
+        CREATE INDEX pages_category ON pages (category, seq);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+
+    @classmethod
+    def build(cls, path, records):
+        """Write a new store from (key, filename, page) records, in order.
+
+        Built in a temp file and renamed into place, so readers never see a
+        half-written store. Later records win on a filename clash.
+        """
+        tmp_path = path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        db = sqlite3.connect(tmp_path)
+        db.executescript(cls.SCHEMA)
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO pages (key, url, filename, category, digest, data) VALUES (?, ?, ?, ?, ?, ?)",
+                ((key, page.get('url', key), filename, page.get('category', 'misc')) + _pack(page)
+                 for key, filename, page in records))
+        db.close()
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    def get(self, url):
+        """The page crawled at url (its final or requested URL), or None."""
+        row = self.db.execute("SELECT data FROM pages WHERE url = ? ORDER BY seq LIMIT 1", (url,)).fetchone()
+        if row is None:
+            row = self.db.execute("SELECT data FROM pages WHERE key = ? ORDER BY seq LIMIT 1", (url,)).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def get_by_filename(self, filename):
+        row = self.db.execute("SELECT data FROM pages WHERE filename = ?", (filename,)).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def get_seq(self, seq):
+        """The page stored at row seq (see `entries`)."""
+        row = self.db.execute("SELECT data FROM pages WHERE seq = ?", (seq,)).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def entries(self):
+        """(seq, key, url, filename, category) of every page in crawl order, without the records."""
+        return self.db.execute("SELECT seq, key, url, filename, category FROM pages ORDER BY seq").fetchall()
+
+    def digests(self):
+        """{seq: SHA-1 of the page record} for every page."""
+        try:
+            return dict(self.db.execute("SELECT seq, digest FROM pages"))
+        except sqlite3.OperationalError:
+            # Stores written before the digest column: hash the records
+            return {seq: hashlib.sha1(zlib.decompress(data)).hexdigest()
+                    for seq, data in self.db.execute("SELECT seq, data FROM pages")}
+
+    def by_category(self, category):
+        """Pages of one category, in crawl order."""
+        rows = self.db.execute("SELECT data FROM pages WHERE category = ? ORDER BY seq", (category,))
+        return [_unpack(data) for data, in rows]
+
+    def categories(self):
+        return [cat for cat, in self.db.execute("SELECT DISTINCT category FROM pages ORDER BY category")]
+
+    def items(self, filename_prefix=""):
+        """Yield (filename, page), ordered by filename, optionally only names with a prefix."""
+        pattern = filename_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = self.db.execute("SELECT filename, data FROM pages WHERE filename LIKE ? ESCAPE '\\' "
+                               "ORDER BY filename", (pattern,))
+        for filename, data in rows:
+            yield filename, _unpack(data)
+
+    def __iter__(self):
+        """Stream every page in crawl order."""
+        for data, in self.db.execute("SELECT data FROM pages ORDER BY seq"):
+            yield _unpack(data)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def _pack(page):
+    """(digest, data) columns for a page record."""
+    text = json.dumps(page, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha1(text).hexdigest(), zlib.compress(text)
+
+
+def _unpack(data):
+    return json.loads(zlib.decompress(data))
+
+
+def url_to_filename(url):
+    """Page-file name (without .json) the scraper uses for a URL."""
+    parsed = urlparse(url)
+    path = parsed.path.strip('/')
+    if not path:
+        path = "index"
+    safe = re.sub(r'[^a-zA-Z0-9-]', '_', path)
+    if 'jesuswalk' in parsed.netloc:
+        safe = 'jw_' + safe
+    return safe[:100]
+
+
+def open_page_store(scraped_dir):
+    """Open scraped_dir/pages.db, building it first from older scrape output if needed.
+
+    Older scrapes have all_pages.ndjson / all_pages.json, or only the
+    per-page JSON files in scraped_dir/pages.
+    """
+    path = os.path.join(scraped_dir, SQLITE_NAME)
+    if os.path.exists(path):
+        return SQLitePageStore(path)
+
+    if os.path.exists(os.path.join(scraped_dir, NDJSON_NAME)) or \
+            os.path.exists(os.path.join(scraped_dir, LEGACY_JSON_NAME)):
+        records = ((page['url'], url_to_filename(page['url']), page) for page in load_pages(scraped_dir))
+    else:
+        pages_dir = os.path.join(scraped_dir, "pages")
+        records = _page_file_records(pages_dir, sorted(os.listdir(pages_dir)))
+    print(f"  Building {path} from existing scrape output")
+    return SQLitePageStore.build(path, records)
+
+
+def _page_file_records(pages_dir, names):
+    for name in names:
+        if name.endswith(".json"):
+            with open(os.path.join(pages_dir, name), 'r', encoding='utf-8') as f:
+                page = json.load(f)
+            yield page.get('url', name), name[:-len(".json")], page
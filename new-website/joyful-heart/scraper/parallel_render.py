@@ -0,0 +1,87 @@
+"""
+Parallel Page Rendering
+=======================
+Process-pool rendering shared by PageGenerator and JWPageGenerator.
+
+Rendering a page is pure CPU work (cleaning, templating, escaping), so the
+GIL rules out threads. Each worker process builds its own copy of the
+generator once (loading the corpus index), then renders the pages it is
+sent. Results come back in input order, so the caller writes files in the
+same order as a serial run and the output is identical.
+
+With track=True, each page is rendered inside the generator's
+`corpus.recording()` and its dependencies come back with the HTML, for the
+build manifest.
+
+Usage:
+    for page, html in render_pages(gen, "generate_article_page", pages, jobs=8):
+        ...
+    for page, html, deps in render_pages(gen, "generate_article_page", pages, jobs=8, track=True):
+        ...
+"""
+
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# The generator instance owned by a worker process
+_worker_generator = None
+
+
+def _init_worker(cls, scraped_dir, output_dir):
+    global _worker_generator
+    # Keep the workers' "Loaded N pages" banners off the console
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        _worker_generator = cls(scraped_dir, output_dir)
+
+
+def _render(method_name, page, track=False):
+    return _call(_worker_generator, method_name, page, track)
+
+
+def _call(generator, method_name, page, track):
+    method = getattr(generator, method_name)
+    if not track:
+        return method(page)
+    with generator.corpus.recording() as deps:
+        html = method(page)
+    return html, deps
+
+
+def _result(generator, page, result, track):
+    if not track:
+        return page, result
+    html, deps = result
+    # A worker gets a plain copy of the page, so reads of it aren't seen
+    # there: the page's own record is always a dependency
+    deps.update(generator.corpus.page_dependency(page))
+    return page, html, deps
+
+
+def resolve_jobs(jobs):
+    """--jobs value to a process count: 0 means one per CPU."""
+    return jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+
+
+def render_pages(generator, method_name, pages, jobs=1, track=False):
+    """Yield (page, html) for each page, in order, calling generator.<method_name>(page).
+
+    With jobs > 1 the pages are sharded across that many worker processes.
+    The generator class must take (scraped_dir, output_dir). With track,
+    yields (page, html, deps) instead.
+    """
+    pages = list(pages)
+    if jobs <= 1 or len(pages) < 2:
+        results = (_call(generator, method_name, page, track) for page in pages)
+        for page, result in zip(pages, results):
+            yield _result(generator, page, result, track)
+        return
+
+    chunksize = max(1, len(pages) // (jobs * 4))
+    initargs = (type(generator), generator.scraped_dir, generator.output_dir)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        results = pool.map(_render, [method_name] * len(pages), pages, [track] * len(pages),
+                           chunksize=chunksize)
+        for page, result in zip(pages, results):
+            yield _result(generator, page, result, track)
@@ -0,0 +1,393 @@
+"""
+HTML Parser Backends
+====================
+Pluggable HTML parsers for the content scraper.
+
+The extraction rules live once in `ParserBackend.extract`; each backend only
+supplies a handful of tree primitives (walk elements, read attributes, get
+text, remove a subtree). Available backends:
+
+  - html.parser  BeautifulSoup + Python's html.parser (default). This is the
+                 compatibility path: it returns exactly the page dicts the
+                 scraper has always produced.
+  - lxml         lxml.html (libxml2), if installed
+  - selectolax   selectolax / Lexbor, if installed
+
+The fast backends use browser-style parsers, so on malformed markup (an
+unclosed <p> wrapping a <table>, say) they can split text differently from
+html.parser. Use bench_parsers.py to compare speed and output on a corpus.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from urllib.parse import urljoin
+
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+REMOVED_TAGS = ('script', 'style', 'noscript')
+NAV_CLASS_RE = re.compile('nav|menu', re.I)
+
+# Separator that never occurs in page text, used to split joined text runs
+_SEP = '\x00'
+
+
+class ParserBackend(ABC):
+    """Base class: the extraction algorithm, written against a few tree primitives.
+
+    Subclasses must implement every abstract primitive; an incomplete
+    backend fails when it is constructed."""
+
+    name = None
+
+    @abstractmethod
+    def parse(self, html):
+        raise NotImplementedError
+
+    @abstractmethod
+    def elements(self, root):
+        """All elements under root, in document order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def tag(self, el):
+        raise NotImplementedError
+
+    @abstractmethod
+    def attr(self, el, name):
+        """Attribute value as a string, or None if absent."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def text(self, el, separator=''):
+        """Stripped, non-empty text runs joined by separator (bs4 get_text(strip=True))."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, el):
+        raise NotImplementedError
+
+    def remove_all(self, els):
+        for el in els:
+            self.remove(el)
+
+    @abstractmethod
+    def children(self, el, tag):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find(self, el, tag):
+        """First descendant with this tag, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_all(self, el, tags):
+        """Descendants with any of these tags, in document order."""
+        raise NotImplementedError
+
+    def classes(self, el):
+        return (self.attr(el, 'class') or '').split()
+
+    def extract(self, html, url):
+        """Extract the raw fields of a page.
+
+        Two walks over the tree replace the old one-find_all-per-tag passes:
+        the first collects everything read before script/style/noscript are
+        removed (title, meta, headings, anchor hrefs), the second everything
+        read after.
+        """
+        root = self.parse(html)
+
+        # --- Pass 1: before removal ---
+        title_el = None
+        meta_el = None
+        headings_by_level = {level: [] for level in range(1, 7)}
+        hrefs = []
+        to_remove = []
+        for el in self.elements(root):
+            tag = self.tag(el)
+            if tag in HEADING_TAGS:
+                text = self.text(el)
+                if text:
+                    headings_by_level[int(tag[1])].append(text)
+            elif tag == 'a':
+                href = self.attr(el, 'href')
+                if href is not None:
+                    hrefs.append(href)
+            elif tag in REMOVED_TAGS:
+                to_remove.append(el)
+            elif tag == 'title' and title_el is None:
+                title_el = el
+            elif tag == 'meta' and meta_el is None and self.attr(el, 'name') == 'description':
+                meta_el = el
+
+        title = self.text(title_el) if title_el is not None else ""
+        meta_desc = (self.attr(meta_el, 'content') or '') if meta_el is not None else ""
+        headings = [{'level': level, 'text': text}
+                    for level in range(1, 7) for text in headings_by_level[level]]
+
+        self.remove_all(to_remove)
+
+        # --- Pass 2: after removal ---
+        paragraphs = []
+        lists = []
+        quotes = []
+        images = []
+        anchors = []
+        tables = []
+        nav = None
+        nav_ul = None
+        body = None
+        for el in self.elements(root):
+            tag = self.tag(el)
+            if tag == 'p':
+                text = self.text(el)
+                if text and len(text) > 20:  # Skip tiny fragments
+                    paragraphs.append(text)
+            elif tag == 'a':
+                href = self.attr(el, 'href')
+                if href is not None:
+                    anchors.append((href, self.text(el)))
+            elif tag in ('ul', 'ol'):
+                items = []
+                for li in self.children(el, 'li'):
+                    li_text = self.text(li)
+                    li_link = None
+                    a_tag = self.find(li, 'a')
+                    if a_tag is not None and self.attr(a_tag, 'href'):
+                        li_link = urljoin(url, self.attr(a_tag, 'href'))
+                    if li_text:
+                        items.append({
+                            'text': li_text,
+                            'link': li_link
+                        })
+                if items:
+                    lists.append(items)
+                if tag == 'ul' and nav_ul is None and any(NAV_CLASS_RE.search(c) for c in self.classes(el)):
+                    nav_ul = el
+            elif tag == 'blockquote':
+                text = self.text(el)
+                if text:
+                    quotes.append(text)
+            elif tag == 'img':
+                src = self.attr(el, 'src') or ''
+                if src:
+                    images.append({
+                        'src': src,
+                        'alt': self.attr(el, 'alt') or '',
+                        'width': self.attr(el, 'width') or '',
+                        'height': self.attr(el, 'height') or '',
+                    })
+            elif tag == 'table':
+                rows = []
+                for tr in self.find_all(el, ('tr',)):
+                    cells = []
+                    for td in self.find_all(tr, ('td', 'th')):
+                        cells.append({
+                            'text': self.text(td),
+                            'has_image': self.find(td, 'img') is not None,
+                            'has_link': self.find(td, 'a') is not None,
+                        })
+                    if cells:
+                        rows.append(cells)
+                if rows:
+                    tables.append(rows)
+            elif tag == 'nav' and nav is None:
+                nav = el
+            elif tag == 'body' and body is None:
+                body = el
+
+        nav_links = []
+        nav = nav if nav is not None else nav_ul
+        if nav is not None:
+            for a in self.find_all(nav, ('a',)):
+                href = self.attr(a, 'href')
+                if href is not None:
+                    nav_links.append({
+                        'text': self.text(a),
+                        'url': urljoin(url, href)
+                    })
+
+        return {
+            'title': title,
+            'meta_description': meta_desc,
+            'headings': headings,
+            'paragraphs': paragraphs,
+            'lists': lists,
+            'quotes': quotes,
+            'images': images,
+            'hrefs': hrefs,
+            'anchors': anchors,
+            'nav_links': nav_links,
+            'tables': tables,
+            'body_text': self.text(body, separator='\n') if body is not None else "",
+        }
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup tree; with html.parser this is the compatibility path."""
+
+    def __init__(self, features='html.parser'):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+        self.features = features
+        self.name = features
+
+    def parse(self, html):
+        return self._soup(html, self.features)
+
+    def elements(self, root):
+        return root.find_all(True)
+
+    def tag(self, el):
+        return el.name
+
+    def attr(self, el, name):
+        value = el.get(name)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value
+
+    def text(self, el, separator=''):
+        return el.get_text(separator=separator, strip=True)
+
+    def remove(self, el):
+        el.decompose()
+
+    def children(self, el, tag):
+        return el.find_all(tag, recursive=False)
+
+    def find(self, el, tag):
+        return el.find(tag)
+
+    def find_all(self, el, tags):
+        return el.find_all(list(tags))
+
+    def classes(self, el):
+        return el.get('class') or []
+
+
+class LxmlBackend(ParserBackend):
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._element = etree.Element
+
+    def parse(self, html):
+        try:
+            return self._html.document_fromstring(html)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must go in as bytes
+            return self._html.document_fromstring(html.encode('utf-8'))
+
+    def elements(self, root):
+        # Snapshot: the first pass removes elements from under the iterator
+        return list(root.iter(self._element))
+
+    def tag(self, el):
+        return el.tag
+
+    def attr(self, el, name):
+        return el.get(name)
+
+    def text(self, el, separator=''):
+        return separator.join(s for s in (t.strip() for t in el.itertext()) if s)
+
+    def remove(self, el):
+        if el.getparent() is not None:
+            el.drop_tree()  # keeps the tail text, like bs4's decompose
+
+    def children(self, el, tag):
+        return [c for c in el if c.tag == tag]
+
+    def find(self, el, tag):
+        return next(el.iterdescendants(tag), None)
+
+    def find_all(self, el, tags):
+        return el.iterdescendants(*tags)
+
+
+class SelectolaxBackend(ParserBackend):
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser
+        self._parser = HTMLParser
+
+    def parse(self, html):
+        return self._parser(html).root
+
+    def elements(self, root):
+        return [n for n in root.traverse() if not n.tag.startswith('-')]
+
+    def tag(self, el):
+        return el.tag
+
+    def attr(self, el, name):
+        attrs = el.attributes
+        if name not in attrs:
+            return None
+        return attrs[name] or ''
+
+    def text(self, el, separator=''):
+        # selectolax keeps empty runs after stripping; drop them like bs4 does
+        raw = el.text(deep=True, separator=_SEP, strip=True)
+        return separator.join(s for s in raw.split(_SEP) if s)
+
+    def remove(self, el):
+        el.decompose()
+
+    def remove_all(self, els):
+        # Decomposing frees the whole subtree, so only remove the outermost
+        # nodes — touching a node inside an already-freed subtree would crash
+        outermost = []
+        for el in els:
+            parent = el.parent
+            while parent is not None and parent.tag not in REMOVED_TAGS:
+                parent = parent.parent
+            if parent is None:
+                outermost.append(el)
+        for el in outermost:
+            self.remove(el)
+
+    def children(self, el, tag):
+        return [c for c in el.iter() if c.tag == tag]
+
+    def find(self, el, tag):
+        return el.css_first(tag)
+
+    def find_all(self, el, tags):
+        return el.css(','.join(tags))
+
+
+BACKENDS = {
+    'html.parser': SoupBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+DEFAULT_BACKEND = 'html.parser'
+
+
+def get_backend(name=DEFAULT_BACKEND):
+    """Instantiate a backend by name. Raises ImportError if its parser isn't installed."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {name!r} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+def available_backends():
+    """Names of the backends whose parser library is installed."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
@@ -0,0 +1,177 @@
+"""
+Precompressed Output
+====================
+gzip and brotli copies of the generated pages, stylesheet and script.
+
+For every text file in the given folders (HTML, CSS, JS, JSON, SVG, XML),
+page.html.gz and page.html.br are written next to it at maximum compression
+(gzip level 9, brotli quality 11). A static server that supports
+precompressed files (nginx gzip_static / brotli_static, Caddy
+precompressed, ...) then sends those bytes with no per-request CPU.
+
+Only files that changed since the last run are compressed again: each copy
+gets the modification time of its source, and OutputWriter leaves
+unchanged files untouched, so a copy with the same mtime is up to date.
+Copies whose source is gone (a page dropped from the scrape) are removed.
+Files are compressed on `jobs` processes; the output doesn't depend on it.
+
+brotli is optional (pip install brotli); without it only .gz files are
+written.
+
+Usage:
+    python precompress.py                       # the generated folders of new-website
+    python precompress.py ../pages --jobs 4
+    Precompressor(jobs=4).run(pages_dir, assets_dir)
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from parallel_render import resolve_jobs
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".xml")
+# Smaller responses fit in one packet anyway
+MIN_SIZE = 256
+
+
+def encodings():
+    """File suffixes that will be written: gz, and br if brotli is installed."""
+    return ["gz", "br"] if brotli is not None else ["gz"]
+
+
+def compress(data, encoding):
+    if encoding == "gz":
+        # mtime=0 keeps the output identical from build to build
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+
+def _compress_file(path, suffixes):
+    """Write the compressed copies of path. Returns the bytes saved per copy."""
+    with open(path, "rb") as f:
+        data = f.read()
+    stat = os.stat(path)
+    saved = []
+    for suffix in suffixes:
+        packed = compress(data, suffix)
+        target = f"{path}.{suffix}"
+        if len(packed) >= len(data):
+            _remove_copies(path, [suffix])
+            continue
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix="." + os.path.basename(target),
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(packed)
+            os.chmod(tmp_path, stat.st_mode & 0o777)
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        saved.append(len(data) - len(packed))
+    # Left by a run that had brotli: it would be stale now
+    _remove_copies(path, {"gz", "br"} - set(suffixes))
+    return saved
+
+
+def _remove_copies(path, suffixes):
+    for suffix in suffixes:
+        if os.path.exists(f"{path}.{suffix}"):
+            os.remove(f"{path}.{suffix}")
+
+
+class Precompressor:
+    def __init__(self, jobs=1):
+        self.jobs = jobs
+        self.suffixes = encodings()
+        self.compressed = 0
+        self.current = 0
+        self.removed = 0
+        self.saved = 0
+
+    def run(self, *dirs):
+        """Compress the out-of-date files of dirs (not recursive). Returns self."""
+        stale = []
+        for folder in dirs:
+            if not os.path.isdir(folder):
+                continue
+            names = set(os.listdir(folder))
+            for name in sorted(names):
+                if name.startswith("."):
+                    continue  # Build manifest, temp files
+                path = os.path.join(folder, name)
+                base, dot, suffix = name.rpartition(".")
+                if dot and suffix in ("gz", "br"):
+                    if base.endswith(EXTENSIONS) and base not in names:
+                        os.remove(path)
+                        self.removed += 1
+                    continue
+                if not name.endswith(EXTENSIONS) or not os.path.isfile(path):
+                    continue
+                if os.path.getsize(path) < MIN_SIZE:
+                    _remove_copies(path, ("gz", "br"))
+                    continue
+                if self._is_current(path):
+                    self.current += 1
+                else:
+                    stale.append(path)
+
+        if self.jobs <= 1 or len(stale) < 2:
+            results = (_compress_file(path, self.suffixes) for path in stale)
+            self._count(results)
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                self._count(pool.map(_compress_file, stale, [self.suffixes] * len(stale),
+                                     chunksize=max(1, len(stale) // (self.jobs * 4))))
+        return self
+
+    def _is_current(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        for suffix in self.suffixes:
+            try:
+                if os.stat(f"{path}.{suffix}").st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _count(self, results):
+        for saved in results:
+            self.compressed += 1
+            self.saved += sum(saved)
+
+    def summary(self):
+        text = f"{self.compressed} compressed ({', '.join(self.suffixes)}), {self.current} up to date"
+        if self.removed:
+            text += f", {self.removed} stale copies removed"
+        return text
+
+
+if __name__ == "__main__":
+    site_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    default_dirs = [os.path.join(site_dir, "joyful-heart", "pages"),
+                    os.path.join(site_dir, "jesuswalk", "pages"),
+                    os.path.join(site_dir, "assets")]
+
+    parser = argparse.ArgumentParser(description="Write .gz/.br copies of the generated site files")
+    parser.add_argument("dirs", nargs="*", default=default_dirs,
+                        help="folders to compress (default: the generated pages and assets)")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="compress on N processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    compressor = Precompressor(resolve_jobs(args.jobs)).run(*args.dirs)
+    print(f"[COMPRESS] {compressor.summary()}, {compressor.saved / 1024:.0f} KB saved")
+    if brotli is None:
+        print("[COMPRESS] brotli is not installed: only .gz copies were written (pip install brotli)")
@@ -0,0 +1,149 @@
+"""
+Search Index
+============
+Prebuilt search indexes for the generated pages, queried in the browser.
+
+`catalog_index(entries)` indexes a short list of items (the JesusWalk
+studies catalog): every word of each item's fields maps to the list of
+items that contain it. The result is a small JSON object embedded in the
+page:
+
+    {"terms":    ["abraham", "acts", ...],      sorted
+     "postings": [[0], [17, 18, 19], ...],      item numbers per term
+     "groups":   [0, 0, ..., 6]}                group (section) per item
+
+The page script (jesuswalk/study-search.js) finds the terms a query word is
+a prefix of with a binary search over `terms`, so a keystroke costs a few
+lookups whatever the number of cards, and only touches the cards whose
+visibility changes.
+
+`FullTextIndex` is the site-wide index of every article and study page
+(build_search_index.py). Each posting carries the page's BM25 score for the
+word, computed at build time and scaled to 1-255, so the browser only adds
+numbers. Terms are split, in sorted order, into shards of about
+SHARD_BYTES of JSON, and page titles/excerpts into chunks of DOC_CHUNK
+pages; every file is named after a hash of its content. A small manifest
+(embedded in the search page) lists the first term of each shard, so a
+query loads the one or two shards that can hold its words and the chunks of
+the pages it shows, not the whole index:
+
+    manifest  {"pages": N, "chunk": 64, "chunks": [file, ...],
+               "shards": [[first term, file], ...], "stop": [...]}
+    shard     {"terms": [...], "postings": [[page gap, score, page gap, score, ...], ...]}
+    chunk     [[path, title, site, excerpt], ...]
+
+Text is split into words the same way here and in the scripts: lowercased,
+accents and apostrophes removed, split on anything but letters and digits.
+"""
+
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from assets import content_name
+
+
+# Words too common to narrow a search: left out of the full-text index and
+# dropped from queries
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from had has have he her his i if in into is it its me my not of on or our
+she so that the their them then there they this to was we were what when which who will with you your
+""".split())
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# A word in the title counts as this many occurrences in the text
+TITLE_WEIGHT = 3
+SHARD_BYTES = 24 * 1024
+DOC_CHUNK = 64
+
+_APOSTROPHES = re.compile(r"['’]")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def tokenize(text):
+    """Words of text for indexing and queries (see the module docstring)."""
+    text = unicodedata.normalize("NFD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [word for word in _NON_WORD.split(_APOSTROPHES.sub("", text)) if word]
+
+
+def catalog_index(entries):
+    """Index [(group number, [field text, ...]), ...]; item numbers follow the list order."""
+    postings = {}
+    groups = []
+    for item, (group, fields) in enumerate(entries):
+        groups.append(group)
+        for word in tokenize(" ".join(fields)):
+            items = postings.setdefault(word, [])
+            if not items or items[-1] != item:
+                items.append(item)
+    terms = sorted(postings)
+    return {"terms": terms, "postings": [postings[term] for term in terms], "groups": groups}
+
+
+class FullTextIndex:
+    def __init__(self):
+        self.pages = []     # [path, title, site, excerpt]
+        self.lengths = []   # indexed words per page
+        self.postings = {}  # word -> {page number: occurrences}
+
+    def add(self, path, title, site, paragraphs, excerpt=""):
+        """Index a page: path is its URL relative to the site root."""
+        page = len(self.pages)
+        self.pages.append([path, " ".join(title.split()), site, excerpt])
+        counts = Counter(word for word in tokenize(" ".join(paragraphs)) if word not in STOP_WORDS)
+        for word in tokenize(title):
+            if word not in STOP_WORDS:
+                counts[word] += TITLE_WEIGHT
+        self.lengths.append(sum(counts.values()))
+        for word, count in counts.items():
+            self.postings.setdefault(word, {})[page] = count
+
+    def scores(self):
+        """word -> [(page number, BM25 score scaled to 1-255), ...] in page order."""
+        n = len(self.pages)
+        avg_length = (sum(self.lengths) / n if n else 0) or 1
+        raw = {}
+        for word, pages in self.postings.items():
+            idf = math.log(1 + (n - len(pages) + 0.5) / (len(pages) + 0.5))
+            raw[word] = [(page, idf * tf * (BM25_K1 + 1)
+                          / (tf + BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[page] / avg_length)))
+                         for page, tf in sorted(pages.items())]
+        top = max((score for postings in raw.values() for _, score in postings), default=1)
+        return {word: [(page, max(1, round(255 * score / top))) for page, score in postings]
+                for word, postings in raw.items()}
+
+    def files(self):
+        """({file name: JSON text}, manifest) for the whole index."""
+        files = {}
+
+        def add_file(stem, data):
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+            name = content_name(stem, "json", text)
+            files[name] = text
+            return name
+
+        shards = []
+        terms, postings, size = [], [], 0
+        scores = self.scores()
+        for word in sorted(scores):
+            flat, previous = [], 0
+            for page, score in scores[word]:
+                flat += [page - previous, score]
+                previous = page
+            terms.append(word)
+            postings.append(flat)
+            size += len(word) + 4 * len(flat) + 4
+            if size >= SHARD_BYTES:
+                shards.append([terms[0], add_file("shard", {"terms": terms, "postings": postings})])
+                terms, postings, size = [], [], 0
+        if terms:
+            shards.append([terms[0], add_file("shard", {"terms": terms, "postings": postings})])
+
+        chunks = [add_file("pages", self.pages[i:i + DOC_CHUNK]) for i in range(0, len(self.pages), DOC_CHUNK)]
+        manifest = {"pages": len(self.pages), "chunk": DOC_CHUNK, "chunks": chunks,
+                    "shards": shards, "stop": sorted(STOP_WORDS)}
+        return files, manifest
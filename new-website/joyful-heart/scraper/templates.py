@@ -0,0 +1,49 @@
+"""
+Page Templates
+==============
+Precompiled page layouts for PageGenerator and JWPageGenerator.
+
+A layout is written as an ordinary function that formats a whole page from
+keyword arguments (the generators keep their f-string HTML). It is compiled
+once: the function is called with a marker for each slot, and the result is
+split into the static chunks between the markers. Rendering a page is then
+a single join of the prebuilt chunks with the slot values; the nav, footer
+and script fragments are not formatted again for every page.
+
+Usage:
+    layout = compile_template(page_layout, "title", "description", "content")
+    html = layout.render(title=..., description=..., content=...)
+"""
+
+import re
+
+
+def _marker(name):
+    return f"\x00{name}\x00"
+
+
+_MARKER = re.compile("\x00(\\w+)\x00")
+
+
+class PageTemplate:
+    def __init__(self, source, slots):
+        """source is the page text with a _marker(name) where each slot goes."""
+        parts = _MARKER.split(source)
+        unknown = set(parts[1::2]) - set(slots)
+        if unknown:
+            raise ValueError(f"template has unknown slots: {sorted(unknown)}")
+        self.slots = tuple(slots)
+        self._parts = parts
+        # (position in _parts, slot name) for every slot occurrence
+        self._slot_at = [(i, parts[i]) for i in range(1, len(parts), 2)]
+
+    def render(self, **values):
+        parts = self._parts[:]
+        for i, name in self._slot_at:
+            parts[i] = values[name]
+        return "".join(parts)
+
+
+def compile_template(layout, *slots):
+    """Compile layout(**{slot: value}) -> str into a PageTemplate."""
+    return PageTemplate(layout(**{name: _marker(name) for name in slots}), slots)
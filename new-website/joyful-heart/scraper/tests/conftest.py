@@ -0,0 +1,133 @@
+"""
+Shared fixtures for the scraper tests: a local HTTP site to crawl and
+corpus indexes built from page records.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+from corpus_index import CorpusIndex
+from page_store import SQLITE_NAME, SQLitePageStore, url_to_filename
+
+
+class FakeSite:
+    """A site served from memory on 127.0.0.1, logging every request.
+
+    pages maps a path to its body (str or bytes). With etags on, responses
+    carry an ETag and a Last-Modified and conditional requests get a 304.
+    """
+
+    def __init__(self, pages, latency=0.0, etags=False):
+        self.pages = dict(pages)
+        self.latency = latency
+        self.etags = etags
+        self.requests = []  # {path, headers, status, start, end}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+        self.server.daemon_threads = True
+        self.server.site = self
+        self.host = f"127.0.0.1:{self.server.server_port}"
+        self.url = f"http://{self.host}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def requests_for(self, path):
+        return [r for r in self.requests if r["path"] == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        site = self.server.site
+        start = time.monotonic()
+        with site._lock:
+            site.in_flight += 1
+            site.max_in_flight = max(site.max_in_flight, site.in_flight)
+        try:
+            if site.latency:
+                time.sleep(site.latency)
+            status = self._respond(site)
+        finally:
+            with site._lock:
+                site.in_flight -= 1
+                site.requests.append({"path": self.path, "headers": dict(self.headers), "status": status,
+                                      "start": start, "end": time.monotonic()})
+
+    def _respond(self, site):
+        body = site.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return 404
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if site.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return 304
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png" if self.path.endswith(".png") else "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if site.etags:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Mon, 05 Oct 2026 10:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(body)
+        return 200
+
+    def log_message(self, format, *args):
+        pass
+
+
+def html_page(title, links=(), paragraphs=("Some text of the page.",)):
+    """A small HTML page with a heading, paragraphs and links."""
+    anchors = "".join(f'<a href="{link}">{link}</a> ' for link in links)
+    body = "".join(f"<p>{text}</p>" for text in paragraphs)
+    return (f"<html><head><title>{title}</title></head>"
+            f"<body><h1>{title}</h1>{body}<nav>{anchors}</nav></body></html>")
+
+
+@pytest.fixture
+def fake_site():
+    """Factory for FakeSite servers, shut down after the test."""
+    sites = []
+
+    def start(pages, **kwargs):
+        site = FakeSite(pages, **kwargs)
+        sites.append(site)
+        return site
+
+    yield start
+    for site in sites:
+        site.close()
+
+
+@pytest.fixture
+def make_corpus(tmp_path):
+    """Factory: CorpusIndex over a pages.db written from [(crawl URL, page), ...].
+
+    Calling it again rewrites the store, as a new scrape would.
+    """
+    scraped_dir = tmp_path / "scraped_data"
+    scraped_dir.mkdir()
+
+    def build(records):
+        path = str(scraped_dir / SQLITE_NAME)
+        SQLitePageStore.build(path, [(key, url_to_filename(key), page) for key, page in records]).close()
+        return CorpusIndex(SQLitePageStore(path))
+
+    return build
@@ -0,0 +1,72 @@
+"""Boilerplate classifier: same answers as one check per rule, loop or automaton."""
+
+import random
+import re
+
+import pytest
+
+from boilerplate import (JESUSWALK_NAV, JESUSWALK_RULES, JOYFUL_HEART_BOILERPLATE, JOYFUL_HEART_NAV,
+                         JOYFUL_HEART_RULES, LOOP_MAX_MARKERS, BoilerplateClassifier, MarkerAutomaton)
+
+TEXTS = [
+    "",
+    "Prayer is talking with God.",
+    "Copyright © 2024 Joyful Heart Renewal Ministries",
+    "HomeBible StudiesArticles",
+    "homebible studies, lower case",
+    "Read more. [X] Close Window",
+    "We respect your   privacy and never sell our lists",
+    "Free \tE-mail Bible Study",
+    "beginning the journey ... sitemap",
+    "Beginning the Journey ... Sitemap and more",
+    "Please\nbookmark this page",
+    "See legal, copyright, and reprint information",
+]
+
+
+def test_automaton_finds_any_marker():
+    rng = random.Random(7)
+    for _ in range(2000):
+        markers = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 8))]
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 20)))
+        assert MarkerAutomaton(markers).search(text) == any(m in text for m in markers), (markers, text)
+
+
+def test_automaton_edge_cases():
+    assert MarkerAutomaton(["he", "she", "his", "hers"]).search("ushers")
+    assert not MarkerAutomaton(["he", "she", "his", "hers"]).search("usual")
+    assert not MarkerAutomaton([]).search("anything")
+    assert MarkerAutomaton([""]).search("")
+
+
+@pytest.mark.parametrize("count", [10, LOOP_MAX_MARKERS + 1])
+def test_markers_match_like_substring_checks(count):
+    rng = random.Random(count)
+    markers = ["".join(rng.choice("abcdef ") for _ in range(rng.randint(2, 6))) for _ in range(count)]
+    classifier = BoilerplateClassifier(markers=markers)
+    assert (classifier._automaton is not None) == (count > LOOP_MAX_MARKERS)
+    for _ in range(500):
+        text = "".join(rng.choice("abcdefg ") for _ in range(rng.randint(0, 30)))
+        assert classifier.matches(text) == any(m in text for m in markers)
+
+
+def test_site_rules_match_like_one_check_per_rule():
+    flags = re.IGNORECASE | re.DOTALL
+    for text in TEXTS:
+        assert JESUSWALK_RULES.matches(text) == any(re.search(p, text, flags) for p in JESUSWALK_NAV), text
+        assert JOYFUL_HEART_RULES.matches(text) == any(
+            m in text for m in JOYFUL_HEART_NAV + JOYFUL_HEART_BOILERPLATE), text
+    assert JESUSWALK_RULES.rule_count == len(JESUSWALK_NAV)
+
+
+def test_patterns_keep_their_flags():
+    case_sensitive = BoilerplateClassifier(patterns=[r"^Home", r"Close Window", r"a\s+b"])
+    assert case_sensitive.matches("Home page")
+    assert not case_sensitive.matches("home page")
+    assert not case_sensitive.matches("close window")
+    assert case_sensitive.matches("a \n b")
+    # Patterns that can't run on lower-cased text keep IGNORECASE
+    folded = BoilerplateClassifier(patterns=[r"(?:Alpha|Omega) end", r"\N{BULLET} Menu"], flags=re.IGNORECASE)
+    assert folded.matches("the OMEGA END")
+    assert folded.matches("• MENU")
+    assert not folded.matches("omega")
@@ -0,0 +1,137 @@
+"""Incremental builds: what BuildManifest considers stale, and what CorpusIndex records."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from build_manifest import BuildManifest
+from output_writer import OutputWriter
+
+HOME = "https://www.joyfulheart.com/"
+PRAYER = "https://www.joyfulheart.com/prayer/ask.htm"
+GRACE = "https://www.joyfulheart.com/grace/gift.htm"
+
+
+def page(url, title, category):
+    return {"url": url, "title": title, "category": category, "paragraphs": [f"About {title}"]}
+
+
+def records(prayer_title="Asking", extra=()):
+    return [(HOME, page(HOME, "Home", "home")),
+            (PRAYER, page(PRAYER, prayer_title, "prayer")),
+            (GRACE, page(GRACE, "Gift", "grace"))] + list(extra)
+
+
+def render_article(corpus, url):
+    p = corpus.get(url)
+    return f"<h1>{p['title']}</h1>" + "".join(f"<p>{text}</p>" for text in p["paragraphs"])
+
+
+def render_listing(corpus, category):
+    return "".join(f"<li>{p['url']}</li>" for p in corpus.category(category))
+
+
+def build(tmp_path, corpus, code="v1", force=False):
+    """Render both outputs as a generator would. Returns (manifest, names rendered)."""
+    out = str(tmp_path / "site")
+    writer = OutputWriter(out)
+    manifest = BuildManifest(out, corpus, code, force)
+    rendered = []
+    for name, generate, arg in [("ask.html", render_article, PRAYER), ("prayer.html", render_listing, "prayer")]:
+        html = manifest.render(name, generate, corpus, arg)
+        if html is not None:
+            writer.write(name, html)
+            rendered.append(name)
+    manifest.prune()
+    manifest.save()
+    return manifest, rendered
+
+
+def test_unchanged_scrape_renders_nothing(tmp_path, make_corpus):
+    assert build(tmp_path, make_corpus(records()))[1] == ["ask.html", "prayer.html"]
+    manifest, rendered = build(tmp_path, make_corpus(records()))
+    assert rendered == []
+    assert manifest.current == 2
+
+
+def test_changed_page_renders_its_outputs(tmp_path, make_corpus):
+    build(tmp_path, make_corpus(records()))
+    # The listing reads only urls, so a new title doesn't touch it
+    assert build(tmp_path, make_corpus(records(prayer_title="Asking God")))[1] == ["ask.html"]
+    assert "Asking God" in (tmp_path / "site" / "ask.html").read_text()
+
+
+def test_unrelated_page_change_renders_nothing(tmp_path, make_corpus):
+    build(tmp_path, make_corpus(records()))
+    changed = records()
+    changed[2] = (GRACE, page(GRACE, "Gift, revised", "grace"))
+    assert build(tmp_path, make_corpus(changed))[1] == []
+
+
+def test_category_change_renders_listing(tmp_path, make_corpus):
+    build(tmp_path, make_corpus(records()))
+    more = "https://www.joyfulheart.com/prayer/more.htm"
+    assert build(tmp_path, make_corpus(records(extra=[(more, page(more, "More", "prayer"))])))[1] == ["prayer.html"]
+
+
+def test_code_force_and_edited_output_render_again(tmp_path, make_corpus):
+    corpus = make_corpus(records())
+    build(tmp_path, corpus)
+    assert build(tmp_path, corpus, code="v2")[1] == ["ask.html", "prayer.html"]
+    assert build(tmp_path, corpus, code="v2", force=True)[1] == ["ask.html", "prayer.html"]
+
+    (tmp_path / "site" / "ask.html").write_text("edited by hand")
+    assert build(tmp_path, corpus, code="v2")[1] == ["ask.html"]
+    os.remove(tmp_path / "site" / "prayer.html")
+    assert build(tmp_path, corpus, code="v2")[1] == ["prayer.html"]
+
+
+def test_outputs_no_longer_produced_are_removed(tmp_path, make_corpus):
+    corpus = make_corpus(records())
+    build(tmp_path, corpus)
+    out = str(tmp_path / "site")
+    manifest = BuildManifest(out, corpus, "v1")
+    assert manifest.render("ask.html", render_article, corpus, PRAYER) is None
+    assert manifest.prune() == ["prayer.html"]
+    assert not os.path.exists(os.path.join(out, "prayer.html"))
+
+
+@pytest.mark.parametrize("read", [
+    dict, list, len, lambda p: {**p}, lambda p: p.copy(), lambda p: copy.copy(p),
+    json.dumps, lambda p: (lambda **kw: kw)(**p), lambda p: list(p.items()), lambda p: "title" in p,
+])
+def test_whole_record_reads_are_recorded(make_corpus, read):
+    corpus = make_corpus(records())
+    p = corpus.get(PRAYER)
+    with corpus.recording() as deps:
+        read(p)
+    assert "page:prayer_ask_htm" in deps
+
+
+def test_metadata_reads_are_not_page_dependencies(make_corpus):
+    corpus = make_corpus(records())
+    with corpus.recording() as deps:
+        listing = corpus.category("prayer")
+        urls = [p["url"] for p in listing]
+    assert urls == [PRAYER]
+    assert set(deps) == {"category:prayer"}
+
+
+def test_dir_digest_ignores_listing_order(make_corpus, monkeypatch):
+    corpus = make_corpus(records())
+    images = os.path.join(corpus.scraped_dir, "images")
+    os.makedirs(images)
+    for name in ["b.jpg", "a.jpg", "c.jpg"]:
+        open(os.path.join(images, name), "w").close()
+    digest = corpus.digest("dir:images")
+
+    listdir = corpus._listdir
+    monkeypatch.setattr(corpus, "_listdir", lambda name: list(reversed(listdir(name))))
+    corpus._digests.clear()
+    assert corpus.digest("dir:images") == digest
+
+    open(os.path.join(images, "d.jpg"), "w").close()
+    corpus._digests.clear()
+    assert corpus.digest("dir:images") != digest
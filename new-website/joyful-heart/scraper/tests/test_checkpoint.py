@@ -0,0 +1,148 @@
+"""Crawl checkpoints: what an interrupted crawl saves, and --resume."""
+
+import json
+import os
+import threading
+
+import pytest
+
+from conftest import html_page
+from content_scraper import JoyfulHeartScraper
+from page_store import iter_pages
+
+NAMES = ["p0", "p1", "p2", "p3"]
+
+
+@pytest.fixture
+def site(fake_site):
+    pages = {"/": html_page("Home", [f"/{name}.html" for name in NAMES])}
+    for name in NAMES:
+        pages[f"/{name}.html"] = html_page(f"Page {name}", ["/"])
+    return fake_site(pages)
+
+
+def interrupted_crawl(out, site, after):
+    """Sequential crawl stopped by Ctrl-C while fetching its page number after + 1."""
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    fetch_page = scraper.fetch_page
+    fetched = []
+
+    def fetch_or_interrupt(url, *args, **kwargs):
+        if len(fetched) == after:
+            raise KeyboardInterrupt
+        fetched.append(url)
+        return fetch_page(url, *args, **kwargs)
+
+    scraper.fetch_page = fetch_or_interrupt
+    with pytest.raises(KeyboardInterrupt):
+        scraper.crawl([site.url + "/"])
+    return scraper
+
+
+def load_checkpoint_file(out):
+    with open(os.path.join(out, "crawl_checkpoint.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_interrupted_crawl_saves_frontier(tmp_path, site):
+    out = str(tmp_path / "out")
+    scraper = interrupted_crawl(out, site, after=2)
+
+    state = load_checkpoint_file(out)
+    done = [url for url in scraper.crawl_order if url in scraper.sitemap]
+    assert len(done) == 2
+    assert state["total_scraped"] == 2
+    assert sorted(state["visited"]) == sorted(done)
+    assert sorted(state["sitemap"]) == sorted(done)
+    # The page being fetched goes back to the front of the frontier
+    interrupted = max(scraper.crawl_order, key=scraper.crawl_order.get)
+    assert state["frontier"][0] == interrupted
+    assert set(state["frontier"]) == {site.url + "/" + name + ".html" for name in NAMES} - set(done)
+    assert os.path.exists(os.path.join(out, "http_cache.json"))
+
+
+def test_resume_fetches_only_unfinished_pages(tmp_path, site):
+    out = str(tmp_path / "out")
+    interrupted_crawl(out, site, after=2)
+    done = [r["path"] for r in site.requests]
+    site.requests.clear()
+
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    pages = scraper.crawl_concurrent([site.url + "/"], workers=2, per_host=2, delay=0, resume=True)
+
+    resumed = [r["path"] for r in site.requests]
+    assert not set(done) & set(resumed)
+    assert sorted(done + resumed) == sorted(["/"] + [f"/{name}.html" for name in NAMES])
+    assert len(scraper.sitemap) == 5
+    assert sorted(page["url"] for page in iter_pages(pages.path)) == sorted(scraper.sitemap)
+    assert not os.path.exists(os.path.join(out, "crawl_checkpoint.json"))
+
+
+def test_resume_refetches_pages_whose_file_is_lost(tmp_path, site):
+    out = str(tmp_path / "out")
+    interrupted_crawl(out, site, after=2)
+    os.remove(os.path.join(out, "pages", "index.json"))
+    site.requests.clear()
+
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    scraper.crawl([site.url + "/"], resume=True)
+
+    assert site.requests_for("/")
+    assert len(scraper.sitemap) == 5
+    assert os.path.exists(os.path.join(out, "pages", "index.json"))
+
+
+def test_resume_without_checkpoint_starts_from_seeds(tmp_path, site):
+    scraper = JoyfulHeartScraper(str(tmp_path / "out"), allowed_domains=[site.host])
+    scraper.crawl_concurrent([site.url + "/"], workers=2, per_host=2, delay=0, resume=True)
+
+    assert len(scraper.sitemap) == 5
+    assert site.requests[0]["path"] == "/"
+
+
+def test_page_waiting_for_images_is_not_checkpointed_as_done(tmp_path, site):
+    out = str(tmp_path / "out")
+    site.pages["/"] = site.pages["/"].replace("<body>", '<body><img src="/slow.png" alt="">')
+    site.pages["/slow.png"] = b"\x89PNG image" * 32
+    JoyfulHeartScraper(out, allowed_domains=[site.host]).crawl_concurrent([site.url + "/"], delay=0)
+
+    # Recrawl with a changed home page whose image download hangs
+    site.pages["/"] = site.pages["/"].replace("<title>Home", "<title>Home, revised")
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    release = threading.Event()
+    download = scraper.images._download
+    scraper.images._download = lambda url: release.wait(10) and download(url)
+    fetch_page = scraper.fetch_page
+    fetched = []
+
+    def fetch_or_interrupt(url, *args, **kwargs):
+        if len(fetched) == 3:
+            raise KeyboardInterrupt
+        fetched.append(url)
+        return fetch_page(url, *args, **kwargs)
+
+    scraper.fetch_page = fetch_or_interrupt
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            scraper.crawl([site.url + "/"], checkpoint_every=1)
+        state = load_checkpoint_file(out)
+        with open(os.path.join(out, "pages", "index.json"), "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+    finally:
+        release.set()
+        scraper._wait_for_pages()
+        scraper.pages.close()
+
+    # The home page JSON on disk was still the previous crawl's
+    home = site.url + "/"
+    assert on_disk["title"] == "Home"
+    assert home not in state["visited"] and home not in state["sitemap"]
+    assert state["frontier"][0] == home
+    assert state["total_scraped"] == 2
+
+    site.requests.clear()
+    resumed = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    pages = resumed.crawl_concurrent([home], workers=2, per_host=2, delay=0, resume=True)
+    assert site.requests_for("/")
+    titles = [page["title"] for page in iter_pages(pages.path) if page["url"] == home]
+    assert titles == ["Home, revised"]
@@ -0,0 +1,63 @@
+"""Concurrent crawl: per-host request cap and spacing (HostThrottle), and its output."""
+
+import os
+
+from conftest import html_page
+from content_scraper import JoyfulHeartScraper
+from page_store import iter_pages
+
+
+def site_pages(home, names):
+    pages = {home: html_page("Home", [f"/{name}.html" for name in names])}
+    for name in names:
+        pages[f"/{name}.html"] = html_page(f"Page {name}", [home])
+    return pages
+
+
+def test_crawl_caps_requests_in_flight_per_host(tmp_path, fake_site):
+    site_a = fake_site(site_pages("/", [f"a{i}" for i in range(8)]), latency=0.1)
+    site_b = fake_site(site_pages("/home.html", [f"b{i}" for i in range(8)]), latency=0.1)
+    scraper = JoyfulHeartScraper(str(tmp_path / "out"), allowed_domains=[site_a.host, site_b.host])
+
+    scraper.crawl_concurrent([site_a.url + "/", site_b.url + "/home.html"], workers=8, per_host=2, delay=0)
+
+    for site in (site_a, site_b):
+        assert len(site.requests) == 9
+        assert site.max_in_flight == 2
+    # The cap is per host: the two sites were fetched at the same time
+    assert any(a["start"] < b["end"] and b["start"] < a["end"]
+               for a in site_a.requests for b in site_b.requests)
+
+
+def test_crawl_spaces_request_starts_per_host(tmp_path, fake_site):
+    site = fake_site(site_pages("/", [f"p{i}" for i in range(4)]))
+    scraper = JoyfulHeartScraper(str(tmp_path / "out"), allowed_domains=[site.host])
+
+    scraper.crawl_concurrent([site.url + "/"], workers=4, per_host=4, delay=0.2)
+
+    starts = sorted(r["start"] for r in site.requests)
+    assert len(starts) == 5
+    # Started 0.2 s apart by the client; allow for scheduling jitter at the server
+    assert all(later - earlier > 0.15 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_crawl_output_is_in_crawl_order(tmp_path, fake_site):
+    names = [f"p{i}" for i in range(6)]
+    site = fake_site(site_pages("/", names), latency=0.02)
+    out = str(tmp_path / "out")
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+
+    pages = scraper.crawl_concurrent([site.url + "/"], max_pages=5, workers=4, per_host=4, delay=0)
+
+    assert len(scraper.visited) == 5
+    urls = list(scraper.sitemap)
+    assert urls == sorted(urls, key=scraper.crawl_order.get)
+    assert urls[0] == site.url + "/"
+    assert [page["url"] for page in iter_pages(pages.path)] == urls
+    # The returned store streams the page dicts
+    assert len(pages) == 5
+    assert [page["url"] for page in pages] == urls
+    assert scraper.sitemap[urls[0]]["title"] == "Home"
+    for url in urls:
+        assert os.path.isfile(os.path.join(out, "pages", scraper._url_to_filename(url) + ".json"))
+    assert not os.path.exists(os.path.join(out, "crawl_checkpoint.json"))
@@ -0,0 +1,91 @@
+"""Critical CSS: which rules a page gets inlined, and the non-blocking stylesheet load."""
+
+from critical_css import CriticalCSS
+
+CSS = """@import url("https://fonts.example/css?family=Serif");
+:root { --gold: #c90; }
+* { box-sizing: border-box; }
+body { margin: 0; }
+.card { color: var(--gold); animation: fade-in 1s; }
+#hero h1, .missing { font-size: 3rem; }
+.unused-class { color: red; }
+#unused-id { color: blue; }
+table td { padding: 0; }
+a:hover { color: var(--gold); }
+a[href^="http"] { text-decoration: underline; }
+@media (max-width: 600px) { .card { padding: 0; } .sidebar { display: none; } }
+@media print { .sidebar { display: none; } }
+@keyframes fade-in { from { opacity: 0; } to { opacity: 1; } }
+@keyframes slide { from { left: 0; } to { left: 1px; } }
+"""
+
+HREF = "../../assets/site.1a2b3c4d5e.css"
+
+PAGE = f"""<html><head>
+    <link rel="stylesheet" href="{HREF}">
+</head><body>
+<section id="hero"><h1>Title</h1></section>
+<div class="card wide"><a href="/x.htm">Link</a></div>
+</body></html>"""
+
+
+def test_rules_matched_by_class_or_id_are_kept():
+    css = CriticalCSS(CSS).critical(PAGE)
+    assert ".card{ color: var(--gold); animation: fade-in 1s; }" in css
+    # One matching selector of a list is enough
+    assert "#hero h1, .missing{" in css
+    assert "body{" in css
+    # Pseudo-classes and attribute tests are ignored: the rule is kept
+    assert "a:hover{" in css
+    assert 'a[href^="http"]{' in css
+    # :root and universal rules are always kept; @import is left to the full stylesheet
+    assert ":root{" in css and "*{" in css
+    assert "@import" not in css
+
+
+def test_unmatched_rules_are_dropped():
+    css = CriticalCSS(CSS).critical(PAGE)
+    assert ".unused-class" not in css
+    assert "#unused-id" not in css
+    # The page has no table
+    assert "table td" not in css
+
+
+def test_media_blocks_keep_only_their_critical_rules():
+    css = CriticalCSS(CSS).critical(PAGE)
+    assert "@media (max-width: 600px){.card{ padding: 0; }}" in css
+    assert "@media print" not in css
+    assert ".sidebar" not in css
+
+
+def test_keyframes_kept_only_when_a_critical_rule_uses_them():
+    css = CriticalCSS(CSS).critical(PAGE)
+    assert "@keyframes fade-in{" in css
+    assert "@keyframes slide" not in css
+    assert css.endswith("to { opacity: 1; } }")
+
+
+def test_pages_with_the_same_markup_share_the_subset():
+    critical = CriticalCSS(CSS)
+    first = critical.critical(PAGE)
+    assert critical.critical(PAGE.replace("Title", "Another title")) == first
+    assert critical.hits == 1
+
+
+def test_inline_replaces_link_with_preload_and_noscript_fallback():
+    critical = CriticalCSS(CSS)
+    html = critical.inline(PAGE, HREF)
+
+    link = f'<link rel="stylesheet" href="{HREF}">'
+    assert html.count(link) == 1
+    assert f"<style>{critical.critical(PAGE)}</style>\n" in html
+    assert (f'    <link rel="preload" href="{HREF}" as="style" '
+            f"onload=\"this.onload=null;this.rel='stylesheet'\">\n"
+            f"    <noscript>{link}</noscript>\n</head>") in html
+    assert html.index("<style>") < html.index('rel="preload"') < html.index("<noscript>")
+
+
+def test_inline_leaves_pages_without_the_link_alone():
+    critical = CriticalCSS(CSS)
+    page = PAGE.replace(HREF, "../other.css")
+    assert critical.inline(page, HREF) == page
@@ -0,0 +1,151 @@
+"""HTML rewriter: the one-pass rules give the page the old scripts' sequential edits gave."""
+
+import os
+import re
+import sys
+
+from conftest import SCRAPER_DIR
+
+sys.path.insert(0, os.path.join(SCRAPER_DIR, "..", "..", "jesuswalk", "scraper"))
+import polish_titles
+import upgrade_all_studies
+from html_rewriter import Rewriter, add_link_rules
+from polish_titles import DESC_FIXES, TITLE_FIXES
+from upgrade_all_studies import JUMP_BAR, MAIN_SECTION
+
+JW = "https://www.jesuswalk.com"
+URL_MAP = {
+    f"{JW}/abraham/": "all-studies.html#old-testament",
+    f"{JW}/acts/": "jw_acts.html",
+    f"{JW}/john/": "jw_john.html",
+}
+
+
+def card(href, title, desc):
+    return (f'<a href="{href}" class="study-card" target="_blank" rel="noopener">'
+            f"<h3>{title}</h3><p>{desc}</p></a>")
+
+
+PAGE = "\n".join([
+    "<html><head><title>All Studies</title></head><body>",
+    '<section class="hero"><h1>Bible Studies</h1></section>',
+    MAIN_SECTION,
+    '<div id="old-testament" class="section-header"><h2>Old Testament</h2></div><div class="studies-grid">',
+    # Exact title and description fixes
+    card(f"{JW}/abraham/", "Songs of  Ascent", "Ps 120-134)(15 daily meditations"),
+    card(f"{JW}/acts/", "Acts I:  The Early Church: Acts 1-12", "Acts 1-12\n9 lessons"),
+    # Fix values that are themselves keys, and fixes that leave &amp; alone
+    card(f"{JW}/peter/", "Apostle Peter", "12  lessons"),
+    card(f"{JW}/names/", "Names and  Titles of Jesus", "brief notes, not e-mail"),
+    # Junk the cleanup passes remove inside titles that no fix matches
+    card(f"{JW}/journey/", "JesusWalk:   Starting  Out(for new Christians, 6 lessons).Spanish version.",
+         ".Spanish version."),
+    card(f"{JW}/john/", "John&#x27;s Gospel", "Luke&#x27;s  friend,\n   and   John&#x27;s"),
+    # A study card with no local page keeps its URL but loses the new tab
+    card(f"{JW}/unmapped/", "Unmapped  study", "   "),
+    "</div>",
+    # Links inside a paragraph, and entities in attributes and loose text
+    f'<p>See <a href="{JW}/acts/" title="Luke&#x27;s  book">Acts</a> and  <a href="{JW}/abraham/">Abraham</a></p>',
+    f'<a href="{JW}/john/" target="_blank" rel="noopener">Not a card</a>',
+    "<div>Loose text.Spanish version. and God&#x27;s (for new Christians only) word</div>",
+    "<p>not e-mail</p><h3>Christmas Incarnation</h3>",
+    "</div></section>",
+    "</body></html>",
+])
+
+
+def legacy_upgrade(html, url_map):
+    """upgrade_all_studies.py steps 1-3 before the Rewriter (the section
+    groups of step 4 are emitted by jw_page_generator.py now)."""
+    for ext_url, local in url_map.items():
+        html = html.replace(f'href="{ext_url}"', f'href="{local}"')
+    html = re.sub(r'(<a href="[^"]+" class="study-card"[^>]*?) target="_blank" rel="noopener"', r'\1', html)
+    return html.replace(MAIN_SECTION, JUMP_BAR + "\n" + MAIN_SECTION)
+
+
+def legacy_polish(html):
+    """polish_titles.py's passes before the Rewriter, one after another."""
+    for old, new in TITLE_FIXES.items():
+        html = html.replace(f"<h3>{old}</h3>", f"<h3>{new}</h3>")
+    for old, new in DESC_FIXES.items():
+        html = html.replace(f"<p>{old}</p>", f"<p>{new}</p>")
+
+    def fix_tag_content(m):
+        content = re.sub(r'  +', ' ', m.group(2))
+        content = re.sub(r'\s*\n\s*', ' ', content)
+        return f'<{m.group(1)}>{content.strip()}</{m.group(1)}>'
+
+    html = re.sub(r'<(h3|p)>(.*?)</(h3|p)>', fix_tag_content, html, flags=re.DOTALL)
+    html = re.sub(r'\.Spanish version\.', '', html)
+    html = re.sub(r'<h3>JesusWalk:\s+', '<h3>', html)
+    html = re.sub(r'\(for new Christians[^)]*\)', '', html)
+    html = re.sub(r'<p>\s*</p>', '', html)
+    return html.replace("&#x27;", "'")
+
+
+def one_pass(html, url_map):
+    rw = Rewriter()
+    upgrade_all_studies.add_rules(rw, url_map)
+    polish_titles.add_rules(rw)
+    return rw.rewrite(html), rw
+
+
+def test_one_pass_matches_sequential_edits():
+    expected = legacy_polish(legacy_upgrade(PAGE, URL_MAP))
+    html, rw = one_pass(PAGE, URL_MAP)
+
+    assert html == expected
+    # Every <a> tag changed: nine links mapped or study cards opened in place
+    assert rw.counts["link"] == 10
+    assert rw.counts["jump bar"] == 1
+
+
+def test_rules_fire_once():
+    html, _ = one_pass(PAGE, URL_MAP)
+
+    # The jump bar's replacement ends with the text it replaced
+    assert html.count('id="section-jump-bar"') == 1
+    assert html.count(MAIN_SECTION) == 1
+    # A fixed title is not fixed again ("Apostle Peter" -> "The Apostle Peter")
+    assert "<h3>The Apostle Peter</h3>" in html and "The The" not in html
+    assert "<h3>The Christmas Incarnation</h3>" in html
+    assert "&amp;amp;" not in html
+    # Exact description fixes win over the ones for their substrings
+    assert "<p>(brief reference notes)</p>" in html and "<p>(self-paced)</p>" in html
+
+
+def test_overlapping_matches():
+    html, _ = one_pass(PAGE, URL_MAP)
+
+    # A card's link, title and description are each rewritten
+    assert ('<a href="jw_john.html" class="study-card"><h3>John\'s Gospel</h3>'
+            "<p>Luke's friend, and John's</p></a>") in html
+    assert "<h3>Starting Out</h3>" in html
+    # Links inside a paragraph the description rule consumed; its spaces are collapsed
+    assert ('<p>See <a href="jw_acts.html" title="Luke\'s book">Acts</a> and '
+            '<a href="all-studies.html#old-testament">Abraham</a></p>') in html
+    # Only study cards lose target="_blank"
+    assert '<a href="jw_john.html" target="_blank" rel="noopener">Not a card</a>' in html
+    assert "<div>Loose text and God's  word</div>" in html
+    for junk in ("Spanish version", "for new Christians", "&#x27;", "<p></p>", f'href="{JW}/acts/"'):
+        assert junk not in html
+
+
+def test_link_rules_keep_new_tab_for_external_cards():
+    rw = Rewriter()
+    state = add_link_rules(rw, URL_MAP, lambda href: not href.startswith("http"))
+    page = card(f"{JW}/acts/", "Acts", "") + card(f"{JW}/unmapped/", "Other", "")
+
+    html = rw.rewrite(page)
+
+    assert '<a href="jw_acts.html" class="study-card"><h3>' in html
+    assert f'<a href="{JW}/unmapped/" class="study-card" target="_blank" rel="noopener"><h3>' in html
+    assert state["local_card"] is False
+
+
+def test_rule_groups_are_numbered_as_in_their_pattern():
+    rw = Rewriter().replace("b", "B", "literal")
+    rw.rule(r"<h3>(.*?)</h3>", lambda m: m.group(1).upper(), "upper", re.DOTALL)
+
+    assert rw.rewrite("ab <h3>a\nb</h3> <h3>c</h3>") == "aB A\nB C"
+    assert rw.counts == {"literal": 1, "upper": 2}
@@ -0,0 +1,79 @@
+"""Content-addressed image store: dedupe by SHA-256, the index, revalidation."""
+
+import hashlib
+import os
+
+import pytest
+
+from content_scraper import ThreadSessions
+from http_cache import ValidatorCache
+from image_store import ImageStore
+
+PHOTO = b"\x89PNG photo bytes" * 64
+ICON = b"\x89PNG icon bytes" * 16
+
+
+@pytest.fixture
+def site(fake_site):
+    return fake_site({"/img/photo.png": PHOTO, "/copy/photo.png": PHOTO, "/img/icon.png": ICON}, etags=True)
+
+
+def open_store(tmp_path, use_cache=True):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir(exist_ok=True)
+    return ImageStore(str(images_dir), str(tmp_path / "image_index.json"), ThreadSessions({}),
+                      ValidatorCache(str(tmp_path / "http_cache.json")), use_cache, workers=2)
+
+
+def test_same_bytes_are_stored_once(tmp_path, site):
+    store = open_store(tmp_path)
+    photo = store.fetch(site.url + "/img/photo.png").result()
+    copy = store.fetch(site.url + "/copy/photo.png").result()
+    icon = store.fetch(site.url + "/img/icon.png").result()
+
+    assert photo == copy != icon
+    assert photo == hashlib.sha256(PHOTO).hexdigest()[:16] + "_photo.png"
+    assert sorted(os.listdir(tmp_path / "images")) == sorted([photo, icon])
+    with open(tmp_path / "images" / photo, "rb") as f:
+        assert f.read() == PHOTO
+    assert len(store.objects) == 2
+    assert len(store.aliases) == 3
+
+
+def test_each_url_is_downloaded_once(tmp_path, site):
+    store = open_store(tmp_path)
+    futures = [store.fetch(site.url + "/img/photo.png") for _ in range(5)]
+    assert len(set(futures)) == 1
+    futures[0].result()
+    assert len(site.requests_for("/img/photo.png")) == 1
+
+
+def test_missing_image_is_none(tmp_path, site):
+    store = open_store(tmp_path)
+    assert store.fetch(site.url + "/img/gone.png").result() is None
+    assert os.listdir(tmp_path / "images") == []
+
+
+def test_index_is_reloaded_and_revalidated(tmp_path, site):
+    store = open_store(tmp_path)
+    photo = store.fetch(site.url + "/img/photo.png").result()
+    store.save()
+    store.http_cache.save()
+
+    site.requests.clear()
+    reopened = open_store(tmp_path)
+    assert reopened.local_file(site.url + "/img/photo.png") == photo
+    assert reopened.fetch(site.url + "/img/photo.png").result() == photo
+    assert [r["status"] for r in site.requests] == [304]
+
+
+def test_no_cache_downloads_again_without_duplicating(tmp_path, site):
+    store = open_store(tmp_path)
+    photo = store.fetch(site.url + "/img/photo.png").result()
+    store.save()
+
+    site.requests.clear()
+    reopened = open_store(tmp_path, use_cache=False)
+    assert reopened.fetch(site.url + "/copy/photo.png").result() == photo
+    assert [r["status"] for r in site.requests] == [200]
+    assert os.listdir(tmp_path / "images") == [photo]
@@ -0,0 +1,90 @@
+"""Incremental recrawl: conditional requests, unchanged bodies and the validator cache."""
+
+import json
+import os
+
+from conftest import html_page
+from content_scraper import JoyfulHeartScraper
+
+NAMES = ["p0", "p1", "p2"]
+
+
+def make_site(fake_site, etags):
+    pages = {"/": html_page("Home", [f"/{name}.html" for name in NAMES])}
+    for name in NAMES:
+        pages[f"/{name}.html"] = html_page(f"Page {name}", ["/"])
+    return fake_site(pages, etags=etags)
+
+
+def crawl(out, site):
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host])
+    scraper.crawl_concurrent([site.url + "/"], workers=2, per_host=2, delay=0)
+    return scraper
+
+
+def load_json(*parts):
+    with open(os.path.join(*parts), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_not_modified_pages_are_kept(tmp_path, fake_site):
+    site = make_site(fake_site, etags=True)
+    out = str(tmp_path / "out")
+    first = crawl(out, site)
+    assert first.unchanged == 0
+
+    site.requests.clear()
+    second = crawl(out, site)
+
+    assert second.unchanged == 4
+    assert all(r["status"] == 304 and r["headers"].get("If-None-Match") for r in site.requests)
+    assert second.sitemap == first.sitemap
+    assert [page["title"] for _, page in second.pages.items()] == [page["title"] for _, page in first.pages.items()]
+
+
+def test_same_body_is_unchanged_and_keeps_new_validators(tmp_path, fake_site):
+    site = make_site(fake_site, etags=False)
+    out = str(tmp_path / "out")
+    crawl(out, site)
+    assert not any(entry.get("etag") for entry in load_json(out, "http_cache.json").values())
+
+    # Same bodies, now with validators: unchanged, and the validators are kept
+    site.etags = True
+    assert crawl(out, site).unchanged == 4
+    cache = load_json(out, "http_cache.json")
+    assert all(entry["etag"] and entry["page_file"] for entry in cache.values())
+
+    # ... so the next crawl gets 304s
+    site.requests.clear()
+    assert crawl(out, site).unchanged == 4
+    assert [r["status"] for r in site.requests] == [304] * 4
+
+
+def test_changed_and_lost_pages_are_fetched_again(tmp_path, fake_site):
+    site = make_site(fake_site, etags=True)
+    out = str(tmp_path / "out")
+    crawl(out, site)
+
+    site.pages["/p0.html"] = html_page("Page p0, revised", ["/"])
+    os.remove(os.path.join(out, "pages", "p1_html.json"))
+    site.requests.clear()
+    scraper = crawl(out, site)
+
+    assert scraper.unchanged == 2
+    # No page file to fall back on: not a conditional request
+    assert "If-None-Match" not in site.requests_for("/p1.html")[0]["headers"]
+    assert load_json(out, "pages", "p0_html.json")["title"] == "Page p0, revised"
+    assert load_json(out, "pages", "p1_html.json")["title"] == "Page p1"
+
+
+def test_no_cache_refetches_everything(tmp_path, fake_site):
+    site = make_site(fake_site, etags=True)
+    out = str(tmp_path / "out")
+    crawl(out, site)
+
+    site.requests.clear()
+    scraper = JoyfulHeartScraper(out, allowed_domains=[site.host], use_cache=False)
+    scraper.crawl_concurrent([site.url + "/"], workers=2, per_host=2, delay=0)
+
+    assert scraper.unchanged == 0
+    assert [r["status"] for r in site.requests] == [200] * 4
@@ -0,0 +1,96 @@
+"""LinkResolver: JesusWalk URLs mapped onto the rebuilt site from the scrape."""
+
+import os
+
+import pytest
+
+from link_resolver import CACHE_NAME, CATALOG, JW_HOME, JW_ROOT, LinkResolver, study_page_name
+
+ACTS = "https://www.jesuswalk.com/acts/"
+ACTS_FINAL = "https://www.jesuswalk.com/acts/index.htm"
+BOOKS = "https://www.jesuswalk.com/books/"
+RUTH = "https://www.jesuswalk.com/ruth/"
+JAMES = "https://www.jesuswalk.com/james/"
+ARTICLE = "https://www.joyfulheart.com/prayer/ask.htm"
+
+
+def home_page(studies_by_list):
+    lists = [[] for _ in range(9)]
+    for idx, links in studies_by_list.items():
+        lists[idx] = [{"text": link, "link": link} for link in links]
+    return {"url": JW_HOME, "title": "JesusWalk", "category": "home", "lists": lists}
+
+
+def records(studies_by_list=None, extra=()):
+    home = home_page(studies_by_list or {2: [RUTH], 4: [ACTS], 6: [JAMES]})
+    return [(JW_HOME, home),
+            (ACTS, {"url": ACTS_FINAL, "title": "Acts", "category": "acts"}),
+            (BOOKS, {"url": BOOKS, "title": "Books", "category": "books"}),
+            (ARTICLE, {"url": ARTICLE, "title": "Asking", "category": "prayer"})] + list(extra)
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    return str(tmp_path / "new-website")
+
+
+def test_study_page_name():
+    assert study_page_name("jw_acts") == "jw_acts.html"
+    assert study_page_name("jw_index") == "all-studies-home.html"
+
+
+def test_resolve(make_corpus, site_dir):
+    links = LinkResolver(make_corpus(records()), site_dir)
+
+    # A scraped study, by the URL requested and the URL it ended at
+    assert links.resolve(ACTS) == "jesuswalk/pages/jw_acts.html"
+    assert links.resolve(ACTS_FINAL) == "jesuswalk/pages/jw_acts.html"
+    # Pages the JesusWalk generator writes under their own names
+    assert links.resolve(JW_HOME) == JW_ROOT
+    assert links.resolve(BOOKS) == "jesuswalk/pages/books.html"
+    # Listed on the home page but not scraped: its catalog section
+    assert links.resolve(RUTH) == CATALOG + "#old-testament"
+    assert links.resolve(JAMES) == CATALOG + "#general-letters"
+    assert links.resolve("https://www.jesuswalk.com/unknown/") is None
+    assert links.resolve(ARTICLE) is None
+
+
+def test_href_is_relative_to_the_rendering_page(make_corpus, site_dir):
+    links = LinkResolver(make_corpus(records()), site_dir)
+    pages_dir = os.path.join(site_dir, "joyful-heart", "pages")
+
+    assert links.href(ACTS, pages_dir) == "../../jesuswalk/pages/jw_acts.html"
+    assert links.href(RUTH, pages_dir) == "../../jesuswalk/pages/all-studies.html#old-testament"
+    assert links.href(JW_HOME, site_dir) == "jesuswalk/index.html"
+    assert links.href("https://www.jesuswalk.com/unknown/", pages_dir) is None
+
+
+def test_map_is_cached_until_the_scrape_changes(make_corpus, site_dir, monkeypatch):
+    corpus = make_corpus(records())
+    LinkResolver(corpus, site_dir)
+    assert os.path.exists(os.path.join(corpus.scraped_dir, CACHE_NAME))
+
+    def no_build(self):
+        raise AssertionError("map rebuilt from an unchanged scrape")
+
+    with monkeypatch.context() as m:
+        m.setattr(LinkResolver, "_build", no_build)
+        # Pages of the other site don't matter
+        more = "https://www.joyfulheart.com/grace/gift.htm"
+        other = make_corpus(records(extra=[(more, {"url": more, "title": "Gift", "category": "grace"})]))
+        assert LinkResolver(other, site_dir).resolve(ACTS) == "jesuswalk/pages/jw_acts.html"
+
+    # A new JesusWalk page, or a change to the home page lists
+    added = make_corpus(records(extra=[(RUTH, {"url": RUTH, "title": "Ruth", "category": "ruth"})]))
+    assert LinkResolver(added, site_dir).resolve(RUTH) == "jesuswalk/pages/jw_ruth.html"
+    relisted = make_corpus(records({3: [JAMES]}))
+    assert LinkResolver(relisted, site_dir).resolve(JAMES) == CATALOG + "#gospels"
+
+
+def test_lookups_record_what_the_map_depends_on(make_corpus, site_dir):
+    corpus = make_corpus(records())
+    links = LinkResolver(corpus, site_dir)
+    with corpus.recording() as deps:
+        links.href(ACTS, site_dir)
+    assert set(deps) == {"domain:jesuswalk.com", "url:" + JW_HOME, "page:jw_index"}
+    assert all(deps.values())
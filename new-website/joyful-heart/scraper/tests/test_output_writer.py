@@ -0,0 +1,49 @@
+"""OutputWriter: unchanged files are left alone, changed ones replaced atomically."""
+
+import os
+import stat
+
+from output_writer import OutputWriter
+
+OLD = 1_600_000_000
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    writer = OutputWriter(str(tmp_path))
+    assert writer.write("about.html", "<p>About</p>")
+    os.utime(tmp_path / "about.html", (OLD, OLD))
+
+    assert not writer.write("about.html", "<p>About</p>")
+    assert os.stat(tmp_path / "about.html").st_mtime == OLD
+    assert writer.summary() == "1 written, 1 unchanged"
+
+
+def test_changed_file_is_replaced(tmp_path):
+    writer = OutputWriter(str(tmp_path))
+    writer.write("about.html", "<p>About</p>")
+    os.utime(tmp_path / "about.html", (OLD, OLD))
+
+    # Same size, different bytes
+    assert writer.write("about.html", "<p>Abuot</p>")
+    assert (tmp_path / "about.html").read_text(encoding="utf-8") == "<p>Abuot</p>"
+    assert os.stat(tmp_path / "about.html").st_mtime != OLD
+    assert writer.written == 2
+    assert os.listdir(tmp_path) == ["about.html"]
+
+
+def test_written_files_get_default_permissions(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        OutputWriter(str(tmp_path)).write("page.html", "x")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(tmp_path / "page.html").st_mode) == 0o644
+
+
+def test_copy_and_output_dir(tmp_path):
+    out = tmp_path / "new" / "site"
+    writer = OutputWriter(str(out))
+    writer.write("index.html", "<h1>Hö</h1>")
+    assert writer.copy("index.html", "home.html")
+    assert not writer.copy("index.html", "home.html")
+    assert (out / "home.html").read_bytes() == "<h1>Hö</h1>".encode("utf-8")
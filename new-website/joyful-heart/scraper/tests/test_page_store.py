@@ -0,0 +1,143 @@
+"""Page stores: streaming NDJSON output and the SQLite index."""
+
+import hashlib
+import json
+import os
+import zlib
+
+from page_store import (LEGACY_JSON_NAME, NDJSON_NAME, SQLITE_NAME, NDJSONPageStore, SQLitePageStore,
+                        iter_pages, load_pages, open_page_store, url_to_filename)
+
+
+def page(url, title, category="articles"):
+    return {"url": url, "title": title, "category": category, "paragraphs": [f"Text of {title}"]}
+
+
+def test_ndjson_streams_one_record_per_line(tmp_path):
+    store = NDJSONPageStore(str(tmp_path / NDJSON_NAME))
+    store.create()
+    store.append("https://a/1", page("https://a/1", "One"))
+    store.append("https://a/2", page("https://a/2", "Twö\nlines"))
+    store.close()
+
+    lines = (tmp_path / NDJSON_NAME).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert [p["title"] for p in iter_pages(store.path)] == ["One", "Twö\nlines"]
+    assert len(store) == 2
+
+
+def test_ndjson_compact_keeps_latest_record_in_order(tmp_path):
+    store = NDJSONPageStore(str(tmp_path / NDJSON_NAME))
+    store.create()
+    store.append("https://a/2", page("https://a/2", "Two"))
+    store.append("https://a/1", page("https://a/1", "One"))
+    store.append("https://a/3", page("https://a/3", "Three"))
+    store.append("https://a/2", page("https://a/2", "Two, again"))
+
+    store.compact(["https://a/1", "https://a/2", "https://a/missing"])
+
+    assert [p["title"] for p in iter_pages(store.path)] == ["One", "Two, again"]
+    assert [(key, p["title"]) for key, p in store.items()] == [("https://a/1", "One"), ("https://a/2", "Two, again")]
+
+
+def test_ndjson_create_truncates(tmp_path):
+    store = NDJSONPageStore(str(tmp_path / NDJSON_NAME))
+    store.append("https://a/1", page("https://a/1", "Old"))
+    store.create()
+    store.append("https://a/2", page("https://a/2", "New"))
+    store.close()
+    assert [p["title"] for p in iter_pages(store.path)] == ["New"]
+
+
+def test_load_pages_falls_back_to_legacy_json(tmp_path):
+    (tmp_path / LEGACY_JSON_NAME).write_text(json.dumps([page("https://a/1", "One")]), encoding="utf-8")
+    assert [p["title"] for p in load_pages(str(tmp_path))] == ["One"]
+
+    store = NDJSONPageStore(str(tmp_path / NDJSON_NAME))
+    store.append("https://a/2", page("https://a/2", "Two"))
+    store.close()
+    assert [p["title"] for p in load_pages(str(tmp_path))] == ["Two"]
+
+
+def build_sqlite(tmp_path, records):
+    return SQLitePageStore.build(str(tmp_path / SQLITE_NAME),
+                                 [(key, url_to_filename(key), p) for key, p in records])
+
+
+def test_sqlite_lookups(tmp_path):
+    store = build_sqlite(tmp_path, [
+        ("https://www.joyfulheart.com/", page("https://www.joyfulheart.com/", "Home", "home")),
+        ("https://www.joyfulheart.com/old", page("https://www.joyfulheart.com/new", "Moved")),
+        ("https://www.jesuswalk.com/acts", page("https://www.jesuswalk.com/acts", "Acts", "acts")),
+        ("https://www.joyfulheart.com/more", page("https://www.joyfulheart.com/more", "More")),
+    ])
+
+    # By final URL, and by the URL the crawl requested
+    assert store.get("https://www.joyfulheart.com/new")["title"] == "Moved"
+    assert store.get("https://www.joyfulheart.com/old")["title"] == "Moved"
+    assert store.get("https://www.joyfulheart.com/none") is None
+    assert store.get_by_filename("jw_acts")["title"] == "Acts"
+    assert [p["title"] for p in store.by_category("articles")] == ["Moved", "More"]
+    assert store.categories() == ["acts", "articles", "home"]
+    assert [p["title"] for p in store] == ["Home", "Moved", "Acts", "More"]
+    assert len(store) == 4
+    assert [row[1:] for row in store.entries()] == [
+        ("https://www.joyfulheart.com/", "https://www.joyfulheart.com/", "index", "home"),
+        ("https://www.joyfulheart.com/old", "https://www.joyfulheart.com/new", "old", "articles"),
+        ("https://www.jesuswalk.com/acts", "https://www.jesuswalk.com/acts", "jw_acts", "acts"),
+        ("https://www.joyfulheart.com/more", "https://www.joyfulheart.com/more", "more", "articles"),
+    ]
+
+
+def test_sqlite_items_prefix_is_literal(tmp_path):
+    store = build_sqlite(tmp_path, [
+        ("https://www.jesuswalk.com/acts", page("https://www.jesuswalk.com/acts", "Acts")),
+        ("https://www.joyfulheart.com/jwx", page("https://www.joyfulheart.com/jwx", "Not JesusWalk")),
+        ("https://www.jesuswalk.com/", page("https://www.jesuswalk.com/", "JW home")),
+    ])
+    # "_" is a LIKE wildcard: jw_ must not match jwx
+    assert [name for name, _ in store.items("jw_")] == ["jw_acts", "jw_index"]
+    assert [name for name, _ in store.items()] == ["jw_acts", "jw_index", "jwx"]
+
+
+def test_sqlite_digests_follow_record_content(tmp_path):
+    records = [("https://a.com/1", page("https://a.com/1", "One")), ("https://a.com/2", page("https://a.com/2", "Two"))]
+    before = build_sqlite(tmp_path, records).digests()
+    records[1] = ("https://a.com/2", page("https://a.com/2", "Two, revised"))
+    store = build_sqlite(tmp_path, records)
+    after = store.digests()
+
+    assert before[1] == after[1]
+    assert before[2] != after[2]
+    text = json.dumps(records[1][1], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert after[2] == hashlib.sha1(text).hexdigest()
+    row = store.db.execute("SELECT data FROM pages WHERE seq = 2").fetchone()
+    assert zlib.decompress(row[0]) == text
+
+
+def test_sqlite_later_record_wins_filename_clash(tmp_path):
+    store = build_sqlite(tmp_path, [
+        ("https://a.com/x", page("https://a.com/x", "First")),
+        ("https://a.com/x/", page("https://a.com/x/", "Second")),
+    ])
+    assert len(store) == 1
+    assert store.get_by_filename("x")["title"] == "Second"
+
+
+def test_open_page_store_builds_from_older_output(tmp_path):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    (pages_dir / "b.json").write_text(json.dumps(page("https://a.com/b", "B")), encoding="utf-8")
+    (pages_dir / "a.json").write_text(json.dumps(page("https://a.com/a", "A")), encoding="utf-8")
+
+    store = open_page_store(str(tmp_path))
+    assert [name for name, _ in store.items()] == ["a", "b"]
+    assert os.path.exists(tmp_path / SQLITE_NAME)
+    store.close()
+
+    # NDJSON output is preferred to the page files
+    ndjson = NDJSONPageStore(str(tmp_path / NDJSON_NAME))
+    ndjson.append("https://a.com/c", page("https://a.com/c", "C"))
+    ndjson.close()
+    os.remove(tmp_path / SQLITE_NAME)
+    assert [p["title"] for p in open_page_store(str(tmp_path))] == ["C"]
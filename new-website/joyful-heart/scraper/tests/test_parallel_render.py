@@ -0,0 +1,79 @@
+"""Parallel rendering: --jobs N writes the same files, in the same order, as --jobs 1."""
+
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+import page_generator
+from page_generator import PageGenerator
+from parallel_render import render_pages
+
+
+def article(n, category):
+    url = f"https://www.joyfulheart.com/{category}/a{n}.htm"
+    return url, {
+        "url": url, "title": f"Article {n} | Joyful Heart", "meta_description": "", "category": category,
+        "headings": [{"level": 1, "text": f"Article {n}"}],
+        "paragraphs": [f"Paragraph {j} of article {n}, long enough to be kept in the page body." for j in range(4)],
+        "lists": [], "quotes": [], "images": [], "internal_links": [], "nav_links": [], "tables": [],
+        "body_text": "",
+    }
+
+
+@pytest.fixture
+def scraped_dir(make_corpus):
+    corpus = make_corpus([article(n, ["prayer", "jesus", "church"][n % 3]) for n in range(9)])
+    with open(os.path.join(corpus.scraped_dir, "sitemap.json"), "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    return corpus.scraped_dir
+
+
+def generate(scraped_dir, site_dir, jobs, monkeypatch):
+    """Run generate_all; returns (generator, {file name: bytes} of the pages folder, pages in write order)."""
+    written = []
+    write = page_generator.OutputWriter.write
+
+    def record(writer, name, text):
+        # Pages only: the scrape's caches (link_map.json, ...) are only written by the first run
+        if name.endswith(".html"):
+            written.append(name)
+        return write(writer, name, text)
+
+    with monkeypatch.context() as m, contextlib.redirect_stdout(io.StringIO()):
+        m.setattr(page_generator.OutputWriter, "write", record)
+        gen = PageGenerator(scraped_dir, os.path.join(site_dir, "joyful-heart"))
+        gen.generate_all(jobs=jobs)
+    files = {}
+    for name in sorted(os.listdir(gen.pages_dir)):
+        with open(os.path.join(gen.pages_dir, name), "rb") as f:
+            files[name] = f.read()
+    return gen, files, written
+
+
+def test_jobs_output_is_identical(scraped_dir, tmp_path, monkeypatch):
+    serial, serial_files, serial_order = generate(scraped_dir, str(tmp_path / "serial"), 1, monkeypatch)
+    _, parallel_files, parallel_order = generate(scraped_dir, str(tmp_path / "parallel"), 2, monkeypatch)
+
+    articles = [serial._url_to_filename(page["url"]) + ".html" for page in serial.article_pages()]
+    assert len(articles) == 9
+    assert set(articles) <= set(serial_files)
+    assert parallel_files == serial_files
+    assert parallel_order == serial_order
+    # Article pages are written in page order
+    assert [name for name in parallel_order if name in articles] == articles
+
+
+def test_render_pages_keeps_input_order(scraped_dir, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        gen = PageGenerator(scraped_dir, str(tmp_path / "site" / "joyful-heart"))
+    pages = list(reversed(gen.article_pages()))
+
+    serial = list(render_pages(gen, "generate_article_page", pages, jobs=1, track=True))
+    parallel = list(render_pages(gen, "generate_article_page", pages, jobs=2, track=True))
+
+    assert [page["url"] for page, _, _ in parallel] == [page["url"] for page in pages]
+    assert [(html, deps) for _, html, deps in parallel] == [(html, deps) for _, html, deps in serial]
+    assert all(deps for _, _, deps in parallel)
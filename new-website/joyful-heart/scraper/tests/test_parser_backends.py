@@ -0,0 +1,163 @@
+"""Parser backends: html.parser gives the page records the scraper always produced."""
+
+import re
+from urllib.parse import urljoin, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+
+from content_scraper import JoyfulHeartScraper
+from parser_backends import get_backend
+
+URL = "https://www.joyfulheart.com/prayer/ask.htm"
+
+MALFORMED = """<html><head><title> Asking  in Prayer </title>
+<meta name="description" content="How to ask"></head><body>
+<h2>Second level</h2><h1>First level</h1>
+<p>An opening paragraph that runs long enough to keep
+<table><tr><td>Cell with <a href="/x.htm">a link</a><td><img src="cell.gif" alt="cell"></tr>
+<tr><th>Header cell<td><p>Paragraph inside a cell, long enough to count</table>
+trailing text after the table
+<p>Second paragraph, never closed, also long enough
+<p>short
+<ul><li>One <a href="one.htm">link</a><li>Two<ul><li>Nested item</ul></ul>
+<blockquote>Ask and it will be given to you</blockquote>
+<a href="https://www.jesuswalk.com/acts/">Acts</a> <a href="https://example.com/">Away</a>
+<a name="anchor-only">no href</a>
+</body></html>"""
+
+SCRIPTS = """<html><head><title>Scripts</title><script>var x = "<p>not a paragraph</p>";</script>
+<style>p { color: red }</style></head><body>
+<noscript><h3>Heading inside noscript</h3><p>Paragraph inside noscript, long enough to count</p>
+<a href="/noscript-link.htm">Hidden link</a><script>document.write("<a href='/w.htm'>w</a>")</script></noscript>
+<div><script type="text/javascript">if (a < b) { document.write("<p>written</p>"); }</script>
+<p>The paragraph that stays, after the removed scripts</p><a href="/kept.htm">Kept link</a></div>
+<img src="/images/photo.jpg" alt="Photo" width="200" height="100">
+</body></html>"""
+
+NAV_UL = """<html><head><title>Menu page</title></head><body>
+<ul class="list"><li><a href="/not-nav.htm">Not the nav</a></li></ul>
+<ul class="Top-MENU main"><li><a href="/about/">About</a></li><li><a href="contact.htm">Contact</a></li></ul>
+<ul class="navbar"><li><a href="/second/">Second nav list</a></li></ul>
+<p>A paragraph between the menus that is long enough</p>
+</body></html>"""
+
+NAV_ELEMENT = NAV_UL.replace("<p>", '<nav><a href="/home/">Home</a> <a href="#top">Top</a></nav><p>')
+
+PAGES = {"malformed": MALFORMED, "scripts": SCRIPTS, "nav-ul": NAV_UL, "nav-element": NAV_ELEMENT}
+
+
+def legacy_extract(html, url, allowed_domains):
+    """The page record as extract_content built it before parser backends (no image downloads)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    title_tag = soup.find('title')
+    title = title_tag.get_text(strip=True) if title_tag else ""
+    meta_tag = soup.find('meta', attrs={'name': 'description'})
+    meta_desc = meta_tag.get('content', '') if meta_tag else ""
+    headings = []
+    for level in range(1, 7):
+        for h in soup.find_all(f'h{level}'):
+            text = h.get_text(strip=True)
+            if text:
+                headings.append({'level': level, 'text': text})
+    links = [a['href'] for a in soup.find_all('a', href=True)]
+
+    for tag in soup.find_all(['script', 'style', 'noscript']):
+        tag.decompose()
+
+    paragraphs = [t for t in (p.get_text(strip=True) for p in soup.find_all('p')) if t and len(t) > 20]
+    lists = []
+    for ul in soup.find_all(['ul', 'ol']):
+        items = []
+        for li in ul.find_all('li', recursive=False):
+            li_text = li.get_text(strip=True)
+            a_tag = li.find('a')
+            li_link = urljoin(url, a_tag['href']) if a_tag and a_tag.get('href') else None
+            if li_text:
+                items.append({'text': li_text, 'link': li_link})
+        if items:
+            lists.append(items)
+    quotes = [t for t in (bq.get_text(strip=True) for bq in soup.find_all('blockquote')) if t]
+    images = [{'src': urljoin(url, img.get('src', '')), 'alt': img.get('alt', ''), 'local_file': None,
+               'width': img.get('width', ''), 'height': img.get('height', '')}
+              for img in soup.find_all('img') if img.get('src', '')]
+    internal_links = [{'text': a.get_text(strip=True), 'url': urljoin(url, a['href'])}
+                      for a in soup.find_all('a', href=True)
+                      if urlparse(urljoin(url, a['href'])).netloc.lower() in allowed_domains]
+    nav_links = []
+    nav = soup.find('nav') or soup.find('ul', class_=re.compile('nav|menu', re.I))
+    if nav:
+        nav_links = [{'text': a.get_text(strip=True), 'url': urljoin(url, a['href'])}
+                     for a in nav.find_all('a', href=True)]
+    tables = []
+    for table in soup.find_all('table'):
+        rows = []
+        for tr in table.find_all('tr'):
+            cells = [{'text': td.get_text(strip=True), 'has_image': bool(td.find('img')),
+                      'has_link': bool(td.find('a'))} for td in tr.find_all(['td', 'th'])]
+            if cells:
+                rows.append(cells)
+        if rows:
+            tables.append(rows)
+    body = soup.find('body')
+    body_text = body.get_text(separator='\n', strip=True) if body else ""
+    path_parts = [p for p in urlparse(url).path.split('/') if p]
+
+    record = {
+        'url': url, 'title': title, 'meta_description': meta_desc,
+        'category': path_parts[0] if path_parts else "home",
+        'headings': headings, 'paragraphs': paragraphs, 'lists': lists, 'quotes': quotes,
+        'images': images, 'internal_links': internal_links, 'nav_links': nav_links,
+        'tables': tables, 'body_text': body_text[:5000],
+    }
+    return record, links
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return JoyfulHeartScraper(str(tmp_path / "out"))
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_html_parser_record_matches_legacy_extraction(scraper, name):
+    expected, links = legacy_extract(PAGES[name], URL, scraper.allowed_domains)
+
+    page_data, new_links = scraper.parse_page(PAGES[name], URL)
+    del page_data['scraped_at']
+
+    assert page_data == expected
+    # The frontier gets what the old separate link discovery found
+    old_links = {scraper.normalize_url(urljoin(URL, href)) for href in links}
+    assert new_links == {link for link in old_links if scraper.is_valid_url(link)}
+
+
+def test_fixture_pages_exercise_the_tricky_cases(scraper):
+    malformed, _ = scraper.parse_page(MALFORMED, URL)
+    assert malformed['tables'] and any("cell" in p for p in malformed['paragraphs'])
+    scripts, links = scraper.parse_page(SCRIPTS, URL)
+    assert scripts['headings'] == [{'level': 3, 'text': "Heading inside noscript"}]
+    assert scripts['paragraphs'] == ["The paragraph that stays, after the removed scripts"]
+    assert "https://www.joyfulheart.com/noscript-link.htm" in links
+    nav, _ = scraper.parse_page(NAV_UL, URL)
+    assert [link['text'] for link in nav['nav_links']] == ["About", "Contact"]
+
+
+WELL_FORMED = """<!DOCTYPE html><html><head><title>Well formed</title>
+<meta name="description" content="A clean page"></head><body>
+<nav><a href="/">Home</a><a href="/about/">About</a></nav>
+<h1>Title of the page</h1><h2>A section</h2>
+<p>A first paragraph with <a href="/one.htm">a link</a> and <em>emphasis</em> inside it.</p>
+<p>A second paragraph, also long enough to be kept.</p>
+<ul class="menu"><li><a href="/a.htm">Item A</a></li><li>Item B without a link</li></ul>
+<ol><li>First step</li><li>Second step</li></ol>
+<blockquote><p>A quotation in a paragraph.</p></blockquote>
+<img src="/images/photo.jpg" alt="Photo" width="200" height="100">
+<table><tr><th>Head</th><td>Cell <img src="c.gif" alt=""></td></tr><tr><td><a href="/t.htm">Link</a></td></tr></table>
+<script>var x = 1;</script><noscript><p>Enable JavaScript for this page</p></noscript>
+</body></html>"""
+
+
+@pytest.mark.parametrize("backend, module", [("lxml", "lxml"), ("selectolax", "selectolax")])
+def test_fast_backends_match_on_well_formed_markup(backend, module):
+    pytest.importorskip(module)
+    assert get_backend(backend).extract(WELL_FORMED, URL) == get_backend("html.parser").extract(WELL_FORMED, URL)
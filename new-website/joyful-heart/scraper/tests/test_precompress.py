@@ -0,0 +1,78 @@
+"""Precompressor: .gz/.br copies, kept in step with their sources."""
+
+import gzip
+import os
+
+import pytest
+
+import precompress
+from precompress import MIN_SIZE, Precompressor, encodings
+
+PAGE = "<html><body>" + "<p>The Lord is my shepherd; I shall not want.</p>" * 40 + "</body></html>"
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_copies_decompress_to_source(tmp_path):
+    source = write(tmp_path / "page.html", PAGE)
+    compressor = Precompressor().run(str(tmp_path))
+
+    assert compressor.compressed == 1
+    assert compressor.saved > 0
+    with open(source + ".gz", "rb") as f:
+        assert gzip.decompress(f.read()) == PAGE.encode("utf-8")
+    if "br" in encodings():
+        with open(source + ".br", "rb") as f:
+            assert precompress.brotli.decompress(f.read()) == PAGE.encode("utf-8")
+    for suffix in encodings():
+        assert os.stat(f"{source}.{suffix}").st_mtime_ns == os.stat(source).st_mtime_ns
+
+
+def test_only_changed_files_are_compressed_again(tmp_path):
+    write(tmp_path / "a.html", PAGE)
+    changed = write(tmp_path / "b.css", PAGE.replace("html>", "style>"))
+    Precompressor().run(str(tmp_path))
+
+    assert Precompressor().run(str(tmp_path)).current == 2
+    write(tmp_path / "b.css", PAGE.replace("html>", "div>"))
+    os.utime(changed, ns=(0, os.stat(changed + ".gz").st_mtime_ns + 10**9))
+    compressor = Precompressor().run(str(tmp_path))
+    assert (compressor.compressed, compressor.current) == (1, 1)
+    with open(changed + ".gz", "rb") as f:
+        assert b"div>" in gzip.decompress(f.read())
+
+
+def test_stale_and_skipped_files(tmp_path):
+    gone = write(tmp_path / "gone.html", PAGE)
+    small = write(tmp_path / "small.js", "x" * (MIN_SIZE - 1))
+    write(tmp_path / "image.png", PAGE)
+    write(tmp_path / ".build_manifest.json", PAGE)
+    Precompressor().run(str(tmp_path))
+    os.remove(gone)
+
+    compressor = Precompressor().run(str(tmp_path))
+    assert compressor.removed == len(encodings())
+    assert sorted(os.listdir(tmp_path)) == [".build_manifest.json", "image.png", "small.js"]
+    assert not os.path.exists(small + ".gz")
+
+
+def test_copies_left_by_another_encoding_are_removed(tmp_path, monkeypatch):
+    source = write(tmp_path / "page.html", PAGE)
+    with open(source + ".br", "wb") as f:
+        f.write(b"stale")
+    monkeypatch.setattr(precompress, "brotli", None)
+    assert Precompressor().run(str(tmp_path)).compressed == 1
+    assert not os.path.exists(source + ".br")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_output_does_not_depend_on_jobs(tmp_path, jobs):
+    for n in range(4):
+        write(tmp_path / f"p{n}.html", PAGE + str(n))
+    compressor = Precompressor(jobs=jobs).run(str(tmp_path))
+    assert compressor.compressed == 4
+    with open(tmp_path / "p3.html.gz", "rb") as f:
+        assert f.read() == gzip.compress((PAGE + "3").encode("utf-8"), compresslevel=9, mtime=0)
@@ -0,0 +1,147 @@
+"""Search indexes: built here, read back the way the page scripts read them."""
+
+import bisect
+import json
+import os
+
+import search_index
+from build_search_index import FILE_LIST, write_index
+from search_index import STOP_WORDS, FullTextIndex, catalog_index, tokenize
+
+STUDIES = [
+    (0, ["Genesis", "In the Beginning", "Creation, the patriarchs and Joseph"]),
+    (0, ["Exodus", "Let My People Go", "Moses and the covenant at Sinai"]),
+    (1, ["John’s Gospel", "Believe and Live", "The signs and sayings of Jesus"]),
+    (2, ["Acts", "The Early Church", "Peter, Paul and the Spirit's work in Génésaret"]),
+]
+
+
+def catalog_search(index, query):
+    """Item numbers matching every word of query as a prefix (study-search.js)."""
+    result = None
+    for word in tokenize(query):
+        start = bisect.bisect_left(index["terms"], word)
+        items = set()
+        for term, postings in zip(index["terms"][start:], index["postings"][start:]):
+            if not term.startswith(word):
+                break
+            items.update(postings)
+        result = items if result is None else result & items
+    return result
+
+
+def test_tokenize_matches_page_scripts():
+    assert tokenize("John’s GOSPEL, Génésaret — 2 Peter's") == ["johns", "gospel", "genesaret", "2", "peters"]
+    assert tokenize(" -- ") == []
+
+
+def test_catalog_index_round_trip():
+    index = json.loads(json.dumps(catalog_index(STUDIES), separators=(",", ":")))
+
+    assert index["terms"] == sorted(index["terms"])
+    assert index["groups"] == [0, 0, 1, 2]
+    assert catalog_search(index, "gen") == {0, 3}
+    assert catalog_search(index, "Genesis") == {0}
+    assert catalog_search(index, "johns") == {2}
+    assert catalog_search(index, "the ge") == {0, 3}
+    assert catalog_search(index, "moses paul") == set()
+    # Every word of every item leads back to it
+    for item, (_, fields) in enumerate(STUDIES):
+        for word in tokenize(" ".join(fields)):
+            assert item in catalog_search(index, word)
+
+
+def test_catalog_postings_are_sorted_and_unique():
+    index = catalog_index(STUDIES + [(2, ["Acts again", "acts acts"])])
+    for postings in index["postings"]:
+        assert postings == sorted(set(postings))
+    assert index["postings"][index["terms"].index("acts")] == [3, 4]
+
+
+ARTICLES = [
+    ("joyful-heart/pages/prayer.html", "Learning to Pray", "Joyful Heart",
+     ["Prayer is talking with God.", "Jesus taught his disciples to pray, and prayed often himself."]),
+    ("joyful-heart/pages/grace.html", "Amazing Grace", "Joyful Heart",
+     ["Grace is the undeserved favor of God.", "We are saved by grace through faith."]),
+    ("jesuswalk/pages/jw_acts.html", "Acts: The Early Church", "JesusWalk",
+     ["The church prayed together and the Spirit came.", "Peter preached and many believed."]),
+] + [(f"joyful-heart/pages/filler{n}.html", f"Article {n}", "Joyful Heart",
+      [f"Word{n} and shepherd number {n} keep the flock {n * 7}."]) for n in range(40)]
+
+
+def full_text_index():
+    index = FullTextIndex()
+    for path, title, site, paragraphs in ARTICLES:
+        index.add(path, title, site, paragraphs, excerpt=paragraphs[0])
+    return index
+
+
+def word_scores(files, manifest, word):
+    """[(page number, score)] for one word, read from the shards as search.js does."""
+    shards = manifest["shards"]
+    i = max(0, bisect.bisect_left([first for first, _ in shards], word) - 1)
+    if i + 1 < len(shards) and shards[i + 1][0] == word:
+        i += 1
+    shard = json.loads(files[shards[i][1]])
+    t = bisect.bisect_left(shard["terms"], word)
+    if t == len(shard["terms"]) or shard["terms"][t] != word:
+        return []
+    postings, page, scores = shard["postings"][t], 0, []
+    for j in range(0, len(postings), 2):
+        page += postings[j]
+        scores.append((page, postings[j + 1]))
+    return scores
+
+
+def test_full_text_round_trip(monkeypatch):
+    monkeypatch.setattr(search_index, "SHARD_BYTES", 300)
+    monkeypatch.setattr(search_index, "DOC_CHUNK", 8)
+    index = full_text_index()
+    files, manifest = index.files()
+    scores = index.scores()
+
+    assert len(manifest["shards"]) > 3
+    assert [first for first, _ in manifest["shards"]] == sorted(first for first, _ in manifest["shards"])
+    for word, expected in scores.items():
+        assert word_scores(files, manifest, word) == expected
+    assert word_scores(files, manifest, "zebra") == []
+
+    assert manifest["pages"] == len(ARTICLES)
+    pages = [page for name in manifest["chunks"] for page in json.loads(files[name])]
+    assert pages == [[path, title, site, paragraphs[0]] for path, title, site, paragraphs in ARTICLES]
+
+
+def test_full_text_scores():
+    scores = full_text_index().scores()
+    assert not STOP_WORDS & set(scores)
+    assert all(1 <= score <= 255 for postings in scores.values() for _, score in postings)
+    # Words are matched whole: "pray" is only on page 0, "prayed" on pages 0 and 2
+    assert [page for page, _ in scores["pray"]] == [0]
+    assert [page for page, _ in scores["prayed"]] == [0, 2]
+    # On filler page 3 (page number 6), its rare word outscores the common "shepherd"
+    assert dict(scores["word3"])[6] > dict(scores["shepherd"])[6]
+
+
+def test_full_text_files_are_named_by_content():
+    files, manifest = full_text_index().files()
+    again, manifest_again = full_text_index().files()
+    assert files == again and manifest == manifest_again
+
+    index = full_text_index()
+    index.add("joyful-heart/pages/new.html", "New", "Joyful Heart", ["Something new"])
+    assert set(index.files()[0]) != set(files)
+
+
+def test_write_index_keeps_previous_build(tmp_path):
+    search_dir = str(tmp_path / "search")
+    builds = [{f"shard.{n}.json": "{}", f"pages.{n}.json": "[]"} for n in range(3)]
+
+    for files in builds:
+        write_index(files, search_dir)
+    listed = sorted(name for name in os.listdir(search_dir) if not name.startswith("."))
+    assert listed == sorted(list(builds[1]) + list(builds[2]))
+
+    # Building the same files again keeps the same previous build
+    write_index(builds[2], search_dir)
+    with open(os.path.join(search_dir, FILE_LIST), "r", encoding="utf-8") as f:
+        assert json.load(f) == {"current": sorted(builds[2]), "previous": sorted(builds[1])}
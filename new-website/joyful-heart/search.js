@@ -0,0 +1,132 @@
+// Site-wide search over the sharded index prebuilt by build_search_index.py (search_index.py)
+(() => {
+  const input = document.getElementById('site-search');
+  const data = document.getElementById('search-manifest');
+  const status = document.getElementById('search-status');
+  const results = document.getElementById('search-results');
+  if (!input || !data || !results) return;
+  const manifest = JSON.parse(data.textContent);
+  const stop = new Set(manifest.stop);
+  const LIMIT = 30;
+  const files = new Map();  // file name -> Promise of its JSON, each fetched once
+  let latest = 0;
+
+  // Same word splitting as search_index.tokenize
+  const tokenize = q => q.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+    .replace(/['’]/g, '').split(/[^a-z0-9]+/).filter(Boolean);
+
+  const load = name => {
+    if (!files.has(name)) {
+      files.set(name, fetch(manifest.base + name).then(r => {
+        if (!r.ok) throw new Error(r.status);
+        return r.json();
+      }).catch(err => { files.delete(name); throw err; }));
+    }
+    return files.get(name);
+  };
+
+  // First position in a sorted list whose entry is >= word
+  const lowerBound = (list, word, key = x => x) => {
+    let lo = 0, hi = list.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (key(list[mid]) < word) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  };
+
+  // Shards that can hold word (or, for a prefix, any word starting with it)
+  const shardsFor = (word, prefix) => {
+    const shards = manifest.shards;
+    let i = Math.max(0, lowerBound(shards, word, s => s[0]) - 1);
+    if (i + 1 < shards.length && shards[i + 1][0] === word) i++;
+    const names = [shards[i][1]];
+    while (prefix && ++i < shards.length && shards[i][0].startsWith(word)) names.push(shards[i][1]);
+    return names;
+  };
+
+  // page number -> score for one query word
+  const lookup = async (word, prefix) => {
+    const scores = new Map();
+    for (const shard of await Promise.all(shardsFor(word, prefix).map(load))) {
+      for (let t = lowerBound(shard.terms, word); t < shard.terms.length; t++) {
+        const term = shard.terms[t];
+        if (term !== word && !(prefix && term.startsWith(word))) break;
+        const postings = shard.postings[t];
+        for (let j = 0, page = 0; j < postings.length; j += 2) {
+          page += postings[j];
+          scores.set(page, Math.max(scores.get(page) || 0, postings[j + 1]));
+        }
+      }
+    }
+    return scores;
+  };
+
+  // Pages matching the most query words first, then by summed score
+  const search = async words => {
+    const ranked = new Map();  // page -> [words matched, score]
+    const lists = await Promise.all(words.map((word, i) => lookup(word, i === words.length - 1)));
+    for (const scores of lists) {
+      scores.forEach((score, page) => {
+        const r = ranked.get(page) || [0, 0];
+        ranked.set(page, [r[0] + 1, r[1] + score]);
+      });
+    }
+    return [...ranked].sort((a, b) => b[1][0] - a[1][0] || b[1][1] - a[1][1] || a[0] - b[0]);
+  };
+
+  const card = ([path, title, site, excerpt]) => {
+    const a = document.createElement('a');
+    a.className = 'study-card';
+    a.href = manifest.root + path;
+    a.style.textDecoration = 'none';
+    const label = document.createElement('div');
+    label.className = 'study-card-category';
+    label.textContent = site;
+    const h3 = document.createElement('h3');
+    h3.textContent = title;
+    const p = document.createElement('p');
+    p.textContent = excerpt;
+    a.append(label, h3, p);
+    return a;
+  };
+
+  const show = (text, cards = []) => {
+    if (status) status.textContent = text;
+    results.replaceChildren(...cards);
+  };
+
+  const run = async q => {
+    const query = ++latest;
+    const url = new URL(location.href);
+    if (q.trim()) url.searchParams.set('q', q.trim()); else url.searchParams.delete('q');
+    history.replaceState(null, '', url);
+
+    const words = tokenize(q).filter((w, i, all) => !stop.has(w) || i === all.length - 1);
+    if (!words.length) return show('');
+    try {
+      const ranked = await search(words);
+      const top = ranked.slice(0, LIMIT);
+      const chunks = await Promise.all(top.map(([page]) => load(manifest.chunks[Math.floor(page / manifest.chunk)])));
+      if (query !== latest) return;  // A newer query already ran
+      const matches = ranked.length === 1 ? '1 page matches' : `${ranked.length} pages match`;
+      show(ranked.length ? matches : 'No pages match your search.',
+           top.map(([page], i) => card(chunks[i][page % manifest.chunk])));
+    } catch (err) {
+      if (query === latest) show('Search is unavailable right now. Please try again.');
+    }
+  };
+
+  let timer = 0;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => run(input.value), 150);
+  });
+  input.form && input.form.addEventListener('submit', e => { e.preventDefault(); clearTimeout(timer); run(input.value); });
+
+  const initial = new URL(location.href).searchParams.get('q');
+  if (initial) {
+    input.value = initial;
+    run(initial);
+  }
+})();